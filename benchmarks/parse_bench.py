@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Parse cost per extraction: the old per-consumer regex scans vs one parse_document.
+
+Before ProcessedDocument, each extraction's processed output was scanned by
+add_to_index (tags, category) and by the Discord poster (sections, category,
+then prompts from the prompts section). This replays that sequence with the
+old parsers, copied here as the baseline, and compares it with a single
+``parse_document`` call.
+
+Usage:
+    python benchmarks/parse_bench.py [--repeat N] [files...]
+
+Defaults to every extraction in extractions/.
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from outputs.document import parse_document  # noqa: E402
+
+
+# ── Baseline: parsers as they were before ProcessedDocument ──
+
+def _old_tags(text):
+    return re.findall(r"`#([^`]+)`", text)
+
+
+def _old_category(text):
+    match = re.search(r"###\s*Category\s*\n+(.+)", text)
+    return match.group(1).strip().strip("`").strip() if match else "Other"
+
+
+def _old_sections(text):
+    sections, key, lines = {}, None, []
+    for line in text.split("\n"):
+        m = re.match(r"^###\s+(.+)$", line)
+        if m:
+            if key:
+                sections[key] = "\n".join(lines).strip()
+            key, lines = m.group(1).strip(), []
+        elif key is not None:
+            lines.append(line)
+    if key:
+        sections[key] = "\n".join(lines).strip()
+    return sections
+
+
+def _old_prompts(section):
+    prompts, title, lines = [], None, []
+    for line in section.split("\n"):
+        m = re.match(r"^####\s+Prompt\s+\d+:\s*(.+)$", line)
+        if m:
+            if title:
+                prompts.append({"title": title, "body": "\n".join(lines).strip().strip(">").strip()})
+            title, lines = m.group(1).strip(), []
+        elif title is not None:
+            lines.append(line)
+    if title:
+        prompts.append({"title": title, "body": "\n".join(lines).strip().strip(">").strip()})
+    if not prompts and section.strip():
+        for i, block in enumerate(re.split(r"\n(?=>)", section), 1):
+            body = block.strip().strip(">").strip()
+            if body:
+                prompts.append({"title": f"Prompt {i}", "body": body})
+    return prompts
+
+
+def before(text):
+    # add_to_index
+    _old_tags(text)
+    _old_category(text)
+    # _post_output + compose_thread_messages
+    sections = _old_sections(text)
+    _old_category(text)
+    _old_prompts(sections.get("Implementation Prompts", ""))
+
+
+def after(text):
+    parse_document(text)
+
+
+def _time(fn, docs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in docs:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(docs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    files = args.files or sorted(p for p in config.EXTRACTIONS_PATH.glob("*.md") if p.name != "INDEX.md")
+    docs = [p.read_text(encoding="utf-8") for p in files]
+    if not docs:
+        sys.exit("No extraction files to benchmark.")
+
+    avg_kb = sum(len(d) for d in docs) / len(docs) / 1024
+    old = _time(before, docs, args.repeat)
+    new = _time(after, docs, args.repeat)
+    print(f"{len(docs)} document(s), avg {avg_kb:.1f} KB, {args.repeat} rounds")
+    print(f"  before (per-consumer scans): {old * 1e6:8.1f} µs/doc")
+    print(f"  after  (parse_document):     {new * 1e6:8.1f} µs/doc  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
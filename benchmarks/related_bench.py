@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Related-extractions index: incremental add cost and top-k query latency.
+
+Builds a throwaway index of synthetic documents (Zipf-distributed vocabulary,
+~600 words each, loosely clustered by topic) in backfill batches. It then
+times single-document adds, as the pipeline does them, and ``related()`` for
+random documents.
+
+Usage:
+    python benchmarks/related_bench.py [--docs N] [--queries Q]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outputs.related import RelatedIndex  # noqa: E402
+
+VOCAB = 40_000
+TOPICS = 200
+
+
+def _word(i: int) -> str:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    out = ""
+    i += 26 * 27
+    while i:
+        i, r = divmod(i, 26)
+        out += letters[r]
+    return "w" + out
+
+
+def synthetic_doc(rng: random.Random, topic_words: list[list[str]], words: list[str], weights: list[float]) -> str:
+    topic = rng.choice(topic_words)
+    body = rng.choices(words, weights, k=450) + rng.choices(topic, k=150)
+    return " ".join(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    words = [_word(i) for i in range(VOCAB)]
+    weights = [1 / (i + 1) for i in range(VOCAB)]
+    topic_words = [rng.sample(words[2000:], 60) for _ in range(TOPICS)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = RelatedIndex(Path(tmp) / "related.sqlite3")
+        started = time.perf_counter()
+        for start in range(1, args.docs + 1, 500):
+            batch = range(start, min(start + 500, args.docs + 1))
+            index.add_many([(f"doc-{n}.md", n, synthetic_doc(rng, topic_words, words, weights)) for n in batch])
+        build = time.perf_counter() - started
+        print(f"Backfilled {args.docs} docs in {build:.1f}s ({build / args.docs * 1000:.2f} ms/doc)")
+
+        single = []
+        for n in range(args.docs + 1, args.docs + 21):
+            t = time.perf_counter()
+            index.add(f"doc-{n}.md", n, synthetic_doc(rng, topic_words, words, weights))
+            single.append((time.perf_counter() - t) * 1000)
+        print(f"Incremental add: {sum(single) / len(single):.1f} ms/doc (mean of {len(single)})")
+
+        timings = []
+        for num in rng.sample(range(1, args.docs + 1), min(args.queries, args.docs)):
+            t = time.perf_counter()
+            index.related(num=num, k=5)
+            timings.append((time.perf_counter() - t) * 1000)
+        timings.sort()
+        p50 = timings[len(timings) // 2]
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"related(k=5) over {args.docs} docs: p50 {p50:.1f} ms, p95 {p95:.1f} ms, max {timings[-1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Data is persisted to a JSON file for cross-session tracking.
 
 import json
 import logging
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -14,6 +15,7 @@ import config
 log = logging.getLogger("megamind.budget")
 
 BUDGET_FILE = config.PROJECT_ROOT / "api_budget.json"
+_lock = threading.Lock()  # read-modify-write from concurrent pipelines
 
 # ── Pricing (USD per 1M tokens) — updated Feb 2025 ──
 # https://docs.anthropic.com/en/docs/about-claude/pricing
@@ -30,6 +32,10 @@ PRICING = {
 # Fallback pricing if model not in table
 DEFAULT_PRICING = {"input": 3.00, "output": 15.00}
 
+# Typical cost of an avoided call when there is no history to average over
+# (a Grok video extraction: ~400 tokens in, ~2500 out, ~40s)
+DEFAULT_AVOIDED_CALL = {"input_tokens": 400, "output_tokens": 2500, "latency_ms": 40000}
+
 
 def _load() -> dict:
     """Load budget data from disk."""
@@ -44,12 +50,15 @@ def _load() -> dict:
         "total_cost": 0.0,
         "extraction_count": 0,
         "history": [],  # recent entries for breakdown
+        "savings": {"count": 0, "cost": 0.0, "seconds": 0.0},
     }
 
 
 def _save(data: dict):
-    """Persist budget data to disk."""
-    BUDGET_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    """Persist budget data to disk (atomically — readers never see a torn file)."""
+    tmp = BUDGET_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp.replace(BUDGET_FILE)
 
 
 def _estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
@@ -65,6 +74,7 @@ def record_usage(
     output_tokens: int,
     api: str = "anthropic",
     title: str = "",
+    latency_ms: int | None = None,
 ) -> dict:
     """Record an API call's token usage and return the updated budget summary.
 
@@ -74,34 +84,37 @@ def record_usage(
         output_tokens: Number of output tokens used
         api: Which API ("anthropic" or "grok")
         title: Optional extraction title for the history log
+        latency_ms: Optional wall-clock duration of the call
 
     Returns:
         Updated budget summary dict.
     """
-    data = _load()
     cost = _estimate_cost(model, input_tokens, output_tokens)
-
-    data["total_input_tokens"] += input_tokens
-    data["total_output_tokens"] += output_tokens
-    data["total_cost"] += cost
-    data["extraction_count"] += 1
-
-    # Keep last 100 entries in history
-    entry = {
-        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M"),
-        "api": api,
-        "model": model,
-        "input_tokens": input_tokens,
-        "output_tokens": output_tokens,
-        "cost": cost,
-        "title": title[:60] if title else "",
-    }
-    data["history"].append(entry)
-    if len(data["history"]) > 100:
-        data["history"] = data["history"][-100:]
-
-    data["total_cost"] = round(data["total_cost"], 6)
-    _save(data)
+    with _lock:
+        data = _load()
+        data["total_input_tokens"] += input_tokens
+        data["total_output_tokens"] += output_tokens
+        data["total_cost"] += cost
+        data["extraction_count"] += 1
+
+        # Keep last 100 entries in history
+        entry = {
+            "date": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M"),
+            "api": api,
+            "model": model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost": cost,
+            "title": title[:60] if title else "",
+        }
+        if latency_ms is not None:
+            entry["latency_ms"] = int(latency_ms)
+        data["history"].append(entry)
+        if len(data["history"]) > 100:
+            data["history"] = data["history"][-100:]
+
+        data["total_cost"] = round(data["total_cost"], 6)
+        _save(data)
 
     log.info(
         f"Budget: +${cost:.4f} ({input_tokens}in/{output_tokens}out) "
@@ -110,6 +123,49 @@ def record_usage(
     return data
 
 
+def estimate_call(api: str, model: str) -> dict:
+    """Estimate the cost and latency of one call to ``api`` from recent history.
+
+    Falls back to ``DEFAULT_AVOIDED_CALL`` priced at ``model`` rates.
+    """
+    history = [e for e in _load()["history"] if e.get("api") == api]
+    if history:
+        cost = sum(e["cost"] for e in history) / len(history)
+    else:
+        cost = _estimate_cost(
+            model, DEFAULT_AVOIDED_CALL["input_tokens"], DEFAULT_AVOIDED_CALL["output_tokens"],
+        )
+    timed = [e["latency_ms"] for e in history if "latency_ms" in e]
+    latency_ms = sum(timed) / len(timed) if timed else DEFAULT_AVOIDED_CALL["latency_ms"]
+    return {"cost": round(cost, 6), "latency_ms": int(latency_ms)}
+
+
+def record_savings(api: str, model: str, actual_latency_ms: int, title: str = "") -> dict:
+    """Record a call to ``api`` that was avoided, e.g. captions fetched directly.
+
+    Returns the per-item saving: ``{"cost": usd, "seconds": s}``.
+    """
+    estimate = estimate_call(api, model)
+    saved = {
+        "cost": estimate["cost"],
+        "seconds": round(max(estimate["latency_ms"] - actual_latency_ms, 0) / 1000, 1),
+    }
+
+    with _lock:
+        data = _load()
+        totals = data.setdefault("savings", {"count": 0, "cost": 0.0, "seconds": 0.0})
+        totals["count"] += 1
+        totals["cost"] = round(totals["cost"] + saved["cost"], 6)
+        totals["seconds"] = round(totals["seconds"] + saved["seconds"], 1)
+        _save(data)
+
+    log.info(
+        f"Saved {api} call for {title[:60] or 'untitled'}: ~${saved['cost']:.4f}, "
+        f"~{saved['seconds']:.0f}s | Total saved: ${totals['cost']:.4f} over {totals['count']}"
+    )
+    return saved
+
+
 def get_summary() -> dict:
     """Return the current budget summary."""
     return _load()
@@ -118,10 +174,11 @@ def get_summary() -> dict:
 def format_budget_embed_text() -> str:
     """Return a formatted string for Discord display."""
     data = _load()
-    if data["extraction_count"] == 0:
+    savings = data.get("savings", {})
+    if data["extraction_count"] == 0 and not savings.get("count"):
         return "No API usage recorded yet."
 
-    avg_cost = data["total_cost"] / data["extraction_count"]
+    avg_cost = data["total_cost"] / data["extraction_count"] if data["extraction_count"] else 0.0
 
     lines = [
         f"**Total spend:** ${data['total_cost']:.4f}",
@@ -129,6 +186,11 @@ def format_budget_embed_text() -> str:
         f"**Avg cost/extraction:** ${avg_cost:.4f}",
         f"**Total tokens:** {data['total_input_tokens']:,} in / {data['total_output_tokens']:,} out",
     ]
+    if savings.get("count"):
+        lines.append(
+            f"**Saved by direct extraction:** ${savings['cost']:.4f} and "
+            f"~{savings['seconds'] / 60:.0f} min over {savings['count']} items"
+        )
 
     # Last 5 entries
     recent = data["history"][-5:]
@@ -23,7 +23,18 @@ OBSIDIAN_VAULT_PATH = os.getenv("OBSIDIAN_VAULT_PATH", "")
 INDEX_FILE = EXTRACTIONS_PATH / "INDEX.md"
 
 # Grok API (xAI uses OpenAI-compatible endpoint)
-GROK_API_BASE = "https://api.x.ai/v1"
+GROK_API_BASE = os.getenv("GROK_API_BASE", "https://api.x.ai/v1").rstrip("/")
+
+# LLM calls — per-attempt timeout, overall deadline (both seconds) and retry cap
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "300"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+# Most calls in flight at once per upstream, process-wide (bulk jobs like --reprocess queue behind these)
+LLM_ANTHROPIC_CONCURRENCY = int(os.getenv("LLM_ANTHROPIC_CONCURRENCY", "4"))
+LLM_GROK_CONCURRENCY = int(os.getenv("LLM_GROK_CONCURRENCY", "3"))
+
+# Ask Claude for JSON fields via a forced tool call instead of markdown headings
+CLAUDE_STRUCTURED_OUTPUT = os.getenv("CLAUDE_STRUCTURED_OUTPUT", "false").lower() == "true"
 
 # CI mode — detected automatically in GitHub Actions, or set CI=true
 CI_MODE = os.getenv("CI", "").lower() in ("true", "1") or os.getenv("GITHUB_ACTIONS", "") == "true"
@@ -39,12 +50,86 @@ DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN", "")
 DISCORD_SERVER_ID = int(os.getenv("DISCORD_SERVER_ID", "0"))
 DISCORD_EXTRACT_CHANNEL_ID = int(os.getenv("DISCORD_EXTRACT_CHANNEL_ID", "0"))
 DISCORD_OUTPUT_CHANNEL_ID = int(os.getenv("DISCORD_OUTPUT_CHANNEL_ID", "0"))
+# Max extractions running at once across all messages, slash commands and the watcher
+# (this is the size of the bot's pipeline worker pool)
+MAX_CONCURRENT_EXTRACTIONS = int(os.getenv("MAX_CONCURRENT_EXTRACTIONS", "3"))
+
+# Outbound pacing (Discord allows ~5 messages / 5s per channel, 50 requests/s globally)
+DISCORD_CHANNEL_RATE = int(os.getenv("DISCORD_CHANNEL_RATE", "5"))
+DISCORD_CHANNEL_PER = float(os.getenv("DISCORD_CHANNEL_PER", "5"))
+DISCORD_GLOBAL_RATE = int(os.getenv("DISCORD_GLOBAL_RATE", "50"))
+DISCORD_REACTION_INTERVAL = float(os.getenv("DISCORD_REACTION_INTERVAL", "0.25"))
+DISCORD_SEND_RETRIES = int(os.getenv("DISCORD_SEND_RETRIES", "3"))
+# Rate-limit waits longer than this are handed back to the outbox instead of sleeping inline
+DISCORD_MAX_RATELIMIT_WAIT = float(os.getenv("DISCORD_MAX_RATELIMIT_WAIT", "10"))
+
+# === Job queue (durable, SQLite) ===
+JOB_DB_PATH = Path(os.getenv("JOB_DB_PATH", PROJECT_ROOT / ".jobs.sqlite3"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "600"))  # re-queued if not renewed
+JOB_RETRY_BASE = float(os.getenv("JOB_RETRY_BASE", "30"))  # seconds, doubles per attempt
+JOB_RETRY_MAX = float(os.getenv("JOB_RETRY_MAX", "900"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "5"))  # idle workers check for new jobs
+# Worker processes (bot, coord.py --worker) check in this often; one not seen for
+# JOB_WORKER_TIMEOUT seconds counts as down
+JOB_WORKER_HEARTBEAT = float(os.getenv("JOB_WORKER_HEARTBEAT", "30"))
+JOB_WORKER_TIMEOUT = float(os.getenv("JOB_WORKER_TIMEOUT", "90"))
+# Bot workers that only take interactive jobs (/extract, #extract), so a playlist
+# backlog never occupies every slot. At least one worker always takes any job.
+JOB_INTERACTIVE_RESERVED = int(os.getenv("JOB_INTERACTIVE_RESERVED", "1"))
+# A queued job is promoted one priority class per this many seconds of waiting
+JOB_PRIORITY_AGING = float(os.getenv("JOB_PRIORITY_AGING", "600"))
+
+# === Raw content store (compressed raw extractions, for offline reprocessing) ===
+RAW_STORE_PATH = Path(os.getenv("RAW_STORE_PATH", PROJECT_ROOT / ".raw_store"))
+RAW_STORE_SEGMENT_BYTES = int(os.getenv("RAW_STORE_SEGMENT_BYTES", str(64 * 1024 * 1024)))  # roll to a new segment past this
+
+# === Near-duplicate detection (MinHash over raw content, checked before calling Claude) ===
+NEARDUP_ENABLED = os.getenv("NEARDUP_ENABLED", "true").lower() in ("true", "1")
+NEARDUP_INDEX_PATH = Path(os.getenv("NEARDUP_INDEX_PATH", PROJECT_ROOT / ".neardup_index.jsonl"))
+# Estimated Jaccard similarity at which a new URL is linked to the existing extraction (no Claude call)
+NEARDUP_LINK_THRESHOLD = float(os.getenv("NEARDUP_LINK_THRESHOLD", "0.85"))
+# ...and at which Claude is only asked for what the new source adds (set above 1 to disable)
+NEARDUP_DELTA_THRESHOLD = float(os.getenv("NEARDUP_DELTA_THRESHOLD", "0.5"))
+NEARDUP_SHINGLE_WORDS = int(os.getenv("NEARDUP_SHINGLE_WORDS", "5"))
+NEARDUP_MIN_WORDS = int(os.getenv("NEARDUP_MIN_WORDS", "50"))  # shorter content is never matched
+
+# === Related extractions (incremental TF-IDF index in SQLite) ===
+RELATED_DB_PATH = Path(os.getenv("RELATED_DB_PATH", PROJECT_ROOT / ".related.sqlite3"))
+RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", "5"))
+RELATED_QUERY_TERMS = int(os.getenv("RELATED_QUERY_TERMS", "48"))  # a document's top-weighted terms used as the query
+RELATED_MMAP_BYTES = int(os.getenv("RELATED_MMAP_BYTES", str(256 * 1024 * 1024)))
+
+# === Tag / category canonicalisation (variants like #machinelearning and #machine-learning merged) ===
+TAXONOMY_PATH = Path(os.getenv("TAXONOMY_PATH", PROJECT_ROOT / ".taxonomy.json"))
+TAXONOMY_ENABLED = os.getenv("TAXONOMY_ENABLED", "true").lower() in ("true", "1")
+# Share of (singularised) words two multi-word labels must have in common to be merged
+TAXONOMY_TOKEN_OVERLAP = float(os.getenv("TAXONOMY_TOKEN_OVERLAP", "0.75"))
+
+# === Git sync (bot commits new extractions in the background) ===
+GIT_COMMIT_WINDOW = float(os.getenv("GIT_COMMIT_WINDOW", "30"))  # seconds to batch changes
+GIT_COMMIT_MAX_FILES = int(os.getenv("GIT_COMMIT_MAX_FILES", "10"))  # commit early at this many
+GIT_PUSH_RETRIES = int(os.getenv("GIT_PUSH_RETRIES", "3"))  # pull --rebase + retry on rejection
 
 # === YouTube Playlist Watcher ===
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
 YOUTUBE_EXTRACT_PLAYLIST_ID = os.getenv("YOUTUBE_EXTRACT_PLAYLIST_ID", "")
 YOUTUBE_COMPLETED_PLAYLIST_ID = os.getenv("YOUTUBE_COMPLETED_PLAYLIST_ID", "")
 YOUTUBE_POLL_INTERVAL = int(os.getenv("YOUTUBE_POLL_INTERVAL", "3600"))  # seconds, default 1 hour
+# Playlist videos extracted at once (shares the bot's worker pool with interactive jobs)
+YOUTUBE_PLAYLIST_CONCURRENCY = int(os.getenv("YOUTUBE_PLAYLIST_CONCURRENCY", "2"))
+# Adaptive polling: MIN right after new videos, doubling while idle up to YOUTUBE_POLL_INTERVAL
+YOUTUBE_POLL_MIN_INTERVAL = int(os.getenv("YOUTUBE_POLL_MIN_INTERVAL", "300"))
+# Daily Data API quota (units) and how much of it polling must leave for playlist moves
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+YOUTUBE_QUOTA_RESERVE = int(os.getenv("YOUTUBE_QUOTA_RESERVE", "1000"))
+
+# Direct caption extraction — tried before Grok; Grok is the fallback
+YOUTUBE_DIRECT_TRANSCRIPTS = os.getenv("YOUTUBE_DIRECT_TRANSCRIPTS", "true").lower() in ("true", "1")
+YOUTUBE_CAPTION_LANGS = [l.strip() for l in os.getenv("YOUTUBE_CAPTION_LANGS", "en").split(",") if l.strip()]
+YOUTUBE_TRANSCRIPT_MAX_CHARS = int(os.getenv("YOUTUBE_TRANSCRIPT_MAX_CHARS", "40000"))
+# Watch-page base URL — override to point at a local stand-in caption server
+YOUTUBE_WEB_BASE = os.getenv("YOUTUBE_WEB_BASE", "https://www.youtube.com").rstrip("/")
 
 # YouTube OAuth2 — generated by  python youtube_auth.py
 YOUTUBE_CLIENT_SECRET_FILE = PROJECT_ROOT / "client_secret.json"
@@ -53,3 +138,11 @@ YOUTUBE_TOKEN_FILE = PROJECT_ROOT / "youtube_token.json"
 # === GitHub (for execute queue) ===
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 GITHUB_REPO = os.getenv("GITHUB_REPO", "onekiller89/Co-Ord_Executor")
+GITHUB_BRANCH = os.getenv("GITHUB_BRANCH", "main")  # branch extraction links point at
+
+# GitHub endpoints — override to point at a local stand-in server
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com").rstrip("/")
+GITHUB_RAW_BASE = os.getenv("GITHUB_RAW_BASE", "https://raw.githubusercontent.com").rstrip("/")
+
+# GitHub extractor — byte cap per key file (manifests, CI configs, Dockerfile)
+GITHUB_KEY_FILE_MAX_BYTES = int(os.getenv("GITHUB_KEY_FILE_MAX_BYTES", "6000"))
@@ -4,6 +4,12 @@ Co-Ord Executor — Extract, structure, and track valuable content.
 
 Usage:
     python coord.py <URL>                  Extract content from a URL
+    python coord.py --submit <URL>         Queue a URL for the bot / a worker
+    python coord.py --worker               Run pipeline workers on the job queue
+    python coord.py --drain-issues         Process all open 'extract' GitHub Issues
+    python coord.py --reprocess            Regenerate past extractions from stored raw content
+    python coord.py --jobs                 Show recent jobs
+    python coord.py --taxonomy             Re-cluster tag/category spelling variants
     python coord.py --paste <source_type>  Paste content manually
     python coord.py --list                 Show all extractions
     python coord.py --list --status TODO   Filter by status
@@ -11,73 +17,463 @@ Usage:
 """
 
 import argparse
+import hashlib
+import os
+import re
+import socket
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import Callable
+
+import config
 
 from extractors import get_extractor
-from extractors.detector import SourceType
+from extractors.detector import SourceType, canonical_key, canonicalize
 from extractors.base import ExtractionResult
-from processors.ai_processor import process_extraction
+from processors.ai_processor import process_document
 from outputs.formatter import format_document, generate_filename
-from outputs.index import add_to_index, update_status, list_entries
-from outputs.storage import save_extraction
+from outputs.catalog import extraction_metadata, write_sidecar
+from outputs.index import add_to_index, update_status, list_entries, lookup_url, record_url
+from outputs.document import parse_document
+from outputs.neardup import find_near_duplicate, neardup_index, signature
+from outputs.rawstore import store_raw
+from outputs.related import find_related, index_extraction
+from outputs.storage import find_duplicate, save_extraction
+from jobqueue import DONE, FAILED, POSTING, PROCESSING, Job, JobQueue, LeaseLost
 
 
-def run_pipeline(url: str) -> dict:
+def run_pipeline(url: str, on_stage: Callable[[str], None] | None = None) -> dict:
     """Reusable extraction pipeline. Returns structured result dict.
 
-    Used by both the CLI and the Discord bot.
+    Used by both the CLI and the Discord bot. ``on_stage`` is called with
+    the job-queue state name as the pipeline moves between stages.
     """
-    # 1. Detect source and get extractor
+    started = time.monotonic()
+
+    # 1. Canonicalise (resolve short links, drop tracking params), detect source
+    url, key = canonicalize(url)
     extractor, source_type = get_extractor(url)
 
     # 2. Extract raw content
     result = extractor.extract(url)
-
-    # 3. Process through AI
-    processed = process_extraction(result)
-
-    # 4. Format final document
-    document = format_document(result, processed)
+    result.metadata["canonical_key"] = key
+    store_raw(key, result)
+    extracted = time.monotonic()
+
+    # 3. Duplicate checks: identical raw content (a mirror or re-upload) reuses
+    #    the existing extraction; a strong near-duplicate is linked instead of
+    #    processed, a weaker one is processed as a delta against it
+    duplicate = find_duplicate(result.raw_content)
+    if duplicate:
+        record_url(key, duplicate)
+        existing = parse_document((config.EXTRACTIONS_PATH / duplicate).read_text(encoding="utf-8"))
+        return _linked_result(result, key, source_type.value, existing, duplicate)
+
+    sig = signature(result.raw_content) if config.NEARDUP_ENABLED else None
+    match = find_near_duplicate(key, sig)
+    related = None
+    if match:
+        existing = config.EXTRACTIONS_PATH / match.filename
+        related = parse_document(existing.read_text(encoding="utf-8")) if existing.exists() else None
+    if related is not None:
+        linked = match.similarity >= config.NEARDUP_LINK_THRESHOLD
+        result.metadata["near_duplicate"] = {
+            "filename": match.filename,
+            "similarity": round(match.similarity, 3),
+            "mode": "linked" if linked else "delta",
+        }
+        if linked:
+            record_url(key, match.filename)
+            return _linked_result(result, key, source_type.value, related, match.filename)
+
+    # 4. Process through AI
+    if on_stage:
+        on_stage(PROCESSING)
+    doc = process_document(result, related)  # parsed once (or built from JSON), shared by every consumer
+    processed = doc.raw
+    processed_at = time.monotonic()
+
+    # 5. Format final document
+    document = format_document(result, doc)
     filename = generate_filename(result)
     date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
-    # 5. Save to storage
+    # 6. Save to storage (a file already holding this document isn't rewritten)
     saved = save_extraction(filename, document)
 
-    # 6. Update index
-    add_to_index(result, processed, filename, date_str)
+    # 7. Update index, write the metadata sidecar and sign it for near-duplicate checks
+    num = add_to_index(result, doc, filename, date_str)
+    timings = {
+        "extract_s": round(extracted - started, 2),
+        "process_s": round(processed_at - extracted, 2),
+        "total_s": round(time.monotonic() - started, 2),
+    }
+    write_sidecar(filename, extraction_metadata(result, doc, filename, document, date_str, num, timings))
+    neardup_index().add(key, filename, sig)
+    index_extraction(filename, num, document)
 
     return {
         "title": result.title,
         "url": result.url,
+        "key": key,
         "source_type": source_type.value,
         "processed": processed,
+        "doc": doc,
         "document": document,
         "filename": filename,
         "saved_to": saved,
         "date": date_str,
         "metadata": result.metadata,
+        "related": find_related(filename),
+    }
+
+
+def _linked_result(result: ExtractionResult, key: str, source_type: str, doc, filename: str) -> dict:
+    """Pipeline result for a URL linked to an existing (near-)duplicate extraction (nothing new saved)."""
+    return {
+        "title": result.title,
+        "url": result.url,
+        "key": key,
+        "source_type": source_type,
+        "processed": doc.raw,
+        "doc": doc,
+        "document": doc.raw,
+        "filename": filename,
+        "saved_to": {"repo": str(config.EXTRACTIONS_PATH / filename)},
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "metadata": result.metadata,
+        "related": find_related(filename),
     }
 
 
+def run_job(queue: JobQueue, job: Job) -> dict:
+    """Run a claimed job's pipeline, recording each stage in the queue.
+
+    Returns the result dict (without the full document). A job resumed after
+    a crash that already has a stored result skips straight to posting.
+    """
+    if job.result is not None:
+        return job.result
+
+    def advance(stage: str, result: dict | None = None):
+        if not queue.advance(job.id, job.worker, stage, result=result):
+            raise LeaseLost(f"job {job.id} is no longer held by {job.worker}")
+
+    result = run_pipeline(job.url, on_stage=advance)
+    result = {k: v for k, v in result.items() if k != "document"}
+    result["doc"] = result["doc"].to_dict()
+    advance(POSTING, result)
+    return result
+
+
+def _worker_name(slot: int | str = 0) -> str:
+    return f"cli:{socket.gethostname()}:{os.getpid()}:{slot}"
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid() or os.name == "nt":  # os.kill(pid, 0) would terminate the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _dead_local_workers(queue: JobQueue) -> list[str]:
+    """CLI workers on this host that still hold jobs but whose process has exited.
+
+    Jobs held by a live sibling process (another ``--worker`` or
+    ``--drain-issues``) are left alone. Elsewhere (and on Windows) stale
+    jobs come back when their lease expires.
+    """
+    prefix = f"cli:{socket.gethostname()}:"
+    dead = []
+    for name in queue.holders(prefix):
+        pid = name[len(prefix):].split(":", 1)[0]
+        if pid.isdigit() and not _pid_alive(int(pid)):
+            dead.append(name)
+    return dead
+
+
+def _execute_job(queue: JobQueue, job: Job, worker: str) -> dict | None:
+    """Run a job to completion outside the bot (no Discord posting)."""
+    with queue.lease_keeper(job.id, worker):
+        try:
+            result = run_job(queue, job)
+        except Exception as e:
+            failed = queue.fail(job.id, worker, str(e))
+            print(f"  Job {job.id} failed ({failed.state if failed else 'unknown'}): {e}")
+            return None
+    if not queue.complete(job.id, worker):
+        return None
+    return result
+
+
 def extract_url(url: str) -> None:
-    """CLI extraction pipeline for a given URL."""
+    """CLI extraction pipeline for a given URL, run through the job queue."""
     print(f"\n  Co-Ord Executor")
     print(f"  {'='*40}")
     print(f"  Extracting: {url}")
 
-    result = run_pipeline(url)
+    queue = JobQueue()
+    job, created = queue.submit(url, source="cli")
+    if not created:
+        print(f"  Already queued as job #{job.id} ({job.state}) — not extracting twice.")
+        return
+
+    worker = _worker_name()
+    job = queue.claim(worker, job_id=job.id)
+    if job is None:
+        print(f"  Job picked up by another worker — see: python coord.py --jobs")
+        return
+
+    result = _execute_job(queue, job, worker)
+    if result is None:
+        sys.exit(1)
 
     print(f"  Source: {result['source_type']}")
     print(f"  Title: {result['title']}")
+    near = result["metadata"].get("near_duplicate")
+    if near and near["mode"] == "linked":
+        print(f"  Near-duplicate ({near['similarity']:.0%}) of an existing extraction — linked, not processed.")
+        print(f"\n  Done! See: {result['filename']}")
+        print(f"  {'='*40}\n")
+        return
+    if near:
+        print(f"  Overlaps {near['filename']} ({near['similarity']:.0%}) — processed as a delta.")
     for location, path in result["saved_to"].items():
         print(f"    -> {location}: {path}")
     print(f"  Index updated.")
+    if result.get("related"):
+        print(f"  Related:")
+        for item in result["related"]:
+            print(f"    - {item['title'][:70]} ({item['filename']}, {item['score']:.2f})")
     print(f"\n  Done! Extraction saved as: {result['filename']}")
     print(f"  {'='*40}\n")
 
 
+def submit_url(url: str) -> None:
+    """Queue a URL for the Discord bot or a --worker process to pick up."""
+    job, created = JobQueue().submit(url, source="cli")
+    if created:
+        print(f"  Queued job #{job.id}: {job.url}")
+    else:
+        print(f"  Already queued as job #{job.id} ({job.state})")
+
+
+def run_worker(workers: int) -> None:
+    """Process queued jobs with a pool of worker threads until interrupted."""
+    queue = JobQueue()
+    queue.recover(workers=_dead_local_workers(queue))
+    stop = threading.Event()
+
+    def work(slot: int):
+        worker = _worker_name(slot)
+        while not stop.is_set():
+            queue.recover()
+            job = queue.claim(worker)
+            if job is None:
+                stop.wait(config.JOB_POLL_INTERVAL)
+                continue
+            print(f"  [{slot}] Job #{job.id}: {job.url}")
+            result = _execute_job(queue, job, worker)
+            if result:
+                print(f"  [{slot}] Done #{job.id}: {result['title']} -> {result['filename']}")
+
+    threads = [threading.Thread(target=work, args=(n,), daemon=True) for n in range(workers)]
+    for t in threads:
+        t.start()
+    print(f"  Co-Ord worker running ({workers} worker(s)). Ctrl+C to stop.")
+
+    # Liveness for submitters that only queue locally when a worker is up (Telegram)
+    process_name = f"cli:{socket.gethostname()}:{os.getpid()}"
+    try:
+        while any(t.is_alive() for t in threads):
+            queue.touch_worker(process_name)
+            stop.wait(config.JOB_WORKER_HEARTBEAT)
+    except KeyboardInterrupt:
+        stop.set()
+        print("\n  Stopping — interrupted jobs are re-queued when their lease expires.")
+    finally:
+        queue.remove_worker(process_name)
+
+
+def show_jobs(state: str | None = None) -> None:
+    """Print job counts per state and the most recent jobs."""
+    queue = JobQueue()
+    counts = queue.counts()
+    print("  " + "  ".join(f"{s}: {n}" for s, n in sorted(counts.items())) if counts else "  No jobs yet.")
+    for name, c in queue.class_stats().items():
+        avg = f"{c['avg_wait']:.0f}s" if c["avg_wait"] is not None else "-"
+        print(f"  {name:<12} queued {c['queued']:<4} running {c['running']:<3} "
+              f"oldest {c['oldest_wait']:.0f}s  avg wait {avg} (last hour)")
+    for job in queue.recent(limit=20, state=state):
+        note = f" — {job.error[:80]}" if job.state == FAILED and job.error else ""
+        title = job.result["title"] if job.state == DONE and job.result else job.url
+        print(f"  #{job.id:<5} {job.state:<10} {job.source:<17} {title[:70]}{note}")
+
+
+def show_taxonomy() -> None:
+    """Re-cluster tags and categories from the catalog and print the merged variants."""
+    from outputs.taxonomy import rebuild_from_catalog
+
+    for kind, clusters in rebuild_from_catalog().items():
+        variants = sum(len(v) for v in clusters.values())
+        print(f"  {kind.capitalize()}: {variants} spelling(s) -> {len(clusters)} canonical")
+        for canonical, names in sorted(clusters.items()):
+            if len(names) > 1:
+                print(f"    {canonical:<30} <- {', '.join(n for n in names if n != canonical)}")
+    print(f"  Alias table written to {config.TAXONOMY_PATH.name} (edit it to merge or split by hand).")
+
+
+# ---------------------------------------------------------------------------
+# GitHub Issues drain
+# ---------------------------------------------------------------------------
+
+ISSUE_URL_PATTERN = re.compile(r"https?://[^\s<>\"')}\]]+")
+EXTRACT_LABEL = "extract"
+MANUAL_LABEL = "manual"  # needs a human; skipped by later drains
+
+
+def _issue_url(issue: dict) -> str | None:
+    """First URL in the issue title, else the body."""
+    urls = ISSUE_URL_PATTERN.findall(issue.get("title") or "") or ISSUE_URL_PATTERN.findall(issue.get("body") or "")
+    return urls[0] if urls else None
+
+
+def _file_link(filename: str) -> str:
+    return f"https://github.com/{config.GITHUB_REPO}/blob/{config.GITHUB_BRANCH}/extractions/{filename}"
+
+
+def _drain_one(queue: JobQueue, issue: dict, url: str) -> tuple[str, str]:
+    """Extract one issue's URL through the job queue.
+
+    Returns ``(outcome, detail)``: ``("done", filename)``, ``("existing", filename)``,
+    ``("busy", "")`` if it's already queued or running for someone else
+    (Discord, Telegram), or ``("failed", error)``.
+    """
+    try:
+        existing = lookup_url(canonical_key(url))
+    except Exception:
+        existing = None
+    if existing:
+        return "existing", existing
+
+    # One attempt: a failure is reported on the issue rather than retried behind its back
+    job, created = queue.submit(url, source="github_issue", meta={"issue": issue["number"]}, max_attempts=1)
+    if not created and job.meta.get("issue") != issue["number"]:
+        # Queued by Discord/Telegram (or another issue): its worker posts the result there
+        return "busy", ""
+    worker = _worker_name(f"issue{issue['number']}")
+    job = queue.claim(worker, job_id=job.id)
+    if job is None:
+        return "busy", ""
+    result = _execute_job(queue, job, worker)
+    if result is None:
+        failed = queue.get(job.id)
+        return "failed", (failed.error if failed else "") or "unknown error"
+    return "done", result["filename"]
+
+
+def drain_issues_once(workers: int, gh=None) -> int:
+    """Process every open ``extract`` issue: extract concurrently, commit once, then comment and close.
+
+    Returns the number of issues that failed.
+    """
+    from github_api import GitHubClient
+    from gitsync import GitError, commit_and_push
+
+    gh = gh or GitHubClient()
+    issues = [
+        i for i in gh.list_issues(EXTRACT_LABEL)
+        if MANUAL_LABEL not in {label["name"] for label in i.get("labels", [])}
+    ]
+    if not issues:
+        print("  No open extract issues.")
+        return 0
+    print(f"  Draining {len(issues)} extract issue(s) with {workers} worker(s)")
+
+    queue = JobQueue()
+    outcomes: dict[int, tuple[str, str]] = {}
+    pending = []
+    for issue in issues:
+        url = _issue_url(issue)
+        if url:
+            pending.append((issue, url))
+        else:
+            outcomes[issue["number"]] = ("no_url", "")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {issue["number"]: pool.submit(_drain_one, queue, issue, url) for issue, url in pending}
+        for number, future in futures.items():
+            try:
+                outcomes[number] = future.result()
+            except Exception as e:
+                outcomes[number] = ("failed", str(e))
+
+    done = [(i, outcomes[i["number"]][1]) for i, _ in pending if outcomes[i["number"]][0] == "done"]
+    if done:
+        if len(done) == 1:
+            message = f"Extract: {done[0][0]['title']}"
+        else:
+            message = f"Extract: {len(done)} items\n\n" + "\n".join(f"- #{i['number']} {i['title']}" for i, _ in done)
+        try:
+            commit_and_push(["extractions/"], message)
+        except GitError as e:
+            # Leave the issues open; the next drain finds the files already indexed
+            print(f"  Commit/push failed — issues left open: {e}")
+            return len(issues)
+
+    failures = 0
+    for issue in issues:
+        number = issue["number"]
+        outcome, detail = outcomes[number]
+        try:
+            if outcome in ("done", "existing"):
+                note = "Extraction complete!" if outcome == "done" else "Already extracted."
+                gh.comment(number, f"{note}\n\n[View extraction]({_file_link(detail)})\n\nFile: `extractions/{detail}`")
+                gh.close_issue(number)
+            elif outcome == "no_url":
+                gh.comment(number, "No URL found in this issue. Please include a URL in the issue title or body.\n\n"
+                                   "Example title: `https://youtube.com/watch?v=abc123`")
+                gh.add_labels(number, [MANUAL_LABEL])
+            elif outcome == "failed":
+                failures += 1
+                gh.comment(number, f"Extraction failed: `{detail[:300]}`\n\n"
+                                   f"This may be a YouTube/Twitter URL without `XAI_API_KEY` configured. "
+                                   f"Process it manually:\n```\npython coord.py \"{_issue_url(issue)}\"\n```")
+                gh.add_labels(number, [MANUAL_LABEL])
+        except Exception as e:
+            print(f"  Couldn't update issue #{number}: {e}")
+        print(f"  #{number:<5} {outcome:<9} {detail[:70]}")
+    return failures
+
+
+def drain_issues(workers: int, every: float | None = None) -> None:
+    """Drain extract issues once, or every ``every`` seconds until interrupted."""
+    from github_api import GitHubClient
+
+    gh = GitHubClient()
+    try:
+        while True:
+            failures = drain_issues_once(workers, gh)
+            if not every:
+                if failures:
+                    sys.exit(1)
+                return
+            time.sleep(every)
+    except KeyboardInterrupt:
+        print("\n  Stopped.")
+    finally:
+        gh.close()
+
+
 def paste_content(source_type_str: str) -> None:
     """Handle manual paste mode for any source type."""
     type_map = {
@@ -131,10 +527,14 @@ def paste_content(source_type_str: str) -> None:
         metadata={"extraction_method": "manual_paste"},
     )
 
+    key = canonical_key(url) if url != "N/A" else f"paste:{hashlib.sha256(content.encode()).hexdigest()[:16]}"
+    result.metadata["canonical_key"] = key
+    store_raw(key, result)
+
     print(f"  Processing with AI...")
-    processed = process_extraction(result)
+    doc = process_document(result)
 
-    document = format_document(result, processed)
+    document = format_document(result, doc)
     filename = generate_filename(result)
     date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
@@ -142,7 +542,10 @@ def paste_content(source_type_str: str) -> None:
     for location, path in saved.items():
         print(f"    -> {location}: {path}")
 
-    add_to_index(result, processed, filename, date_str)
+    num = add_to_index(result, doc, filename, date_str)
+    write_sidecar(filename, extraction_metadata(result, doc, filename, document, date_str, num))
+    neardup_index().add(key, filename, signature(content))
+    index_extraction(filename, num, document)
     print(f"\n  Done! Extraction saved as: {filename}")
     print(f"  {'='*40}\n")
 
@@ -157,6 +560,14 @@ Examples:
   python coord.py https://x.com/user/status/123456
   python coord.py https://github.com/owner/repo
   python coord.py https://example.com/article
+  python coord.py --submit https://example.com/article
+  python coord.py --worker --workers 4
+  python coord.py --drain-issues
+  python coord.py --drain-issues --every 300
+  python coord.py --reprocess --filter "source:youtube since:2025-01-01" --dry-run
+  python coord.py --reprocess --filter "num:1-50" --workers 4
+  python coord.py --jobs
+  python coord.py --taxonomy
   python coord.py --paste youtube
   python coord.py --list
   python coord.py --list --status TODO
@@ -165,11 +576,27 @@ Examples:
     )
 
     parser.add_argument("url", nargs="?", help="URL to extract content from")
+    parser.add_argument("--submit", metavar="URL", help="Queue a URL for the bot or a --worker to process")
+    parser.add_argument("--worker", action="store_true", help="Run pipeline workers on the job queue")
+    parser.add_argument("--workers", type=int, default=config.MAX_CONCURRENT_EXTRACTIONS,
+                        help="Worker threads for --worker (default: MAX_CONCURRENT_EXTRACTIONS)")
+    parser.add_argument("--drain-issues", action="store_true",
+                        help="Process all open 'extract' GitHub Issues in one run (uses --workers)")
+    parser.add_argument("--every", type=float, metavar="SECONDS",
+                        help="With --drain-issues, keep draining at this interval")
+    parser.add_argument("--reprocess", action="store_true",
+                        help="Regenerate extractions matching --filter from stored raw content (uses --workers)")
+    parser.add_argument("--dry-run", action="store_true", help="With --reprocess, only show the selection and cost estimate")
+    parser.add_argument("--restart", action="store_true", help="With --reprocess, ignore the saved checkpoint")
+    parser.add_argument("--jobs", action="store_true", help="Show job queue counts and recent jobs")
+    parser.add_argument("--taxonomy", action="store_true",
+                        help="Rebuild the tag/category alias table from the catalog and show merged variants")
     parser.add_argument("--paste", metavar="TYPE", help="Manual paste mode (youtube, twitter, github, article)")
     parser.add_argument("--list", action="store_true", help="List all extractions from the index")
     parser.add_argument("--status", nargs=2, metavar=("NUM", "STATUS"),
                         help='Update status of entry NUM (e.g., --status 3 "In Progress")')
-    parser.add_argument("--filter", metavar="STATUS", help="Filter --list by status (Backlog, TODO, In Progress, Done)")
+    parser.add_argument("--filter", metavar="STATUS", help="Filter --list/--jobs by status (Backlog, TODO, In Progress, Done); "
+                             "for --reprocess, terms like 'num:1-20 source:youtube tag:agents' (see reprocess.py)")
 
     args = parser.parse_args()
 
@@ -177,6 +604,32 @@ Examples:
         print(list_entries(args.filter))
         return
 
+    if args.jobs:
+        show_jobs(args.filter)
+        return
+
+    if args.taxonomy:
+        show_taxonomy()
+        return
+
+    if args.submit:
+        submit_url(args.submit)
+        return
+
+    if args.worker:
+        run_worker(max(args.workers, 1))
+        return
+
+    if args.drain_issues:
+        drain_issues(max(args.workers, 1), args.every)
+        return
+
+    if args.reprocess:
+        from reprocess import reprocess
+        if reprocess(args.filter, max(args.workers, 1), dry_run=args.dry_run, restart=args.restart):
+            sys.exit(1)
+        return
+
     if args.status:
         entry_num = int(args.status[0])
         new_status = args.status[1]
@@ -8,53 +8,53 @@ A lightweight web dashboard that provides:
   - Click-through links to Discord threads, Obsidian notes, YouTube videos, source URLs
   - API budget overview
 
+The page is a small HTML shell plus ``static/dashboard.css`` and
+``static/dashboard.js``. The assets are fingerprinted when the server starts
+and served with a one-year immutable cache. The shell and the JSON APIs
+carry ETags, so a repeat visit downloads only data that changed. The
+entries and graph bodies are built once per catalog/taxonomy change. Restart
+the server after editing anything in ``static/``.
+
 Usage:
     python dashboard.py              # Starts on http://localhost:8050
     python dashboard.py --port 9000  # Custom port
 """
 
 import argparse
+import hashlib
 import json
-import re
-from datetime import datetime, timezone
-from pathlib import Path
 
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import urllib.parse
 
 import config
-from outputs.index import _read_index, update_status
+from outputs.catalog import catalog_stamp, load_catalog
+from outputs.index import update_status
+from outputs.related import find_related
+from outputs.taxonomy import canonical_category, canonical_tags
 
 DASHBOARD_PORT = int(__import__("os").getenv("DASHBOARD_PORT", "8050"))
+STATIC_DIR = config.PROJECT_ROOT / "static"
+ASSET_MAX_AGE = 365 * 24 * 3600  # fingerprinted URLs change with their content, so cache them "forever"
 
 
 def _parse_index_entries() -> list[dict]:
-    """Parse INDEX.md into a list of entry dicts."""
-    content = _read_index()
-    entries = []
-    for line in content.split("\n"):
-        if not line.startswith("|") or line.startswith("| #") or line.startswith("|---"):
-            continue
-        cells = [c.strip() for c in line.split("|")]
-        if len(cells) < 9:
-            continue
-        # cells: ['', '#', 'Title', 'Source', 'Category', 'Tags', 'Status', 'Date', 'File', '']
-        tags_raw = cells[5]
-        tags = re.findall(r"`#([^`]+)`", tags_raw)
-        file_match = re.search(r"\[view\]\(\./(.+?)\)", cells[8])
-        filename = file_match.group(1) if file_match else ""
-
-        entries.append({
-            "num": cells[1],
-            "title": cells[2],
-            "source": cells[3],
-            "category": cells[4],
-            "tags": tags,
-            "status": cells[6],
-            "date": cells[7],
-            "filename": filename,
-        })
-    return entries
+    """Dashboard entries from the extraction catalog (sidecar metadata).
+
+    Tags and categories are mapped to their canonical forms, so spelling
+    variants share one filter and one graph node.
+    """
+    return [
+        {
+            **meta,
+            "num": str(meta["num"]),
+            "source": meta.get("source_type") or "",
+            "category": canonical_category(meta.get("category") or "Other"),
+            "tags": canonical_tags(meta.get("tags") or []),
+        }
+        for meta in load_catalog()
+        if meta.get("num") is not None
+    ]
 
 
 def _load_budget() -> dict:
@@ -69,7 +69,11 @@ def _load_budget() -> dict:
 
 
 def _build_graph_data(entries: list[dict]) -> dict:
-    """Build nodes and links for the knowledge graph."""
+    """Build nodes and links for the knowledge graph.
+
+    Extraction nodes carry only their id (``ext:<num>``); the page joins them
+    to ``/api/entries`` rather than receiving every entry twice.
+    """
     nodes = []
     links = []
     node_ids = set()
@@ -107,7 +111,6 @@ def _build_graph_data(entries: list[dict]) -> dict:
             "group": "extraction",
             "status": status_class,
             "size": 14,
-            "data": e,
         })
         node_ids.add(ext_id)
 
@@ -125,433 +128,41 @@ def _build_graph_data(entries: list[dict]) -> dict:
     return {"nodes": nodes, "links": links}
 
 
-def _build_html(entries: list[dict], budget: dict) -> str:
-    """Generate the full dashboard HTML with embedded JS knowledge graph."""
-    graph_data = _build_graph_data(entries)
-    entries_json = json.dumps(entries)
-    graph_json = json.dumps(graph_data)
-    budget_json = json.dumps(budget)
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+
+_api_cache: dict[str, tuple[tuple, bytes, str]] = {}  # endpoint → (catalog stamp, body, etag)
+
+
+def _catalog_json(endpoint: str, build) -> tuple[bytes, str]:
+    """Serialised ``build()`` and its ETag, rebuilt only when the catalog or taxonomy changes."""
+    stamp = catalog_stamp()
+    cached = _api_cache.get(endpoint)
+    if cached is None or cached[0] != stamp:
+        body = json.dumps(build()).encode("utf-8")
+        cached = _api_cache[endpoint] = (stamp, body, _etag(body))
+    return cached[1], cached[2]
 
-    status_counts = {}
-    for e in entries:
-        s = e["status"]
-        status_counts[s] = status_counts.get(s, 0) + 1
-    source_counts = {}
-    for e in entries:
-        s = e["source"]
-        source_counts[s] = source_counts.get(s, 0) + 1
-
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>MegaMind Dashboard</title>
-<style>
-  :root {{
-    --bg: #0f172a; --surface: #1e293b; --border: #334155;
-    --text: #e2e8f0; --muted: #94a3b8; --accent: #818cf8;
-    --green: #34d399; --amber: #fbbf24; --red: #f87171; --blue: #60a5fa;
-  }}
-  * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-  body {{ font-family: 'Inter', system-ui, sans-serif; background: var(--bg); color: var(--text); }}
-  .header {{ background: var(--surface); border-bottom: 1px solid var(--border); padding: 1rem 2rem; display: flex; align-items: center; justify-content: space-between; }}
-  .header h1 {{ font-size: 1.4rem; font-weight: 700; }}
-  .header h1 span {{ color: var(--accent); }}
-  .stats {{ display: flex; gap: 1.5rem; font-size: 0.85rem; color: var(--muted); }}
-  .stats .stat {{ text-align: center; }}
-  .stats .stat-value {{ font-size: 1.3rem; font-weight: 700; color: var(--text); }}
-  .layout {{ display: grid; grid-template-columns: 1fr 380px; height: calc(100vh - 60px); }}
-  .graph-panel {{ position: relative; overflow: hidden; }}
-  #graph {{ width: 100%; height: 100%; }}
-  .sidebar {{ background: var(--surface); border-left: 1px solid var(--border); overflow-y: auto; }}
-  .sidebar-header {{ padding: 1rem; border-bottom: 1px solid var(--border); display: flex; align-items: center; justify-content: space-between; }}
-  .sidebar-header h2 {{ font-size: 1rem; font-weight: 600; }}
-  .filters {{ padding: 0.75rem 1rem; border-bottom: 1px solid var(--border); display: flex; gap: 0.5rem; flex-wrap: wrap; }}
-  .filter-btn {{ padding: 0.25rem 0.75rem; border-radius: 9999px; border: 1px solid var(--border); background: transparent; color: var(--muted); cursor: pointer; font-size: 0.75rem; transition: all 0.2s; }}
-  .filter-btn:hover, .filter-btn.active {{ background: var(--accent); color: white; border-color: var(--accent); }}
-  .entry-list {{ padding: 0.5rem; }}
-  .entry-card {{ background: var(--bg); border: 1px solid var(--border); border-radius: 8px; padding: 0.75rem; margin-bottom: 0.5rem; cursor: pointer; transition: border-color 0.2s; }}
-  .entry-card:hover {{ border-color: var(--accent); }}
-  .entry-title {{ font-size: 0.85rem; font-weight: 600; margin-bottom: 0.35rem; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }}
-  .entry-meta {{ display: flex; gap: 0.5rem; align-items: center; font-size: 0.7rem; color: var(--muted); flex-wrap: wrap; }}
-  .badge {{ padding: 0.1rem 0.5rem; border-radius: 9999px; font-size: 0.65rem; font-weight: 600; text-transform: uppercase; }}
-  .badge-backlog {{ background: #374151; color: #9ca3af; }}
-  .badge-todo {{ background: #1e3a5f; color: var(--blue); }}
-  .badge-in-progress {{ background: #422006; color: var(--amber); }}
-  .badge-done {{ background: #064e3b; color: var(--green); }}
-  .badge-cancel {{ background: #450a0a; color: var(--red); }}
-  .tag {{ color: var(--accent); }}
-  .status-select {{ background: var(--bg); color: var(--text); border: 1px solid var(--border); border-radius: 4px; padding: 0.2rem 0.4rem; font-size: 0.7rem; cursor: pointer; }}
-  .budget-bar {{ padding: 1rem; border-top: 1px solid var(--border); background: var(--bg); }}
-  .budget-bar h3 {{ font-size: 0.8rem; color: var(--muted); margin-bottom: 0.5rem; }}
-  .budget-grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem; font-size: 0.75rem; }}
-  .budget-item {{ background: var(--surface); padding: 0.5rem; border-radius: 6px; }}
-  .budget-item .label {{ color: var(--muted); font-size: 0.65rem; }}
-  .budget-item .value {{ font-weight: 700; font-size: 1rem; }}
-  .legend {{ position: absolute; bottom: 1rem; left: 1rem; background: var(--surface); border: 1px solid var(--border); border-radius: 8px; padding: 0.75rem; font-size: 0.7rem; }}
-  .legend-item {{ display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.25rem; }}
-  .legend-dot {{ width: 10px; height: 10px; border-radius: 50%; }}
-  .view-toggle {{ display: flex; gap: 0.25rem; }}
-  .view-btn {{ padding: 0.25rem 0.5rem; border-radius: 4px; border: 1px solid var(--border); background: transparent; color: var(--muted); cursor: pointer; font-size: 0.7rem; }}
-  .view-btn.active {{ background: var(--accent); color: white; border-color: var(--accent); }}
-  .zoom-controls {{ position: absolute; top: 1rem; right: 1rem; display: flex; flex-direction: column; gap: 0.25rem; }}
-  .zoom-btn {{ width: 32px; height: 32px; border-radius: 6px; border: 1px solid var(--border); background: var(--surface); color: var(--text); cursor: pointer; font-size: 1.1rem; display: flex; align-items: center; justify-content: center; transition: background 0.2s; }}
-  .zoom-btn:hover {{ background: var(--accent); color: white; }}
-  .layout.graph-only {{ grid-template-columns: 1fr; }}
-  .layout.graph-only .sidebar {{ display: none; }}
-  canvas {{ display: block; }}
-</style>
-</head>
-<body>
-<div class="header">
-  <h1><span>MegaMind</span> Dashboard</h1>
-  <div class="stats">
-    <div class="stat"><div class="stat-value">{len(entries)}</div>Extractions</div>
-    <div class="stat"><div class="stat-value">{len(set(e['category'] for e in entries))}</div>Categories</div>
-    <div class="stat"><div class="stat-value">{len(set(t for e in entries for t in e['tags']))}</div>Tags</div>
-    <div class="stat"><div class="stat-value">${budget.get('total_cost', 0):.4f}</div>API Cost</div>
-  </div>
-</div>
-<div class="layout">
-  <div class="graph-panel">
-    <canvas id="graph"></canvas>
-    <div class="zoom-controls">
-      <button class="zoom-btn" onclick="zoomIn()" title="Zoom in">+</button>
-      <button class="zoom-btn" onclick="zoomOut()" title="Zoom out">&minus;</button>
-      <button class="zoom-btn" onclick="zoomReset()" title="Reset zoom">&#8634;</button>
-    </div>
-    <div class="legend">
-      <div class="legend-item"><div class="legend-dot" style="background:#818cf8"></div>Centre</div>
-      <div class="legend-item"><div class="legend-dot" style="background:#f59e0b"></div>Category</div>
-      <div class="legend-item"><div class="legend-dot" style="background:#34d399"></div>Extraction</div>
-      <div class="legend-item"><div class="legend-dot" style="background:#60a5fa"></div>Tag</div>
-    </div>
-  </div>
-  <div class="sidebar">
-    <div class="sidebar-header">
-      <h2>Extractions</h2>
-      <div class="view-toggle">
-        <button class="view-btn active" onclick="setView('all')">All</button>
-        <button class="view-btn" onclick="setView('graph')">Graph only</button>
-      </div>
-    </div>
-    <div class="filters" id="filters"></div>
-    <div class="entry-list" id="entry-list"></div>
-    <div class="budget-bar">
-      <h3>API Budget</h3>
-      <div class="budget-grid">
-        <div class="budget-item"><div class="label">Total Spend</div><div class="value">${budget.get('total_cost', 0):.4f}</div></div>
-        <div class="budget-item"><div class="label">Extractions</div><div class="value">{budget.get('extraction_count', 0)}</div></div>
-        <div class="budget-item"><div class="label">Input Tokens</div><div class="value">{budget.get('total_input_tokens', 0):,}</div></div>
-        <div class="budget-item"><div class="label">Output Tokens</div><div class="value">{budget.get('total_output_tokens', 0):,}</div></div>
-      </div>
-    </div>
-  </div>
-</div>
-
-<script>
-const entries = {entries_json};
-const graphData = {graph_json};
-const budget = {budget_json};
-let activeFilter = 'all';
-
-// ── Render entry list ──
-function renderEntries(filter) {{
-  const list = document.getElementById('entry-list');
-  let filtered = entries;
-  if (filter && filter !== 'all') {{
-    filtered = entries.filter(e =>
-      e.status.toLowerCase() === filter.toLowerCase() ||
-      e.category.toLowerCase() === filter.toLowerCase() ||
-      e.source.toLowerCase() === filter.toLowerCase()
-    );
-  }}
-  list.innerHTML = filtered.map(e => `
-    <div class="entry-card" data-num="${{e.num}}" onclick="highlightNode('ext:${{e.num}}')">
-      <div class="entry-title">${{e.title}}</div>
-      <div class="entry-meta">
-        <span class="badge badge-${{e.status.toLowerCase().replace(' ', '-')}}">${{e.status}}</span>
-        <span>${{e.source}}</span>
-        <span>${{e.category}}</span>
-        <span>${{e.date}}</span>
-        <select class="status-select" onchange="updateStatus(${{e.num}}, this.value)" onclick="event.stopPropagation()">
-          ${{['Backlog','TODO','In Progress','Done','Cancel'].map(s =>
-            `<option value="${{s}}" ${{e.status===s?'selected':''}}>${{s}}</option>`
-          ).join('')}}
-        </select>
-      </div>
-      <div class="entry-meta" style="margin-top:0.25rem">
-        ${{e.tags.map(t => `<span class="tag">#${{t}}</span>`).join(' ')}}
-      </div>
-    </div>
-  `).join('');
-}}
-
-// ── Render filters ──
-function renderFilters() {{
-  const filters = document.getElementById('filters');
-  const statuses = [...new Set(entries.map(e => e.status))];
-  const sources = [...new Set(entries.map(e => e.source))];
-  const cats = [...new Set(entries.map(e => e.category))];
-  const all = [{{"label":"All","value":"all"}},
-    ...statuses.map(s => ({{"label":s,"value":s}})),
-    ...sources.map(s => ({{"label":s,"value":s}})),
-    ...cats.slice(0,6).map(c => ({{"label":c,"value":c}}))
-  ];
-  filters.innerHTML = all.map(f =>
-    `<button class="filter-btn ${{f.value===activeFilter?'active':''}}" onclick="setFilter('${{f.value}}')">${{f.label}}</button>`
-  ).join('');
-}}
-
-function setFilter(f) {{
-  activeFilter = f;
-  renderFilters();
-  renderEntries(f);
-}}
-
-function setView(v) {{
-  document.querySelectorAll('.view-btn').forEach(b => b.classList.remove('active'));
-  event.target.classList.add('active');
-  const layout = document.querySelector('.layout');
-  if (v === 'graph') {{
-    layout.classList.add('graph-only');
-  }} else {{
-    layout.classList.remove('graph-only');
-  }}
-  resize();
-}}
-
-// ── Status update (calls API) ──
-function updateStatus(num, newStatus) {{
-  fetch(`/api/status?num=${{num}}&status=${{encodeURIComponent(newStatus)}}`, {{method: 'POST'}})
-    .then(r => r.json())
-    .then(d => {{
-      if (d.ok) {{
-        const entry = entries.find(e => e.num == num);
-        if (entry) entry.status = newStatus;
-        renderEntries(activeFilter);
-      }}
-    }})
-    .catch(console.error);
-}}
-
-// ── Canvas-based force graph ──
-const canvas = document.getElementById('graph');
-const ctx = canvas.getContext('2d');
-let W, H;
-let animId;
-let highlightedNode = null;
-let zoom = 1;
-let panX = 0, panY = 0;
-
-function zoomIn() {{ zoom = Math.min(zoom * 1.25, 5); }}
-function zoomOut() {{ zoom = Math.max(zoom / 1.25, 0.2); }}
-function zoomReset() {{ zoom = 1; panX = 0; panY = 0; }}
-
-canvas.addEventListener('wheel', e => {{
-  e.preventDefault();
-  if (e.deltaY < 0) zoom = Math.min(zoom * 1.1, 5);
-  else zoom = Math.max(zoom / 1.1, 0.2);
-}}, {{passive: false}});
-
-const groupColors = {{
-  centre: '#818cf8', category: '#f59e0b', extraction: '#34d399', tag: '#60a5fa'
-}};
-const statusColors = {{
-  backlog: '#6b7280', todo: '#3b82f6', 'in-progress': '#f59e0b', done: '#10b981', cancel: '#ef4444'
-}};
-
-// Initialise node positions
-const nodeMap = {{}};
-graphData.nodes.forEach((n, i) => {{
-  n.x = Math.random() * 800 + 100;
-  n.y = Math.random() * 600 + 100;
-  n.vx = 0; n.vy = 0;
-  nodeMap[n.id] = n;
-}});
-// Centre node in middle
-if (nodeMap['megamind']) {{
-  nodeMap['megamind'].x = 500;
-  nodeMap['megamind'].y = 400;
-  nodeMap['megamind'].fixed = true;
-}}
-
-function resize() {{
-  W = canvas.parentElement.clientWidth;
-  H = canvas.parentElement.clientHeight;
-  canvas.width = W; canvas.height = H;
-  if (nodeMap['megamind']) {{
-    nodeMap['megamind'].x = W/2;
-    nodeMap['megamind'].y = H/2;
-  }}
-}}
-window.addEventListener('resize', resize);
-resize();
-
-// Simple force simulation
-function simulate() {{
-  const nodes = graphData.nodes;
-  const links = graphData.links;
-  const alpha = 0.3;
-
-  // Repulsion between all nodes
-  for (let i = 0; i < nodes.length; i++) {{
-    for (let j = i+1; j < nodes.length; j++) {{
-      let dx = nodes[j].x - nodes[i].x;
-      let dy = nodes[j].y - nodes[i].y;
-      let dist = Math.sqrt(dx*dx + dy*dy) || 1;
-      let force = 800 / (dist * dist);
-      let fx = dx / dist * force;
-      let fy = dy / dist * force;
-      if (!nodes[i].fixed) {{ nodes[i].vx -= fx * alpha; nodes[i].vy -= fy * alpha; }}
-      if (!nodes[j].fixed) {{ nodes[j].vx += fx * alpha; nodes[j].vy += fy * alpha; }}
-    }}
-  }}
-
-  // Attraction along links
-  links.forEach(l => {{
-    let s = nodeMap[l.source], t = nodeMap[l.target];
-    if (!s || !t) return;
-    let dx = t.x - s.x, dy = t.y - s.y;
-    let dist = Math.sqrt(dx*dx + dy*dy) || 1;
-    let force = (dist - 120) * 0.005;
-    let fx = dx / dist * force;
-    let fy = dy / dist * force;
-    if (!s.fixed) {{ s.vx += fx; s.vy += fy; }}
-    if (!t.fixed) {{ t.vx -= fx; t.vy -= fy; }}
-  }});
-
-  // Centre gravity
-  nodes.forEach(n => {{
-    if (n.fixed) return;
-    n.vx += (W/2 - n.x) * 0.001;
-    n.vy += (H/2 - n.y) * 0.001;
-  }});
-
-  // Apply velocities with damping
-  nodes.forEach(n => {{
-    if (n.fixed) return;
-    n.vx *= 0.6; n.vy *= 0.6;
-    n.x += n.vx; n.y += n.vy;
-    n.x = Math.max(20, Math.min(W-20, n.x));
-    n.y = Math.max(20, Math.min(H-20, n.y));
-  }});
-}}
-
-function draw() {{
-  ctx.clearRect(0, 0, W, H);
-  ctx.save();
-  ctx.translate(W/2 + panX, H/2 + panY);
-  ctx.scale(zoom, zoom);
-  ctx.translate(-W/2, -H/2);
-
-  // Draw links
-  ctx.strokeStyle = 'rgba(100,116,139,0.2)';
-  ctx.lineWidth = 1;
-  graphData.links.forEach(l => {{
-    let s = nodeMap[l.source], t = nodeMap[l.target];
-    if (!s || !t) return;
-    ctx.beginPath();
-    ctx.moveTo(s.x, s.y);
-    ctx.lineTo(t.x, t.y);
-    ctx.stroke();
-  }});
-
-  // Draw nodes
-  graphData.nodes.forEach(n => {{
-    let color = groupColors[n.group] || '#64748b';
-    if (n.group === 'extraction' && n.status) {{
-      color = statusColors[n.status] || color;
-    }}
-    let r = n.size / 2;
-    let isHighlighted = highlightedNode === n.id;
-
-    ctx.beginPath();
-    ctx.arc(n.x, n.y, r + (isHighlighted ? 3 : 0), 0, Math.PI * 2);
-    ctx.fillStyle = color;
-    ctx.globalAlpha = isHighlighted ? 1 : 0.8;
-    ctx.fill();
-    ctx.globalAlpha = 1;
-
-    if (isHighlighted) {{
-      ctx.strokeStyle = '#fff';
-      ctx.lineWidth = 2;
-      ctx.stroke();
-    }}
-
-    // Labels
-    ctx.fillStyle = 'rgba(226,232,240,0.9)';
-    ctx.font = n.group === 'centre' ? 'bold 12px system-ui' : '10px system-ui';
-    ctx.textAlign = 'center';
-    ctx.fillText(n.label, n.x, n.y + r + 14);
-  }});
-
-  ctx.restore();
-  simulate();
-  animId = requestAnimationFrame(draw);
-}}
-
-function highlightNode(id) {{
-  highlightedNode = id;
-  setTimeout(() => {{ highlightedNode = null; }}, 3000);
-}}
-
-// ── Transform screen coords to graph coords ──
-function screenToGraph(sx, sy) {{
-  return {{
-    x: (sx - W/2 - panX) / zoom + W/2,
-    y: (sy - H/2 - panY) / zoom + H/2,
-  }};
-}}
-
-// ── Mouse interaction ──
-let dragNode = null;
-let isPanning = false;
-let lastPanX = 0, lastPanY = 0;
-canvas.addEventListener('mousedown', e => {{
-  const rect = canvas.getBoundingClientRect();
-  const sx = e.clientX - rect.left, sy = e.clientY - rect.top;
-  const gp = screenToGraph(sx, sy);
-  for (let n of graphData.nodes) {{
-    let dx = n.x - gp.x, dy = n.y - gp.y;
-    if (dx*dx + dy*dy < ((n.size/2 + 5) / zoom) ** 2) {{
-      dragNode = n;
-      dragNode.fixed = true;
-      return;
-    }}
-  }}
-  isPanning = true;
-  lastPanX = e.clientX;
-  lastPanY = e.clientY;
-}});
-canvas.addEventListener('mousemove', e => {{
-  if (dragNode) {{
-    const rect = canvas.getBoundingClientRect();
-    const sx = e.clientX - rect.left, sy = e.clientY - rect.top;
-    const gp = screenToGraph(sx, sy);
-    dragNode.x = gp.x;
-    dragNode.y = gp.y;
-  }} else if (isPanning) {{
-    panX += e.clientX - lastPanX;
-    panY += e.clientY - lastPanY;
-    lastPanX = e.clientX;
-    lastPanY = e.clientY;
-  }}
-}});
-canvas.addEventListener('mouseup', () => {{
-  if (dragNode && dragNode.id !== 'megamind') dragNode.fixed = false;
-  dragNode = null;
-  isPanning = false;
-}});
-
-// ── Init ──
-renderFilters();
-renderEntries('all');
-draw();
-</script>
-</body>
-</html>"""
+
+def _load_assets() -> tuple[bytes, dict[str, tuple[str, bytes, str]]]:
+    """Fingerprint the static assets and render the HTML shell around their URLs.
+
+    Returns the shell and ``{url path: (content type, body, etag)}``. Runs once, at import.
+    """
+    assets, urls = {}, {}
+    for name, content_type in (("dashboard.css", "text/css"), ("dashboard.js", "text/javascript")):
+        body = (STATIC_DIR / name).read_bytes()
+        stem, ext = name.rsplit(".", 1)
+        url = f"/static/{stem}.{hashlib.sha256(body).hexdigest()[:12]}.{ext}"
+        assets[url] = (f"{content_type}; charset=utf-8", body, _etag(body))
+        urls[ext] = url
+    shell = (STATIC_DIR / "dashboard.html").read_text(encoding="utf-8")
+    return shell.format(css_url=urls["css"], js_url=urls["js"]).encode("utf-8"), assets
+
+
+SHELL_HTML, ASSETS = _load_assets()
+SHELL_ETAG = _etag(SHELL_HTML)
 
 
 class DashboardHandler(SimpleHTTPRequestHandler):
@@ -559,18 +170,27 @@ class DashboardHandler(SimpleHTTPRequestHandler):
 
     def do_GET(self):
         if self.path == "/" or self.path == "/dashboard":
-            entries = _parse_index_entries()
-            budget = _load_budget()
-            html = _build_html(entries, budget)
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(html.encode("utf-8"))
+            self._send(SHELL_HTML, "text/html; charset=utf-8", "no-cache", SHELL_ETAG)
+        elif self.path in ASSETS:
+            content_type, body, etag = ASSETS[self.path]
+            self._send(body, content_type, f"public, max-age={ASSET_MAX_AGE}, immutable", etag)
         elif self.path.startswith("/api/entries"):
-            entries = _parse_index_entries()
-            self._json_response(entries)
+            body, etag = _catalog_json("entries", _parse_index_entries)
+            self._send(body, "application/json", "no-cache", etag)
+        elif self.path.startswith("/api/graph"):
+            body, etag = _catalog_json("graph", lambda: _build_graph_data(_parse_index_entries()))
+            self._send(body, "application/json", "no-cache", etag)
         elif self.path.startswith("/api/budget"):
             self._json_response(_load_budget())
+        elif self.path.startswith("/api/related"):
+            params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            try:
+                num = int(params.get("num", [""])[0])
+                k = int(params.get("k", [config.RELATED_TOP_K])[0])
+            except ValueError:
+                self._json_response({"error": "num must be an entry number"})
+                return
+            self._json_response(find_related(num=num, k=min(max(k, 1), 50)))
         else:
             self.send_error(404)
 
@@ -588,14 +208,26 @@ class DashboardHandler(SimpleHTTPRequestHandler):
         else:
             self.send_error(404)
 
-    def _json_response(self, data):
-        body = json.dumps(data).encode("utf-8")
+    def _send(self, body: bytes, content_type: str, cache_control: str, etag: str | None = None):
+        """Send ``body``, or 304 Not Modified if the browser already has this version."""
+        etag = etag or _etag(body)
+        if self.command == "GET" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.end_headers()
+            return
         self.send_response(200)
-        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Type", content_type)
         self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
         self.end_headers()
         self.wfile.write(body)
 
+    def _json_response(self, data):
+        self._send(json.dumps(data).encode("utf-8"), "application/json", "no-cache")
+
     def log_message(self, format, *args):
         pass  # Silence request logs
 
@@ -14,16 +14,27 @@ import asyncio
 import logging
 import os
 import re
+import socket
 import subprocess
 import sys
+import time
+from functools import partial
 
 import discord
 from discord import app_commands
 from discord.ext import tasks
 
 import config
-from coord import run_pipeline
-from outputs.formatter import parse_sections, parse_prompts, extract_category_from_content
+from coord import run_job
+from discord_outbox import (
+    EMBED_DESCRIPTION_LIMIT, EMBED_FIELD_LIMIT, EMBED_TITLE_LIMIT, KEYCAPS, MESSAGE_LIMIT, Outbox,
+    clip, compose_thread_messages, prompt_for_keycap,
+)
+from extractors.detector import canonical_key
+from gitsync import GitSync
+from watchers import youtube_quota
+from jobqueue import BATCH, DONE, FAILED, INTERACTIVE, Job, JobQueue
+from outputs.document import ProcessedDocument
 
 logging.basicConfig(
     level=logging.INFO,
@@ -67,21 +78,61 @@ class MegaMind(discord.Client):
         intents = discord.Intents.default()
         intents.message_content = True
         intents.reactions = True
-        super().__init__(intents=intents)
+        # Long rate-limit waits surface as discord.RateLimited so the outbox
+        # can hold back the whole lane instead of one request sleeping
+        super().__init__(intents=intents, max_ratelimit_timeout=config.DISCORD_MAX_RATELIMIT_WAIT)
 
         self.tree = app_commands.CommandTree(self)
         self.extraction_count = 0
-        self._processing_urls: set[str] = set()  # prevent duplicate processing
+
+        # Durable job queue — every URL goes through it; a pool of worker
+        # tasks (MAX_CONCURRENT_EXTRACTIONS) runs the pipeline
+        self.jobs = JobQueue()
+        self._worker_name = f"discord:{socket.gethostname()}"
+        self._job_wakeup = asyncio.Event()
+        self._job_waiters: dict[int, list[asyncio.Future]] = {}
+        self._workers: list[asyncio.Task] = []
+
+        # All bot output goes through one paced sender (created on the bot's loop)
+        self.outbox: Outbox | None = None
+
+        # New extraction files are committed and pushed in batches, off the job path
+        self.git = GitSync()
+
+        # Adaptive playlist polling: consecutive polls that found nothing
+        self._idle_polls = 0
+        self._next_poll_at: float | None = None
 
     async def setup_hook(self):
         """Register slash commands and start background tasks."""
         self._register_commands()
+        self.outbox = Outbox()
         if config.DISCORD_SERVER_ID:
             guild = discord.Object(id=config.DISCORD_SERVER_ID)
             self.tree.copy_global_to(guild=guild)
             await self.tree.sync(guild=guild)
+
+        # Anything still held under our name was interrupted by a restart
+        loop = asyncio.get_event_loop()
+        recovered = await loop.run_in_executor(
+            None, partial(self.jobs.recover, worker_prefix=f"{self._worker_name}:"),
+        )
+        # The first JOB_INTERACTIVE_RESERVED workers only take interactive jobs;
+        # at least one worker always takes anything (playlist/batch included)
+        workers = max(config.MAX_CONCURRENT_EXTRACTIONS, 1)
+        reserved = max(min(config.JOB_INTERACTIVE_RESERVED, workers - 1), 0)
+        self._workers = [
+            asyncio.create_task(self._job_worker(n, interactive_only=n < reserved))
+            for n in range(workers)
+        ]
+        self._workers.append(asyncio.create_task(self._liveness_loop()))
+        self.git.start()
         self.youtube_watcher_loop.start()
-        log.info("Slash commands synced, YouTube watcher started")
+        self.playlist_moves_loop.start()
+        log.info(
+            f"Slash commands synced, {len(self._workers)} job worker(s) started "
+            f"({recovered} recovered), YouTube watcher started"
+        )
 
     def _register_commands(self):
         """Register all slash commands."""
@@ -103,8 +154,9 @@ class MegaMind(discord.Client):
             await interaction.response.defer(thinking=True)
             try:
                 count = await self._check_youtube_playlist()
+                self._reschedule_poll(count)
                 await interaction.followup.send(
-                    f"Playlist check complete. Found **{count}** new video(s)."
+                    f"Playlist check complete. Queued **{count}** new video(s)."
                 )
             except Exception as e:
                 await interaction.followup.send(f"Playlist check failed: {e}")
@@ -117,11 +169,24 @@ class MegaMind(discord.Client):
                 f"API spend: **${budget_info['total_cost']:.4f}**"
                 if budget_info else "API tracking: not yet started"
             )
+            counts = self.jobs.counts()
+            queue_line = " | ".join(
+                f"{state}: **{counts.get(state, 0)}**"
+                for state in ("queued", "extracting", "processing", "posting", "failed")
+            )
+            class_lines = "".join(
+                f"\n- {name}: **{c['queued']}** queued, **{c['running']}** running, "
+                f"oldest {_format_wait(c['oldest_wait'])}, "
+                f"avg wait {_format_wait(c['avg_wait'])} (last hour, {c['started']} started)"
+                for name, c in self.jobs.class_stats().items()
+            )
             await interaction.response.send_message(
                 f"**MegaMind Status**\n"
                 f"Extractions this session: **{self.extraction_count}**\n"
+                f"Job queue: {queue_line}{class_lines}\n"
+                f"{_git_status_line(self.git.status())}\n"
                 f"YouTube watcher: **{yt_status}**\n"
-                f"Poll interval: **{config.YOUTUBE_POLL_INTERVAL // 60} min**\n"
+                f"{self._youtube_status_line()}\n"
                 f"Extract channel: <#{config.DISCORD_EXTRACT_CHANNEL_ID}>\n"
                 f"Output channel: <#{config.DISCORD_OUTPUT_CHANNEL_ID}>\n"
                 f"{budget_line}"
@@ -130,17 +195,14 @@ class MegaMind(discord.Client):
         @self.tree.command(name="search", description="Search extractions by category or tag")
         @app_commands.describe(query="Category name or tag to search for")
         async def search_command(interaction: discord.Interaction, query: str):
-            from outputs.index import list_entries
-            results = list_entries(status_filter=None)
-            matches = []
-            for line in results.split("\n"):
-                if line.startswith("|") and not line.startswith("| #") and not line.startswith("|---"):
-                    if query.lower() in line.lower():
-                        matches.append(line)
+            from outputs.catalog import search
+            matches = await asyncio.get_event_loop().run_in_executor(None, search, query)
             if matches:
-                header = "| # | Title | Source | Category | Tags | Status | Date | File |\n|---|-------|--------|----------|------|--------|------|------|\n"
-                table = header + "\n".join(matches[:15])
-                await interaction.response.send_message(f"**Search results for `{query}`:**\n```\n{table}\n```")
+                lines = [_search_line(m) for m in matches[:15]]
+                more = f"\n…and {len(matches) - 15} more" if len(matches) > 15 else ""
+                await interaction.response.send_message(
+                    clip(f"**Search results for `{query}`:**\n" + "\n".join(lines) + more, MESSAGE_LIMIT)
+                )
             else:
                 await interaction.response.send_message(f"No extractions found matching `{query}`.")
 
@@ -208,34 +270,67 @@ class MegaMind(discord.Client):
         except discord.HTTPException:
             pass
 
-        # Process each URL
-        for url in urls:
-            if url in self._processing_urls:
-                continue
+        # Canonical keys first — dedupe within the message (the job queue
+        # dedupes against work already queued or in flight)
+        loop = asyncio.get_event_loop()
+        keys = await asyncio.gather(*(loop.run_in_executor(None, canonical_key, u) for u in urls))
+        pending: dict[str, str] = {}
+        for url, key in zip(urls, keys):
+            pending.setdefault(key, url)
+
+        # Queue all URLs at once; the worker pool bounds how many run together.
+        # A single URL reports via reactions; several get one status reply each.
+        per_url_replies = len(pending) > 1
+        await asyncio.gather(*(
+            self._handle_message_url(message, url, key, per_url_replies)
+            for key, url in pending.items()
+        ), return_exceptions=True)
+
+    async def _handle_message_url(self, message: discord.Message, url: str, key: str, reply: bool):
+        """Process one URL from a #extract message and report its own progress/result."""
+        status_msg = None
+        if reply:
             try:
-                self._processing_urls.add(url)
-                result = await self._process_url(url, source="discord_extract")
-                # React with checkmark on success
-                try:
-                    await message.add_reaction("\u2705")
-                except discord.HTTPException:
-                    pass
-            except Exception as e:
-                log.error(f"Failed to process {url}: {e}")
-                try:
-                    await message.add_reaction("\u274C")
-                except discord.HTTPException:
-                    pass
-                await self._post_error(url, str(e))
-            finally:
-                self._processing_urls.discard(url)
+                status_msg = await message.reply(f"\u23F3 Extracting <{url}>", mention_author=False)
+            except discord.HTTPException:
+                pass
+
+        try:
+            result = await self._process_url(url, source="discord_extract", key=key)
+            await self._report_url_status(
+                message, status_msg, "\u2705",
+                f"\u2705 **{result['title']}** — <#{config.DISCORD_OUTPUT_CHANNEL_ID}>",
+            )
+        except Exception as e:
+            log.error(f"Failed to process {url}: {e}")
+            await self._report_url_status(
+                message, status_msg, "\u274C", f"\u274C Failed: <{url}> — {str(e)[:200]}",
+            )
+
+    async def _report_url_status(
+        self, message: discord.Message, status_msg: discord.Message | None, emoji: str, text: str,
+    ):
+        """Edit the per-URL status reply, or react on the original message."""
+        try:
+            if status_msg:
+                await status_msg.edit(content=text)
+            else:
+                await message.add_reaction(emoji)
+        except discord.HTTPException:
+            pass
 
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
-        """Handle robot emoji reaction on prompt messages to queue execution."""
+        """Handle keycap (or robot) emoji reactions on prompt messages to queue execution.
+
+        Packed messages hold several prompts: keycap N queues the prompt
+        titled with that keycap. The robot emoji queues the first code block
+        (older one-prompt messages).
+        """
         if payload.user_id == self.user.id:
             return
 
-        if str(payload.emoji) != "\U0001F916":  # robot emoji
+        emoji = str(payload.emoji)
+        if emoji != "\U0001F916" and emoji not in KEYCAPS:  # robot emoji or keycap
             return
 
         # Prompts live in threads parented to #output, or directly in #output
@@ -257,36 +352,144 @@ class MegaMind(discord.Client):
         except discord.HTTPException:
             return
 
-        # Check if the message contains a code block (prompt)
-        code_blocks = re.findall(r"```(?:\w*\n)?(.*?)```", message.content, re.DOTALL)
-        if not code_blocks:
-            return
-
-        prompt_text = code_blocks[0].strip()
+        if emoji in KEYCAPS:
+            prompt_text = prompt_for_keycap(message.content, emoji)
+        else:
+            code_block = re.search(r"```(?:\w*\n)?(.*?)```", message.content, re.DOTALL)
+            prompt_text = code_block.group(1).strip() if code_block else None
         if not prompt_text:
             return
 
         # Create a GitHub Issue to queue for execution
         await self._create_execute_issue(prompt_text, message, payload)
 
-    async def _process_url(self, url: str, source: str = "unknown") -> dict:
-        """Run the extraction pipeline on a URL and post results to #output."""
-        log.info(f"Processing URL: {url} (source: {source})")
+    async def _process_url(self, url: str, source: str = "unknown", key: str | None = None) -> dict:
+        """Queue a URL and wait until a worker has extracted and posted it.
+
+        If the URL is already queued or in flight, waits on that job instead.
+        Raises if the job fails permanently.
+        """
+        job, created = await self._submit(url, source, key=key)
+        if not created:
+            log.info(f"{url} already queued as job {job.id} ({job.state})")
+        return await self._wait_for_job(job.id)
+
+    # ── Job queue workers ──
+
+    async def _submit(self, url: str, source: str, **kwargs) -> tuple[Job, bool]:
+        """Add a URL to the job queue and wake an idle worker."""
+        loop = asyncio.get_event_loop()
+        job, created = await loop.run_in_executor(None, partial(self.jobs.submit, url, source, **kwargs))
+        if created:
+            self._job_wakeup.set()
+        return job, created
+
+    async def _wait_for_job(self, job_id: int) -> dict:
+        """Wait for a job's result. Falls back to polling the queue, so jobs
+        finished by another process (``coord.py --worker``) are noticed too."""
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._job_waiters.setdefault(job_id, []).append(future)
+        try:
+            while True:
+                try:
+                    return await asyncio.wait_for(asyncio.shield(future), timeout=30)
+                except asyncio.TimeoutError:
+                    job = await loop.run_in_executor(None, self.jobs.get, job_id)
+                    if job and job.state == DONE:
+                        return job.result
+                    if not job or job.state == FAILED:
+                        raise RuntimeError(job.error if job else f"job {job_id} disappeared")
+        finally:
+            waiters = self._job_waiters.get(job_id, [])
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters:
+                self._job_waiters.pop(job_id, None)
+
+    def _settle_waiters(self, job_id: int, result: dict | None = None, error: str | None = None):
+        for future in self._job_waiters.pop(job_id, []):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(error))
+
+    async def _liveness_loop(self):
+        """Check in with the job queue so local submitters (Telegram) know we're up."""
+        loop = asyncio.get_event_loop()
+        while not self.is_closed():
+            try:
+                await loop.run_in_executor(None, self.jobs.touch_worker, self._worker_name)
+            except Exception as e:
+                log.warning(f"Worker heartbeat failed: {e}")
+            await asyncio.sleep(config.JOB_WORKER_HEARTBEAT)
+
+    async def _job_worker(self, slot: int, interactive_only: bool = False):
+        """Claim queued jobs one at a time and run them until the bot closes.
+
+        An ``interactive_only`` worker is held back for /extract and #extract,
+        so it is free the moment a user asks even while a playlist backlog runs.
+        """
+        await self.wait_until_ready()
+        loop = asyncio.get_event_loop()
+        worker = f"{self._worker_name}:{slot}"
+        max_priority = INTERACTIVE if interactive_only else None
+        while not self.is_closed():
+            try:
+                job = await loop.run_in_executor(
+                    None, partial(
+                        self.jobs.claim, worker, max_priority=max_priority,
+                        class_limits={BATCH: config.YOUTUBE_PLAYLIST_CONCURRENCY},
+                    ),
+                )
+            except Exception as e:
+                log.error(f"Job queue claim failed: {e}")
+                job = None
+            if job is None:
+                self._job_wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._job_wakeup.wait(), timeout=config.JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    # Idle — pick up jobs whose worker died (expired leases)
+                    await loop.run_in_executor(None, self.jobs.recover)
+                continue
+            await self._run_job(job, worker)
+
+    async def _run_job(self, job: Job, worker: str):
+        """Run one claimed job: pipeline, post to #output, git, then mark done.
 
-        # Run pipeline in executor to avoid blocking
+        Failures are retried with backoff by the queue; the error is only
+        posted once the job has run out of attempts.
+        """
         loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, run_pipeline, url)
+        log.info(f"Job {job.id}: {job.url} (source: {job.source}, attempt {job.attempts}, {job.state})")
 
-        self.extraction_count += 1
-        log.info(f"Extraction complete: {result['title']} [{result['source_type']}]")
+        with self.jobs.lease_keeper(job.id, worker):
+            try:
+                result = await loop.run_in_executor(None, run_job, self.jobs, job)
+                self.extraction_count += 1
+                log.info(f"Extraction complete: {result['title']} [{result['source_type']}]")
 
-        # Post to #output
-        await self._post_output(result)
+                # Post to #output
+                await self._post_output(result)
 
-        # Git commit + push
-        await self._git_commit(result)
+                # Git commit + push (batched in the background)
+                self.git.enqueue(result["filename"], f"{result['title'][:60]} [{result['source_type']}]")
 
-        return result
+                await loop.run_in_executor(None, self.jobs.complete, job.id, worker)
+            except Exception as e:
+                log.error(f"Job {job.id} failed for {job.url}: {e}")
+                failed = await loop.run_in_executor(None, self.jobs.fail, job.id, worker, str(e))
+                if failed is None or failed.state == FAILED:
+                    await self._post_error(job.url, str(e))
+                    self._settle_waiters(job.id, error=str(e))
+                return
+
+        self._settle_waiters(job.id, result=result)
+        if job.source == "youtube_playlist":
+            await self._finish_playlist_video(job)
 
     async def _post_output(self, result: dict):
         """Post structured extraction output to #output channel.
@@ -302,26 +505,34 @@ class MegaMind(discord.Client):
                 log.error(f"Output channel {config.DISCORD_OUTPUT_CHANNEL_ID} not found")
                 return
 
-        processed = result["processed"]
-        sections = parse_sections(processed)
-        category = extract_category_from_content(processed)
-        tags_text = sections.get("Tags", "")
+        doc = ProcessedDocument.from_result(result)
+        category = doc.category
+        tags_text = doc.section("Tags")
 
         # ── Build the header embed ──
-        summary_preview = sections.get("Summary", "")
+        summary_preview = doc.summary
         if summary_preview and len(summary_preview) > 200:
             summary_preview = summary_preview[:200] + "..."
 
         embed = discord.Embed(
-            title=result["title"],
+            title=clip(result["title"], EMBED_TITLE_LIMIT),
             url=result["url"],
-            description=summary_preview,
+            description=clip(summary_preview, EMBED_DESCRIPTION_LIMIT),
             colour=get_category_colour(category),
         )
         embed.add_field(name="Source", value=result["source_type"], inline=True)
-        embed.add_field(name="Category", value=category, inline=True)
+        embed.add_field(name="Category", value=clip(category, EMBED_FIELD_LIMIT), inline=True)
         if tags_text:
-            embed.add_field(name="Tags", value=tags_text, inline=False)
+            embed.add_field(name="Tags", value=clip(tags_text, EMBED_FIELD_LIMIT), inline=False)
+
+        near = result.get("metadata", {}).get("near_duplicate")
+        if near:
+            note = "already covered — linked" if near["mode"] == "linked" else "only new material processed"
+            embed.add_field(
+                name="Near-duplicate",
+                value=clip(f"{near['filename']} ({near['similarity']:.0%} similar, {note})", EMBED_FIELD_LIMIT),
+                inline=False,
+            )
 
         thumbnail = result.get("metadata", {}).get("thumbnail", "")
         if thumbnail:
@@ -331,7 +542,7 @@ class MegaMind(discord.Client):
 
         # ── Post header embed and create thread ──
         thread = None
-        header_msg = await channel.send(embed=embed)
+        header_msg = await self.outbox.send(channel, embed=embed)
         thread_name = result["title"][:100]
         try:
             thread = await header_msg.create_thread(
@@ -346,66 +557,34 @@ class MegaMind(discord.Client):
         if not thread:
             return
 
-        # ── All detail messages go inside the thread ──
-        await self._send_thread_details(thread, sections)
-
-        # ── Budget footer — show cost of this extraction ──
+        # ── All detail messages go inside the thread, packed, budget footer last ──
+        footer = ""
         try:
             budget = _load_budget()
             if budget and budget["history"]:
                 last = budget["history"][-1]
-                await thread.send(
+                footer = (
                     f"-# Cost: ${last['cost']:.4f} | "
                     f"Session total: ${budget['total_cost']:.4f} "
                     f"({budget['extraction_count']} extractions)"
                 )
         except Exception:
             pass
+        related = "\n".join(_related_line(item) for item in result.get("related") or [])
+        await self._send_thread_details(thread, doc, footer, related)
 
-    async def _send_thread_details(self, thread: discord.Thread, sections: dict):
-        """Send all detail sections into an extraction thread."""
-        # 1. Summary
-        summary = sections.get("Summary", "")
-        if summary:
-            await thread.send(f"**Summary**\n{summary}")
-
-        # 2. Key Insights
-        insights = sections.get("Key Insights", "")
-        if insights:
-            text = f"**Key Insights**\n{insights}"
-            if len(text) > 1900:
-                text = text[:1900] + "\n..."
-            await thread.send(text)
-
-        # 3. Actions
-        actions = sections.get("Actions", "")
-        if actions:
-            text = f"**Actions**\n{actions}"
-            if len(text) > 1900:
-                text = text[:1900] + "\n..."
-            await thread.send(text)
-
-        # 4. Individual prompts — each in its own message with code block
-        prompts_section = sections.get("Implementation Prompts", "")
-        if prompts_section:
-            prompts = parse_prompts(prompts_section)
-            for prompt in prompts:
-                prompt_msg = f"**{prompt['title']}**\n```\n{prompt['body']}\n```"
-                if len(prompt_msg) > 1900:
-                    prompt_msg = prompt_msg[:1900] + "\n```"
-                msg = await thread.send(prompt_msg)
-                try:
-                    await msg.add_reaction("\U0001F916")
-                except discord.HTTPException:
-                    pass
-
-        # 5. Links & Resources
-        links = sections.get("Links & Resources", "")
-        if links:
-            text = f"**Links & Resources**\n{links}"
-            if len(text) > 1900:
-                text = text[:1900] + "\n..."
-            await thread.send(text)
+    async def _send_thread_details(
+        self, thread: discord.Thread, doc: ProcessedDocument, footer: str = "", related: str = "",
+    ):
+        """Send all detail sections into an extraction thread as few packed messages.
+
+        Prompt keycap reactions are queued behind the messages, so content
+        lands first.
+        """
+        for outbound in compose_thread_messages(doc, footer, related):
+            msg = await self.outbox.send(thread, outbound.content)
+            if outbound.reactions:
+                self.outbox.react(msg, outbound.reactions)
 
     async def _post_error(self, url: str, error_msg: str):
         """Post a failure message to #output."""
@@ -420,7 +599,7 @@ class MegaMind(discord.Client):
         embed.add_field(name="URL", value=url, inline=False)
         embed.add_field(name="Error", value=error_msg[:1000], inline=False)
         embed.set_footer(text="Retry by posting the URL again in #extract, or use /extract <url>")
-        await channel.send(embed=embed)
+        await self.outbox.send(channel, embed=embed)
 
     async def _create_execute_issue(self, prompt_text: str, message: discord.Message, payload):
         """Create a GitHub Issue tagged 'execute' with the selected prompt."""
@@ -465,20 +644,20 @@ class MegaMind(discord.Client):
             # DM the user or post confirmation
             channel = self.get_channel(config.DISCORD_OUTPUT_CHANNEL_ID)
             if channel:
-                await channel.send(
+                await self.outbox.send(
+                    channel,
                     f"Queued for execution: {issue_url}\n"
                     f"Prompt: `{prompt_text[:100]}...`"
                 )
         else:
             log.error(f"Failed to create issue: {resp.status_code} {resp.text}")
 
-    async def _git_commit(self, result: dict):
-        """Commit and push new extraction files."""
-        try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, _git_commit_sync, result)
-        except Exception as e:
-            log.error(f"Git commit failed: {e}")
+    async def close(self):
+        """Sign out of the job queue and push batched commits before shutting down."""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.jobs.remove_worker, self._worker_name)
+        await loop.run_in_executor(None, self.git.stop)
+        await super().close()
 
     # ── YouTube Playlist Watcher ──
 
@@ -487,22 +666,46 @@ class MegaMind(discord.Client):
         """Periodically check the YouTube playlist for new videos."""
         if not config.YOUTUBE_API_KEY or not config.YOUTUBE_EXTRACT_PLAYLIST_ID:
             return
+        count = 0
         try:
             count = await self._check_youtube_playlist()
             if count > 0:
-                log.info(f"YouTube watcher: processed {count} new video(s)")
+                log.info(f"YouTube watcher: queued {count} new video(s)")
         except Exception as e:
             log.error(f"YouTube watcher error: {e}")
+        self._reschedule_poll(count)
+
+    def _reschedule_poll(self, found: int):
+        """Poll again soon after activity; back off exponentially while idle or short on quota."""
+        self._idle_polls = 0 if found else self._idle_polls + 1
+        interval = youtube_quota.next_poll_interval(self._idle_polls)
+        self._next_poll_at = time.time() + interval
+        self.youtube_watcher_loop.change_interval(seconds=interval)
+        log.debug(f"Next playlist poll in {interval:.0f}s (idle polls: {self._idle_polls})")
+
+    def _youtube_status_line(self) -> str:
+        """Next poll time, quota left today and pending playlist moves, for /status."""
+        from watchers.youtube_playlist import pending_move_count
+
+        quota = youtube_quota.summary()
+        next_poll = (
+            f"in {_format_wait(max(self._next_poll_at - time.time(), 0))}"
+            if self._next_poll_at else "pending"
+        )
+        return (
+            f"Next poll: **{next_poll}** (idle polls: {self._idle_polls}) | "
+            f"Quota: **{quota['remaining']:,}**/{quota['limit']:,} units left, "
+            f"resets in {_format_wait(quota['resets_in'])} | "
+            f"Playlist moves pending: **{pending_move_count()}**"
+        )
 
     @youtube_watcher_loop.before_loop
     async def before_youtube_watcher(self):
         await self.wait_until_ready()
 
     async def _check_youtube_playlist(self) -> int:
-        """Check YouTube playlist for new videos and process them."""
-        from watchers.youtube_playlist import (
-            get_new_playlist_videos, mark_video_processed, move_video_to_completed,
-        )
+        """Check YouTube playlist for new videos and queue them. Returns the number queued."""
+        from watchers.youtube_playlist import get_new_playlist_videos
 
         loop = asyncio.get_event_loop()
         new_videos = await loop.run_in_executor(None, get_new_playlist_videos)
@@ -510,38 +713,78 @@ class MegaMind(discord.Client):
         if not new_videos:
             return 0
 
-        extract_channel = self.get_channel(config.DISCORD_EXTRACT_CHANNEL_ID)
-        processed_count = 0
-
+        # Queue them all; workers run up to YOUTUBE_PLAYLIST_CONCURRENCY at once
+        queued = []
         for video in new_videos:
             video_url = f"https://www.youtube.com/watch?v={video['video_id']}"
-            video_title = video.get("title", "Unknown")
 
-            # Post to #extract for audit trail
-            if extract_channel:
-                await extract_channel.send(
-                    f"[YouTube Playlist] New video detected: **{video_title}**\n{video_url}"
-                )
+            # Already queued or in flight from an earlier poll
+            _, created = await self._submit(
+                video_url, "youtube_playlist", key=f"youtube:{video['video_id']}",
+                meta={"video_id": video["video_id"], "playlist_item_id": video["playlist_item_id"]},
+            )
+            if created:
+                queued.append((video.get("title", "Unknown"), video_url))
 
-            # Process it
-            try:
-                result = await self._process_url(video_url, source="youtube_playlist")
-                mark_video_processed(video["video_id"])
-
-                # Move video: remove from extract playlist, add to completed
-                await loop.run_in_executor(
-                    None,
-                    move_video_to_completed,
-                    video["video_id"],
-                    video["playlist_item_id"],
-                )
+        # One audit-trail post to #extract for the whole batch
+        extract_channel = self.get_channel(config.DISCORD_EXTRACT_CHANNEL_ID)
+        if queued and extract_channel:
+            await self.outbox.send(extract_channel, _playlist_summary(queued))
+
+        return len(queued)
+
+    async def _finish_playlist_video(self, job: Job):
+        """After a playlist job is done: record it and queue its move to the completed playlist."""
+        from watchers.youtube_playlist import mark_video_processed, queue_playlist_move
+
+        video_id = job.meta.get("video_id")
+        if not video_id:
+            return
+        loop = asyncio.get_event_loop()
+        try:
+            await loop.run_in_executor(None, mark_video_processed, video_id)
+            await loop.run_in_executor(
+                None, queue_playlist_move, video_id, job.meta.get("playlist_item_id", ""),
+            )
+        except Exception as e:
+            log.error(f"Failed to record playlist video {video_id}: {e}")
+            return
+        # Move it now rather than at the next tick; retries happen on the loop
+        asyncio.create_task(self._run_playlist_moves())
+
+    @tasks.loop(minutes=1)
+    async def playlist_moves_loop(self):
+        """Retry playlist moves (remove from extract, add to completed) that are due."""
+        await self._run_playlist_moves()
+
+    @playlist_moves_loop.before_loop
+    async def before_playlist_moves(self):
+        await self.wait_until_ready()
+
+    async def _run_playlist_moves(self):
+        from watchers.youtube_playlist import process_pending_moves
+        try:
+            moved = await asyncio.get_event_loop().run_in_executor(None, process_pending_moves)
+            if moved:
+                log.info(f"Moved {moved} video(s) to the completed playlist")
+        except Exception as e:
+            log.error(f"Playlist move error: {e}")
 
-                processed_count += 1
-            except Exception as e:
-                log.error(f"Failed to process playlist video {video_url}: {e}")
-                await self._post_error(video_url, f"YouTube playlist extraction failed: {e}")
 
-        return processed_count
+def _playlist_summary(queued: list[tuple[str, str]]) -> str:
+    """One #extract message listing every newly queued playlist video."""
+    header = f"[YouTube Playlist] Queued **{len(queued)}** new video(s):"
+    lines = [header]
+    length = len(header)
+    for n, (title, url) in enumerate(queued):
+        line = f"- **{clip(title, 100)}** <{url}>"
+        more = f"- ...and {len(queued) - n} more"
+        if length + len(line) + len(more) + 2 > MESSAGE_LIMIT:
+            lines.append(more)
+            break
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
 
 
 def _load_budget() -> dict | None:
@@ -554,16 +797,46 @@ def _load_budget() -> dict | None:
         return None
 
 
-def _git_commit_sync(result: dict):
-    """Synchronous git add + commit + push."""
-    try:
-        subprocess.run(["git", "add", "extractions/"], check=True, capture_output=True)
-        msg = f"Extract: {result['title'][:60]} [{result['source_type']}]"
-        subprocess.run(["git", "commit", "-m", msg], check=True, capture_output=True)
-        subprocess.run(["git", "push"], check=True, capture_output=True)
-        log.info(f"Git: committed and pushed {result['filename']}")
-    except subprocess.CalledProcessError as e:
-        log.warning(f"Git operation failed: {e.stderr.decode() if e.stderr else e}")
+def _search_line(meta: dict) -> str:
+    """One /search result: number, linked title, category, tags and status."""
+    title = clip(meta.get("title") or meta["filename"], 80)
+    if meta.get("url"):
+        title = f"[{title}](<{meta['url']}>)"
+    tags = " ".join(f"#{t}" for t in meta.get("tags", [])[:4])
+    return f"**{meta.get('num') or '-'}.** {title} — {meta.get('category')} · {tags} · {meta.get('status')}"
+
+
+def _related_line(item: dict) -> str:
+    """One related extraction in a thread: linked title, entry number and similarity."""
+    title = clip(item.get("title") or item["filename"], 80)
+    if item.get("url"):
+        title = f"[{title}](<{item['url']}>)"
+    return f"- {title} (#{item.get('num') or '-'}, {item['score']:.0%} similar)"
+
+
+def _format_wait(seconds: float | None) -> str:
+    """Render a queue wait as e.g. ``12s`` / ``4m`` / ``1.5h`` (``-`` if unknown)."""
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def _git_status_line(status: dict) -> str:
+    """Render GitSync status for /status."""
+    last = (
+        f"last push {_format_wait(status['last_push_age'])} ago"
+        if status["last_push_age"] is not None else "no push yet"
+    )
+    line = f"Git: **{status['pending']}** file(s) queued, {last}"
+    if status["lag"]:
+        line += f", unpushed for {_format_wait(status['lag'])}"
+    if status["last_error"]:
+        line += f" — last error: `{status['last_error'][:100]}`"
+    return line
 
 
 def main():
@@ -0,0 +1,306 @@
+"""Outbound Discord posting for MegaMind — message packing and rate-limit-aware sending.
+
+``compose_thread_messages`` packs an extraction's sections into as few
+messages as fit under Discord's 2000-character limit. Prompts are numbered
+with keycap emoji so one message can hold several; reacting with a keycap
+queues that prompt.
+
+``Outbox`` sends everything through one lane per channel. Each lane paces
+itself with a token bucket sized to Discord's per-channel limits and a
+shared global bucket, and posts messages before reactions. On a 429 the
+lane waits for ``retry_after`` and tries again. discord.py still reads the
+``X-RateLimit-*`` headers itself. The outbox keeps a burst of extractions
+from running into those limits in the first place.
+"""
+
+import asyncio
+import itertools
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+
+import discord
+
+import config
+from outputs.document import ProcessedDocument, Prompt
+
+log = logging.getLogger("megamind.outbox")
+
+# Discord limits
+MESSAGE_LIMIT = 2000
+EMBED_TITLE_LIMIT = 256
+EMBED_DESCRIPTION_LIMIT = 4096
+EMBED_FIELD_LIMIT = 1024
+
+# Keycap reactions: react with N to queue the Nth prompt in a message
+KEYCAPS = [f"{n}\ufe0f\u20e3" for n in range(1, 10)] + ["\U0001F51F"]
+
+# Lane priorities — lower is sent first
+PRIORITY_MESSAGE = 0
+PRIORITY_REACTION = 1
+
+LANE_IDLE_SECONDS = 60  # a lane's task exits after this long with nothing to send
+
+
+def clip(text: str, limit: int, suffix: str = "...") -> str:
+    """Trim ``text`` to at most ``limit`` characters."""
+    return text if len(text) <= limit else text[:limit - len(suffix)] + suffix
+
+
+# ---------------------------------------------------------------------------
+# Composer
+# ---------------------------------------------------------------------------
+
+@dataclass
+class OutboundMessage:
+    """One packed thread message and the keycap reactions it should get."""
+    content: str
+    reactions: list[str] = field(default_factory=list)
+
+
+def _split_text(text: str, limit: int) -> list[str]:
+    """Split prose into chunks of at most ``limit`` characters, on line breaks where possible."""
+    chunks, current = [], ""
+    for line in text.split("\n"):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _fence(body: str) -> str:
+    """A code fence longer than any backtick run in ``body``, so the body can't close it."""
+    longest = max((len(run) for run in re.findall(r"`+", body)), default=0)
+    return "`" * max(3, longest + 1)
+
+
+def _prompt_block(keycap: str, title: str, body: str) -> str:
+    """Render a prompt as a keycap-numbered title plus code block, fitted to one message."""
+    fence = _fence(body)
+    title = clip(" ".join(title.split()), 200)
+    head = f"{keycap} **{title}**\n{fence}\n"
+    tail = f"\n{fence}"
+    return head + clip(body, MESSAGE_LIMIT - len(head) - len(tail), "\n...") + tail
+
+
+def prompt_for_keycap(content: str, keycap: str) -> str | None:
+    """Find the prompt a keycap refers to in a message built by ``_prompt_block``.
+
+    The prompt is located by its keycap title line rather than by counting
+    code blocks, so fences inside Summary or Actions prose don't shift it.
+    """
+    match = re.search(
+        rf"^{re.escape(keycap)} \*\*[^\n]*\*\*\n(`{{3,}})\n(.*?)\n\1(?!`)",
+        content, re.MULTILINE | re.DOTALL,
+    )
+    return match.group(2).strip() if match else None
+
+
+def compose_thread_messages(doc: ProcessedDocument, footer: str = "", related: str = "") -> list[OutboundMessage]:
+    """Pack an extraction's detail sections into as few messages as possible.
+
+    Order is Summary, Key Insights, Actions, prompts, Links & Resources,
+    ``related`` (a list of similar extractions), then ``footer``. Prose that doesn't fit one message is split across messages
+    rather than truncated. Each message holds at most ten prompts so every
+    prompt gets its own keycap.
+    """
+    # (text, is_prompt) blocks, in posting order
+    blocks: list[tuple[str | Prompt, bool]] = []
+
+    def add_prose(heading: str, text: str):
+        if not text:
+            return
+        first, cont = f"**{heading}**\n", f"**{heading}** (cont.)\n"
+        for n, chunk in enumerate(_split_text(text, MESSAGE_LIMIT - len(cont))):
+            blocks.append(((cont if n else first) + chunk, False))
+
+    add_prose("Summary", doc.section("Summary"))
+    add_prose("Key Insights", doc.section("Key Insights"))
+    add_prose("Actions", doc.section("Actions"))
+    for prompt in doc.prompts:
+        blocks.append((prompt, True))
+    add_prose("Links & Resources", doc.section("Links & Resources"))
+    add_prose("Related", related)
+    if footer:
+        blocks.append((clip(footer, MESSAGE_LIMIT), False))
+
+    messages: list[OutboundMessage] = []
+    current: list[str] = []
+    reactions: list[str] = []
+    length = 0
+
+    def flush():
+        nonlocal current, reactions, length
+        if current:
+            messages.append(OutboundMessage("\n\n".join(current), reactions))
+        current, reactions, length = [], [], 0
+
+    for block, is_prompt in blocks:
+        if is_prompt:
+            if len(reactions) == len(KEYCAPS):
+                flush()
+            keycap = KEYCAPS[len(reactions)]
+            text = _prompt_block(keycap, block.title, block.body)
+            if current and length + 2 + len(text) > MESSAGE_LIMIT:
+                flush()
+                keycap = KEYCAPS[0]
+                text = _prompt_block(keycap, block.title, block.body)
+            reactions.append(keycap)
+        else:
+            text = block
+            if current and length + 2 + len(text) > MESSAGE_LIMIT:
+                flush()
+        current.append(text)
+        length += len(text) + (2 if length else 0)
+    flush()
+    return messages
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    """Async token bucket: ``capacity`` requests per ``per`` seconds."""
+
+    def __init__(self, capacity: int, per: float):
+        self.capacity = capacity
+        self.rate = capacity / per
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def block(self, seconds: float):
+        """Stop handing out tokens for ``seconds`` (after a 429)."""
+        self.tokens = 0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Seconds to wait if ``exc`` is a rate limit, else None."""
+    if isinstance(exc, discord.RateLimited):
+        return exc.retry_after
+    if isinstance(exc, discord.HTTPException) and exc.status == 429:
+        try:
+            return float(exc.response.headers.get("Retry-After", 1))
+        except (AttributeError, TypeError, ValueError):
+            return 1.0
+    return None
+
+
+class _Lane:
+    """Ordered outbound queue for one channel, drained by a single task."""
+
+    def __init__(self):
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.messages = TokenBucket(config.DISCORD_CHANNEL_RATE, config.DISCORD_CHANNEL_PER)
+        self.reactions = TokenBucket(1, config.DISCORD_REACTION_INTERVAL)
+        self.task: asyncio.Task | None = None
+
+
+class Outbox:
+    """Rate-limit-aware sender: one paced lane per channel plus a global bucket."""
+
+    def __init__(self):
+        self._lanes: dict[int, _Lane] = {}
+        self._global = TokenBucket(config.DISCORD_GLOBAL_RATE, 1.0)
+        self._seq = itertools.count()
+        self.sent = 0
+        self.rate_limited = 0
+
+    def _lane(self, channel_id: int) -> _Lane:
+        lane = self._lanes.get(channel_id)
+        if lane is None:
+            lane = self._lanes[channel_id] = _Lane()
+        if lane.task is None or lane.task.done():
+            lane.task = asyncio.create_task(self._drain(channel_id, lane))
+        return lane
+
+    def _enqueue(self, channel_id: int, priority: int, call, bucket: str) -> asyncio.Future:
+        lane = self._lane(channel_id)
+        future = asyncio.get_event_loop().create_future()
+        lane.queue.put_nowait((priority, next(self._seq), call, bucket, future))
+        return future
+
+    async def send(self, channel: discord.abc.Messageable, content: str | None = None, **kwargs) -> discord.Message:
+        """Queue a message on the channel's lane and wait until it has been sent."""
+        return await self._enqueue(
+            channel.id, PRIORITY_MESSAGE, lambda: channel.send(content, **kwargs), "messages",
+        )
+
+    def react(self, message: discord.Message, emojis: list[str]) -> asyncio.Future:
+        """Queue reactions for a message behind that lane's pending messages.
+
+        Doesn't need awaiting; failures are logged, not raised.
+        """
+        futures = [
+            self._enqueue(message.channel.id, PRIORITY_REACTION,
+                          lambda e=emoji: message.add_reaction(e), "reactions")
+            for emoji in emojis
+        ]
+        return asyncio.gather(*futures, return_exceptions=True)
+
+    async def _drain(self, channel_id: int, lane: _Lane):
+        while True:
+            try:
+                priority, seq, call, bucket, future = await asyncio.wait_for(
+                    lane.queue.get(), timeout=LANE_IDLE_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                if lane.queue.empty():
+                    self._lanes.pop(channel_id, None)
+                    return
+                continue
+            if future.cancelled():
+                continue
+
+            for attempt in range(1, config.DISCORD_SEND_RETRIES + 2):
+                await getattr(lane, bucket).acquire()
+                await self._global.acquire()
+                try:
+                    result = await call()
+                except Exception as exc:
+                    wait = _retry_after(exc)
+                    if wait is None or attempt > config.DISCORD_SEND_RETRIES:
+                        if bucket == "reactions":
+                            log.debug(f"Reaction failed in {channel_id}: {exc}")
+                        if not future.done():
+                            future.set_exception(exc)
+                        break
+                    self.rate_limited += 1
+                    getattr(lane, bucket).block(wait)
+                    log.warning(f"Rate limited on channel {channel_id}; retrying in {wait:.1f}s")
+                    continue
+                self.sent += 1
+                if not future.done():
+                    future.set_result(result)
+                break
+
+    def pending(self) -> int:
+        """Number of queued, unsent requests across all lanes."""
+        return sum(lane.queue.qsize() for lane in self._lanes.values())
@@ -1,8 +1,41 @@
-"""Detect source type from a URL or reference string."""
+"""Detect source type from a URL, and canonicalise URLs for dedup/caching/indexing."""
 
+import json
+import logging
 import re
+import threading
 from enum import Enum
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import config
+
+log = logging.getLogger("megamind.detector")
+
+# Persistent short-link → final URL cache
+REDIRECT_CACHE_FILE = config.PROJECT_ROOT / ".redirect_cache.json"
+
+# Hosts that only ever redirect somewhere else
+SHORTENER_HOSTS = {
+    "t.co", "bit.ly", "bitly.com", "tinyurl.com", "buff.ly", "ow.ly", "lnkd.in",
+    "goo.gl", "dlvr.it", "is.gd", "rb.gy", "trib.al", "shorturl.at", "cutt.ly", "tiny.cc",
+}
+
+# Query parameters that identify a click, not the content
+TRACKING_PARAMS = {
+    "si", "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid",
+    "igshid", "igsh", "mc_cid", "mc_eid", "ref_src", "ref_url", "_hsenc", "_hsmi",
+    "mkt_tok", "oly_anon_id", "oly_enc_id", "vero_id",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+YOUTUBE_HOSTS = {"youtube.com", "youtu.be", "music.youtube.com", "youtube-nocookie.com"}
+TWITTER_HOSTS = {"twitter.com", "x.com", "fxtwitter.com", "vxtwitter.com", "fixupx.com"}
+GITHUB_HOSTS = {"github.com", "raw.githubusercontent.com"}
+
+_VIDEO_ID_RE = re.compile(r"^[a-zA-Z0-9_-]{11}$")
+
+_redirect_lock = threading.Lock()
+_redirect_cache: dict[str, str] | None = None
 
 
 class SourceType(Enum):
@@ -12,21 +45,29 @@ class SourceType(Enum):
     ARTICLE = "Article"
 
 
+def normalize_host(host: str) -> str:
+    """Lowercase a host and drop ports and ``www.``/``m.``/``mobile.`` prefixes."""
+    host = host.lower().split("@")[-1].split(":")[0].rstrip(".")
+    for prefix in ("www.", "m.", "mobile."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host
+
+
 def detect_source(url: str) -> SourceType:
     """Identify the source type from a URL."""
-    parsed = urlparse(url)
-    host = parsed.netloc.lower().replace("www.", "")
+    host = normalize_host(urlparse(url).netloc)
 
     # YouTube
-    if host in ("youtube.com", "youtu.be", "m.youtube.com"):
+    if host in YOUTUBE_HOSTS:
         return SourceType.YOUTUBE
 
     # Twitter / X
-    if host in ("twitter.com", "x.com", "mobile.twitter.com", "mobile.x.com"):
+    if host in TWITTER_HOSTS:
         return SourceType.TWITTER
 
     # GitHub
-    if host in ("github.com", "raw.githubusercontent.com"):
+    if host in GITHUB_HOSTS:
         return SourceType.GITHUB
 
     # Default to article for any other URL
@@ -35,25 +76,156 @@ def detect_source(url: str) -> SourceType:
 
 def extract_video_id(url: str) -> str | None:
     """Extract YouTube video ID from URL."""
-    patterns = [
-        r"(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/shorts/)([a-zA-Z0-9_-]{11})",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    host = normalize_host(parsed.netloc)
+    parts = [p for p in parsed.path.split("/") if p]
+
+    candidate = None
+    if host == "youtu.be" and parts:
+        candidate = parts[0]
+    elif host in YOUTUBE_HOSTS:
+        candidate = dict(parse_qsl(parsed.query)).get("v")
+        if not candidate and len(parts) >= 2 and parts[0] in ("embed", "shorts", "live", "v", "e"):
+            candidate = parts[1]
+    return candidate if candidate and _VIDEO_ID_RE.match(candidate) else None
 
 
 def extract_tweet_id(url: str) -> str | None:
     """Extract tweet/post ID from Twitter/X URL."""
-    match = re.search(r"(?:twitter\.com|x\.com)/\w+/status/(\d+)", url)
+    match = re.search(r"(?:twitter\.com|x\.com)/(?:i/web|\w+)/status(?:es)?/(\d+)", url)
     return match.group(1) if match else None
 
 
 def extract_github_parts(url: str) -> dict | None:
     """Extract owner/repo from GitHub URL."""
-    match = re.search(r"github\.com/([^/]+)/([^/]+?)(?:\.git|/|$)", url)
+    match = re.search(r"github\.com/([^/]+)/([^/?#]+?)(?:\.git|/|$|\?|#)", url)
     if match:
         return {"owner": match.group(1), "repo": match.group(2)}
     return None
+
+
+# ---------------------------------------------------------------------------
+# Short-link resolution
+# ---------------------------------------------------------------------------
+
+def _load_redirects() -> dict[str, str]:
+    global _redirect_cache
+    if _redirect_cache is None:
+        _redirect_cache = {}
+        if REDIRECT_CACHE_FILE.exists():
+            try:
+                _redirect_cache = json.loads(REDIRECT_CACHE_FILE.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, IOError):
+                log.warning("Corrupt redirect cache — starting fresh")
+    return _redirect_cache
+
+
+def resolve_short_link(url: str) -> str:
+    """Follow a shortener redirect chain, caching the final URL on disk.
+
+    Returns ``url`` unchanged if it is not a short link or can't be resolved.
+    """
+    if normalize_host(urlparse(url).netloc) not in SHORTENER_HOSTS:
+        return url
+
+    with _redirect_lock:
+        cached = _load_redirects().get(url)
+    if cached:
+        return cached
+
+    import requests
+    try:
+        resp = requests.head(url, allow_redirects=True, timeout=10,
+                             headers={"User-Agent": config.USER_AGENT})
+        if resp.status_code >= 400 or resp.url == url:
+            # Some shorteners reject HEAD — fall back to a streamed GET
+            resp = requests.get(url, allow_redirects=True, timeout=10, stream=True,
+                                headers={"User-Agent": config.USER_AGENT})
+            resp.close()
+        final = resp.url
+    except requests.RequestException as exc:
+        log.warning(f"Could not resolve short link {url}: {exc}")
+        return url
+
+    if final and final != url:
+        with _redirect_lock:
+            cache = _load_redirects()
+            cache[url] = final
+            REDIRECT_CACHE_FILE.write_text(json.dumps(cache, indent=1), encoding="utf-8")
+    return final or url
+
+
+# ---------------------------------------------------------------------------
+# Canonicalisation
+# ---------------------------------------------------------------------------
+
+def _clean_query(query: str) -> str:
+    """Drop tracking parameters and sort the rest."""
+    params = [
+        (k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlencode(sorted(params))
+
+
+def canonicalize(url: str, resolve: bool = True) -> tuple[str, str]:
+    """Return ``(canonical_url, canonical_key)`` for a URL."""
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    if resolve:
+        url = resolve_short_link(url)
+
+    parsed = urlparse(url)
+    host = normalize_host(parsed.netloc)
+    source = detect_source(url)
+
+    if source == SourceType.YOUTUBE:
+        video_id = extract_video_id(url)
+        if video_id:
+            return f"https://www.youtube.com/watch?v={video_id}", f"youtube:{video_id}"
+        playlist = dict(parse_qsl(parsed.query)).get("list")
+        if playlist:
+            return f"https://www.youtube.com/playlist?list={playlist}", f"youtube:list:{playlist}"
+
+    if source == SourceType.TWITTER:
+        tweet_id = extract_tweet_id(url.replace(f"//{parsed.netloc}/", "//x.com/", 1))
+        if tweet_id:
+            user = parsed.path.strip("/").split("/")[0]
+            user = "i/web" if user == "i" else user
+            return f"https://x.com/{user}/status/{tweet_id}", f"twitter:{tweet_id}"
+
+    if source == SourceType.GITHUB and host == "github.com":
+        # The extractor reads the whole repo for any owner/repo/... link
+        parts = extract_github_parts(f"github.com{parsed.path}")
+        if parts:
+            owner, repo = parts["owner"], parts["repo"]
+            return f"https://github.com/{owner}/{repo}", f"github:{owner.lower()}/{repo.lower()}"
+
+    # Generic: no trailing slash, no fragment, clean sorted query. The URL keeps
+    # its real host (some sites don't serve the bare domain); the key doesn't.
+    path = re.sub(r"/{2,}", "/", parsed.path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = _clean_query(parsed.query)
+    netloc = parsed.netloc.lower()
+    if (parsed.scheme, netloc.rsplit(":", 1)[-1]) in (("https", "443"), ("http", "80")):
+        netloc = netloc.rsplit(":", 1)[0]
+    canonical = urlunparse((parsed.scheme.lower(), netloc, path or "/", "", query, ""))
+    key_path = path if path not in ("", "/") else ""
+    key = f"{source.value.lower().split('/')[0]}:{host}{key_path}" + (f"?{query}" if query else "")
+    return canonical, key
+
+
+def canonicalize_url(url: str, resolve: bool = True) -> str:
+    """Return a stable canonical URL: short links resolved, tracking params dropped.
+
+    YouTube links become ``https://www.youtube.com/watch?v=<id>``, tweets
+    ``https://x.com/<user>/status/<id>``, GitHub repos ``https://github.com/<owner>/<repo>``.
+    """
+    return canonicalize(url, resolve)[0]
+
+
+def canonical_key(url: str, resolve: bool = True) -> str:
+    """Return a stable dedup/cache/index key, e.g. ``youtube:<id>`` or ``twitter:<id>``."""
+    return canonicalize(url, resolve)[1]
@@ -1,12 +1,170 @@
-"""GitHub repository extraction via web scraping."""
+"""GitHub repository extraction via the REST API and scraping."""
+
+import json
+import logging
+import posixpath
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 import config
 from extractors.base import BaseExtractor, ExtractionResult
 from extractors.detector import extract_github_parts
 
+log = logging.getLogger("megamind.github")
+
+# Tree + key-file cache keyed by commit SHA — an unchanged repo fetches nothing
+CACHE_FILE = config.PROJECT_ROOT / ".github_cache.json"
+CACHE_MAX_REPOS = 200
+_cache_lock = threading.Lock()  # cache read-modify-write from concurrent pipelines
+
+README_NAMES = ("readme.md", "readme.rst", "readme.txt", "readme")
+
+# Files that say how a repo is built, matched on lowercase basename
+KEY_FILE_NAMES = {
+    "pyproject.toml", "setup.py", "setup.cfg", "requirements.txt", "pipfile",
+    "package.json", "tsconfig.json", "deno.json",
+    "cargo.toml", "go.mod", "pom.xml", "build.gradle", "build.gradle.kts",
+    "gemfile", "composer.json", "mix.exs",
+    "makefile", "cmakelists.txt", "justfile",
+    "dockerfile", "docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml",
+    ".gitlab-ci.yml", ".travis.yml", "azure-pipelines.yml", "tox.ini", "noxfile.py",
+}
+# CI config directories — every YAML file inside counts as a key file
+KEY_FILE_DIRS = (".github/workflows/", ".circleci/")
+
+MAX_KEY_FILES = 12
+MAX_FETCH_WORKERS = 6
+TREE_DISPLAY_DIRS = 60
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_maxsize=MAX_FETCH_WORKERS))
+_session.mount("http://", HTTPAdapter(pool_maxsize=MAX_FETCH_WORKERS))
+
+
+def _api_headers(accept: str = "application/vnd.github.v3+json") -> dict:
+    headers = {"Accept": accept, "User-Agent": config.USER_AGENT}
+    if config.GITHUB_TOKEN:
+        headers["Authorization"] = f"token {config.GITHUB_TOKEN}"
+    return headers
+
+
+# ---------------------------------------------------------------------------
+# SHA-keyed cache
+# ---------------------------------------------------------------------------
+
+def _load_cache() -> dict:
+    if CACHE_FILE.exists():
+        try:
+            return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, IOError):
+            log.warning("Corrupt GitHub cache — starting fresh")
+    return {}
+
+
+def _save_cache(cache: dict):
+    # Drop the oldest repos once over the cap (dicts keep insertion order)
+    while len(cache) > CACHE_MAX_REPOS:
+        cache.pop(next(iter(cache)))
+    tmp = CACHE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache), encoding="utf-8")
+    tmp.replace(CACHE_FILE)
+
+
+def _cache_snapshot(cache_key: str, snapshot: dict):
+    """Store one repo's snapshot, re-reading the cache so concurrent writers don't lose entries."""
+    with _cache_lock:
+        cache = _load_cache()
+        cache.pop(cache_key, None)
+        cache[cache_key] = snapshot
+        _save_cache(cache)
+
+
+# ---------------------------------------------------------------------------
+# Tree helpers
+# ---------------------------------------------------------------------------
+
+def select_key_files(paths: list[str]) -> list[str]:
+    """Pick the manifests and CI configs worth reading from a repo tree.
+
+    Root-level files rank first, then CI configs, then manifests one
+    directory deep (monorepo packages). Capped at ``MAX_KEY_FILES``.
+    """
+    ranked = []
+    for path in paths:
+        lower = path.lower()
+        depth = lower.count("/")
+        name = posixpath.basename(lower)
+        if any(lower.startswith(d) for d in KEY_FILE_DIRS):
+            if depth <= 2 and lower.endswith((".yml", ".yaml")):
+                ranked.append((1, path))
+        elif name in KEY_FILE_NAMES and depth <= 1:
+            ranked.append((0 if depth == 0 else 2, path))
+    ranked.sort()
+    return [path for _, path in ranked[:MAX_KEY_FILES]]
+
+
+def _find_readme(paths: list[str]) -> str | None:
+    """Return the root README path from a tree listing, if any."""
+    roots = {p.lower(): p for p in paths if "/" not in p}
+    for name in README_NAMES:
+        if name in roots:
+            return roots[name]
+    return None
+
+
+def summarise_tree(entries: list[dict], truncated: bool = False) -> str:
+    """Render a recursive tree as a compact directory summary.
+
+    Lists top-level files, then directories (two levels deep) with file
+    counts, then a breakdown of file extensions across the whole repo.
+    """
+    files = [e["path"] for e in entries if e.get("type") == "blob"]
+    dir_counts: Counter = Counter()
+    for path in files:
+        parts = path.split("/")[:-1]
+        for depth in range(1, min(len(parts), 2) + 1):
+            dir_counts["/".join(parts[:depth])] += 1
+
+    lines = [f"  {p}" for p in sorted(p for p in files if "/" not in p)]
+    for d in sorted(dir_counts)[:TREE_DISPLAY_DIRS]:
+        lines.append(f"  [dir] {d}/ ({dir_counts[d]} files)")
+    if len(dir_counts) > TREE_DISPLAY_DIRS:
+        lines.append(f"  ... {len(dir_counts) - TREE_DISPLAY_DIRS} more directories")
+
+    exts = Counter(posixpath.splitext(p)[1].lower() or "(none)" for p in files)
+    lines.append(f"\n  {len(files)} files total"
+                 + (" (tree truncated by GitHub)" if truncated else ""))
+    lines.append("  Extensions: " + ", ".join(f"{ext} {n}" for ext, n in exts.most_common(10)))
+    return "\n".join(lines)
+
+
+def _fetch_capped(url: str, max_bytes: int) -> str | None:
+    """GET a raw file, reading at most ``max_bytes``. Returns None on failure."""
+    try:
+        with _session.get(url, headers=_api_headers("*/*"), timeout=15, stream=True) as resp:
+            if resp.status_code != 200:
+                return None
+            chunks, size = [], 0
+            for chunk in resp.iter_content(chunk_size=4096):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > max_bytes:
+                    break
+    except requests.RequestException as exc:
+        log.debug(f"Raw fetch failed for {url}: {exc}")
+        return None
+
+    data = b"".join(chunks)
+    text = data[:max_bytes].decode("utf-8", errors="replace")
+    if len(data) > max_bytes:
+        text += f"\n... (truncated at {max_bytes} bytes)"
+    return text
+
 
 class GitHubExtractor(BaseExtractor):
     """Extract GitHub repository content via API and scraping."""
@@ -20,12 +178,13 @@ class GitHubExtractor(BaseExtractor):
         return self._extract_repo(owner, repo, url)
 
     def _extract_repo(self, owner: str, repo: str, url: str) -> ExtractionResult:
-        """Extract repo info via GitHub API (no auth needed for public repos)."""
-        headers = {"Accept": "application/vnd.github.v3+json", "User-Agent": config.USER_AGENT}
+        """Extract repo info, README, file tree and key files via the GitHub API."""
+        api = f"{config.GITHUB_API_BASE}/repos/{owner}/{repo}"
         sections = []
+        branch = "HEAD"
 
         # Repo metadata
-        resp = requests.get(f"https://api.github.com/repos/{owner}/{repo}", headers=headers, timeout=15)
+        resp = _session.get(api, headers=_api_headers(), timeout=15)
         if resp.status_code == 200:
             data = resp.json()
             sections.append(f"Repository: {data.get('full_name', f'{owner}/{repo}')}")
@@ -36,32 +195,20 @@ class GitHubExtractor(BaseExtractor):
             sections.append(f"License: {data.get('license', {}).get('name', 'N/A') if data.get('license') else 'N/A'}")
             sections.append(f"Last updated: {data.get('updated_at', 'N/A')}")
             title = data.get("full_name", f"{owner}/{repo}")
+            branch = data.get("default_branch") or branch
         else:
             title = f"{owner}/{repo}"
             sections.append(f"Repository: {owner}/{repo}")
             sections.append("(Could not fetch metadata via API)")
 
-        # README
-        for readme_path in ["README.md", "readme.md", "README.rst", "README"]:
-            resp = requests.get(
-                f"https://raw.githubusercontent.com/{owner}/{repo}/HEAD/{readme_path}",
-                headers={"User-Agent": config.USER_AGENT},
-                timeout=15,
-            )
-            if resp.status_code == 200:
-                sections.append(f"\n--- README ---\n{resp.text[:8000]}")
-                break
-
-        # File tree (top-level)
-        resp = requests.get(
-            f"https://api.github.com/repos/{owner}/{repo}/contents/",
-            headers=headers,
-            timeout=15,
-        )
-        if resp.status_code == 200:
-            items = resp.json()
-            tree = "\n".join(f"  {'[dir] ' if item['type'] == 'dir' else ''}{item['name']}" for item in items[:50])
-            sections.append(f"\n--- File Structure ---\n{tree}")
+        snapshot = self._repo_snapshot(owner, repo, branch)
+
+        if snapshot.get("readme"):
+            sections.append(f"\n--- README ---\n{snapshot['readme']}")
+        if snapshot.get("tree"):
+            sections.append(f"\n--- File Structure ---\n{snapshot['tree']}")
+        for path, text in snapshot.get("files", {}).items():
+            sections.append(f"\n--- {path} ---\n{text}")
 
         raw_content = "\n".join(sections)
 
@@ -70,8 +217,84 @@ class GitHubExtractor(BaseExtractor):
             url=url,
             source_type="GitHub",
             raw_content=raw_content,
-            metadata={"owner": owner, "repo": repo},
+            metadata={
+                "owner": owner,
+                "repo": repo,
+                "commit_sha": snapshot.get("sha", ""),
+                "key_files": list(snapshot.get("files", {})),
+            },
+        )
+
+    def _repo_snapshot(self, owner: str, repo: str, branch: str) -> dict:
+        """Return README, tree summary and key files for the branch head.
+
+        Resolves the head commit SHA first; a cache hit on that SHA skips
+        the tree and file fetches entirely.
+        """
+        api = f"{config.GITHUB_API_BASE}/repos/{owner}/{repo}"
+        cache_key = f"{owner}/{repo}".lower()
+
+        sha = None
+        resp = _session.get(
+            f"{api}/commits/{branch}",
+            headers=_api_headers("application/vnd.github.sha"),
+            timeout=15,
         )
+        if resp.status_code == 200:
+            sha = resp.text.strip()
+
+        cache = _load_cache()
+        cached = cache.get(cache_key)
+        if sha and cached and cached.get("sha") == sha:
+            log.info(f"GitHub cache hit for {cache_key}@{sha[:8]}")
+            return cached
+
+        # One request for the whole recursive tree
+        resp = _session.get(
+            f"{api}/git/trees/{sha or branch}",
+            params={"recursive": "1"},
+            headers=_api_headers(),
+            timeout=20,
+        )
+        if resp.status_code != 200:
+            log.warning(f"Tree fetch failed for {cache_key}: {resp.status_code}")
+            return {"readme": self._probe_readme(owner, repo)}
+
+        tree = resp.json()
+        entries = tree.get("tree", [])
+        paths = [e["path"] for e in entries if e.get("type") == "blob"]
+        ref = sha or branch
+
+        readme_path = _find_readme(paths)
+        key_files = select_key_files(paths)
+        wanted = ([readme_path] if readme_path else []) + key_files
+
+        # Fetch README + key files concurrently, each with a byte cap
+        def fetch(path: str) -> str | None:
+            cap = 8000 if path == readme_path else config.GITHUB_KEY_FILE_MAX_BYTES
+            return _fetch_capped(f"{config.GITHUB_RAW_BASE}/{owner}/{repo}/{ref}/{path}", cap)
+
+        with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as pool:
+            fetched = dict(zip(wanted, pool.map(fetch, wanted)))
+
+        snapshot = {
+            "sha": sha or "",
+            "readme": fetched.pop(readme_path, None) if readme_path else None,
+            "tree": summarise_tree(entries, truncated=tree.get("truncated", False)),
+            "files": {p: t for p, t in fetched.items() if t is not None},
+        }
+
+        if sha:
+            _cache_snapshot(cache_key, snapshot)
+        return snapshot
+
+    def _probe_readme(self, owner: str, repo: str) -> str | None:
+        """Fallback when the tree is unavailable: probe common README names."""
+        for readme_path in ["README.md", "readme.md", "README.rst", "README"]:
+            text = _fetch_capped(f"{config.GITHUB_RAW_BASE}/{owner}/{repo}/HEAD/{readme_path}", 8000)
+            if text is not None:
+                return text
+        return None
 
     def _scrape_page(self, url: str) -> ExtractionResult:
         """Fallback: scrape the GitHub page directly."""
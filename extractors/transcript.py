@@ -0,0 +1,169 @@
+"""Direct YouTube caption + metadata fetching — no LLM round-trip.
+
+Reads ``ytInitialPlayerResponse`` from the watch page for video details
+and caption tracks, then downloads and parses the timed-text track into
+timestamped segments. ``config.YOUTUBE_WEB_BASE`` can point at a local
+stand-in server for testing.
+"""
+
+import html
+import json
+import logging
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from urllib.parse import urljoin
+
+import requests
+
+import config
+
+log = logging.getLogger("megamind.transcript")
+
+_PLAYER_RESPONSE_RE = re.compile(r"ytInitialPlayerResponse\s*=\s*")
+
+
+class TranscriptUnavailable(Exception):
+    """Raised when a video has no usable captions or the page can't be read."""
+
+
+@dataclass
+class CaptionSegment:
+    """A single timed caption line."""
+    start: float
+    duration: float
+    text: str
+
+
+def fetch_player_response(video_id: str) -> dict:
+    """Fetch the watch page and return its embedded player response JSON."""
+    resp = requests.get(
+        f"{config.YOUTUBE_WEB_BASE}/watch",
+        params={"v": video_id, "hl": "en"},
+        headers={"User-Agent": config.USER_AGENT, "Accept-Language": "en-US,en;q=0.9"},
+        cookies={"CONSENT": "YES+1"},
+        timeout=15,
+    )
+    if resp.status_code != 200:
+        raise TranscriptUnavailable(f"watch page returned {resp.status_code}")
+
+    match = _PLAYER_RESPONSE_RE.search(resp.text)
+    if not match:
+        raise TranscriptUnavailable("no player response on watch page")
+    try:
+        player, _ = json.JSONDecoder().raw_decode(resp.text, match.end())
+    except json.JSONDecodeError as exc:
+        raise TranscriptUnavailable(f"unreadable player response: {exc}") from exc
+
+    status = player.get("playabilityStatus", {}).get("status", "OK")
+    if status not in ("OK", "LIVE_STREAM_OFFLINE"):
+        raise TranscriptUnavailable(f"video not playable ({status})")
+    return player
+
+
+def pick_caption_track(tracks: list[dict], langs: list[str]) -> dict | None:
+    """Choose the best caption track: manual over auto-generated, preferred language first."""
+    def rank(track: dict) -> tuple:
+        lang = track.get("languageCode", "").split("-")[0]
+        lang_rank = langs.index(lang) if lang in langs else len(langs)
+        return (lang_rank, track.get("kind") == "asr")
+
+    return min(tracks, key=rank) if tracks else None
+
+
+def parse_timed_text(xml_text: str) -> list[CaptionSegment]:
+    """Parse YouTube timed text into segments.
+
+    Handles both the legacy ``<text start= dur=>`` format (seconds) and
+    the srv3 ``<p t= d=>`` format (milliseconds, optional ``<s>`` children).
+    """
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError as exc:
+        raise TranscriptUnavailable(f"unreadable caption track: {exc}") from exc
+
+    segments = []
+    for node in root.iter():
+        try:
+            if node.tag == "text":
+                start = float(node.get("start", 0))
+                duration = float(node.get("dur", 0))
+            elif node.tag == "p":
+                start = int(node.get("t", 0)) / 1000
+                duration = int(node.get("d", 0)) / 1000
+            else:
+                continue
+        except ValueError as exc:
+            raise TranscriptUnavailable(f"malformed caption timing: {exc}") from exc
+        # Captions are often double-escaped (&amp;#39;) — unescape twice
+        text = html.unescape(html.unescape("".join(node.itertext())))
+        text = " ".join(text.split())
+        if text:
+            segments.append(CaptionSegment(start, duration, text))
+    return segments
+
+
+def _timestamp(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
+def format_transcript(segments: list[CaptionSegment], paragraph_seconds: int = 30) -> str:
+    """Group segments into timestamped paragraphs of roughly ``paragraph_seconds``."""
+    paragraphs = []
+    current: list[str] = []
+    para_start = 0.0
+    for seg in segments:
+        if current and seg.start - para_start >= paragraph_seconds:
+            paragraphs.append(f"[{_timestamp(para_start)}] {' '.join(current)}")
+            current = []
+        if not current:
+            para_start = seg.start
+        current.append(seg.text)
+    if current:
+        paragraphs.append(f"[{_timestamp(para_start)}] {' '.join(current)}")
+    return "\n".join(paragraphs)
+
+
+def fetch_transcript(video_id: str) -> dict:
+    """Return video details plus a timestamped transcript for ``video_id``.
+
+    Raises ``TranscriptUnavailable`` if the video has no caption track.
+    """
+    player = fetch_player_response(video_id)
+    details = player.get("videoDetails", {})
+    tracks = (
+        player.get("captions", {})
+        .get("playerCaptionsTracklistRenderer", {})
+        .get("captionTracks", [])
+    )
+    track = pick_caption_track(tracks, config.YOUTUBE_CAPTION_LANGS)
+    if not track or not track.get("baseUrl"):
+        raise TranscriptUnavailable("no caption tracks")
+
+    resp = requests.get(
+        urljoin(f"{config.YOUTUBE_WEB_BASE}/", track["baseUrl"]),
+        headers={"User-Agent": config.USER_AGENT},
+        timeout=15,
+    )
+    if resp.status_code != 200 or not resp.text.strip():
+        raise TranscriptUnavailable(f"caption track returned {resp.status_code}")
+
+    segments = parse_timed_text(resp.text)
+    if not segments:
+        raise TranscriptUnavailable("caption track is empty")
+
+    microformat = player.get("microformat", {}).get("playerMicroformatRenderer", {})
+    return {
+        "title": details.get("title", ""),
+        "channel": details.get("author", ""),
+        "length_seconds": int(details.get("lengthSeconds", 0) or 0),
+        "views": details.get("viewCount", ""),
+        "keywords": details.get("keywords", []),
+        "description": details.get("shortDescription", ""),
+        "published": microformat.get("publishDate", ""),
+        "language": track.get("languageCode", ""),
+        "auto_generated": track.get("kind") == "asr",
+        "segments": segments,
+    }
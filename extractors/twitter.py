@@ -1,9 +1,9 @@
 """Twitter/X thread extraction via Grok API or manual paste."""
 
 import sys
-from openai import OpenAI
 
 import config
+import llm
 from extractors.base import BaseExtractor, ExtractionResult
 from extractors.detector import extract_tweet_id
 
@@ -43,34 +43,12 @@ class TwitterExtractor(BaseExtractor):
 
     def _extract_via_grok(self, url: str) -> ExtractionResult:
         """Use Grok API to extract thread content."""
-        client = OpenAI(
-            api_key=config.XAI_API_KEY,
-            base_url=config.GROK_API_BASE,
+        response = llm.grok_chat(
+            GROK_SYSTEM_PROMPT,
+            f"Extract the full content from this Twitter/X thread: {url}",
+            title=url,
         )
-
-        response = client.chat.completions.create(
-            model=config.GROK_MODEL,
-            messages=[
-                {"role": "system", "content": GROK_SYSTEM_PROMPT},
-                {"role": "user", "content": f"Extract the full content from this Twitter/X thread: {url}"},
-            ],
-        )
-
-        content = response.choices[0].message.content
-
-        # Track Grok token usage for budget
-        try:
-            from budget import record_usage
-            if response.usage:
-                record_usage(
-                    model=config.GROK_MODEL,
-                    input_tokens=response.usage.prompt_tokens or 0,
-                    output_tokens=response.usage.completion_tokens or 0,
-                    api="grok",
-                    title=url,
-                )
-        except Exception:
-            pass
+        content = response.text
 
         lines = content.strip().split("\n")
         title = lines[0].strip().lstrip("#").strip() if lines else "Untitled Thread"
@@ -82,7 +60,7 @@ class TwitterExtractor(BaseExtractor):
             url=url,
             source_type="Twitter/X",
             raw_content=content,
-            metadata={"extraction_method": "grok_api"},
+            metadata={"extraction_method": "grok_api", "latency_ms": response.latency_ms},
         )
 
     def _extract_via_paste(self, url: str) -> ExtractionResult:
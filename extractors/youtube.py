@@ -1,11 +1,18 @@
-"""YouTube video extraction via Grok API or manual paste."""
+"""YouTube video extraction via direct captions, Grok API or manual paste."""
 
+import logging
 import sys
-from openai import OpenAI
+import time
+
+import requests
 
 import config
+import llm
 from extractors.base import BaseExtractor, ExtractionResult
 from extractors.detector import extract_video_id
+from extractors.transcript import TranscriptUnavailable, fetch_transcript, format_transcript
+
+log = logging.getLogger("megamind.youtube")
 
 
 GROK_SYSTEM_PROMPT = """You are extracting content from a YouTube video. Given the video URL, provide a comprehensive extraction including:
@@ -23,14 +30,21 @@ Be thorough - capture everything valuable. Format as structured text, not markdo
 
 
 class YouTubeExtractor(BaseExtractor):
-    """Extract YouTube video content via Grok or manual paste."""
+    """Extract YouTube video content via direct captions, Grok or manual paste."""
 
     def extract(self, url: str) -> ExtractionResult:
         video_id = extract_video_id(url)
         canonical_url = f"https://www.youtube.com/watch?v={video_id}" if video_id else url
         thumbnail_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg" if video_id else ""
 
-        # Try Grok API first
+        # Captions + metadata straight from YouTube — no LLM call
+        if video_id and config.YOUTUBE_DIRECT_TRANSCRIPTS:
+            try:
+                return self._extract_direct(video_id, canonical_url, thumbnail_url)
+            except (TranscriptUnavailable, requests.RequestException) as e:
+                log.info(f"Direct transcript unavailable for {video_id} ({e}) — falling back")
+
+        # Then Grok API
         if config.XAI_API_KEY:
             return self._extract_via_grok(canonical_url, thumbnail_url)
 
@@ -44,36 +58,64 @@ class YouTubeExtractor(BaseExtractor):
         # Fall back to manual paste
         return self._extract_via_paste(canonical_url, thumbnail_url)
 
-    def _extract_via_grok(self, url: str, thumbnail_url: str = "") -> ExtractionResult:
-        """Use Grok API to extract video content."""
-        client = OpenAI(
-            api_key=config.XAI_API_KEY,
-            base_url=config.GROK_API_BASE,
+    def _extract_direct(self, video_id: str, url: str, thumbnail_url: str = "") -> ExtractionResult:
+        """Build the extraction from caption track + video details, and record the saving."""
+        started = time.monotonic()
+        info = fetch_transcript(video_id)
+        latency_ms = int((time.monotonic() - started) * 1000)
+
+        transcript = format_transcript(info["segments"])
+        if len(transcript) > config.YOUTUBE_TRANSCRIPT_MAX_CHARS:
+            transcript = transcript[:config.YOUTUBE_TRANSCRIPT_MAX_CHARS] + "\n... (transcript truncated)"
+
+        minutes, seconds = divmod(info["length_seconds"], 60)
+        caption_kind = "auto-generated" if info["auto_generated"] else "manual"
+        header = [
+            f"Title: {info['title']}",
+            f"Channel: {info['channel']}",
+            f"Published: {info['published'] or 'N/A'}",
+            f"Length: {minutes}m {seconds:02d}s",
+            f"Views: {info['views'] or 'N/A'}",
+        ]
+        if info["keywords"]:
+            header.append(f"Keywords: {', '.join(info['keywords'][:20])}")
+        raw_content = (
+            "\n".join(header)
+            + f"\n\n--- Description ---\n{info['description'][:4000]}"
+            + f"\n\n--- Transcript ({info['language']}, {caption_kind}) ---\n{transcript}"
         )
 
-        response = client.chat.completions.create(
-            model=config.GROK_MODEL,
-            messages=[
-                {"role": "system", "content": GROK_SYSTEM_PROMPT},
-                {"role": "user", "content": f"Extract all content from this YouTube video: {url}"},
-            ],
-        )
+        title = info["title"] or f"YouTube video {video_id}"
+        metadata = {
+            "extraction_method": "captions",
+            "thumbnail": thumbnail_url,
+            "channel": info["channel"],
+            "caption_segments": len(info["segments"]),
+            "latency_ms": latency_ms,
+        }
+        if config.XAI_API_KEY:  # only a saving if Grok would otherwise have been called
+            try:
+                from budget import record_savings
+                metadata["savings"] = record_savings("grok", config.GROK_MODEL, latency_ms, title=title)
+            except Exception:
+                pass  # Don't let budget tracking break extraction
 
-        content = response.choices[0].message.content
+        return ExtractionResult(
+            title=title,
+            url=url,
+            source_type="YouTube",
+            raw_content=raw_content,
+            metadata=metadata,
+        )
 
-        # Track Grok token usage for budget
-        try:
-            from budget import record_usage
-            if response.usage:
-                record_usage(
-                    model=config.GROK_MODEL,
-                    input_tokens=response.usage.prompt_tokens or 0,
-                    output_tokens=response.usage.completion_tokens or 0,
-                    api="grok",
-                    title=url,
-                )
-        except Exception:
-            pass
+    def _extract_via_grok(self, url: str, thumbnail_url: str = "") -> ExtractionResult:
+        """Use Grok API to extract video content."""
+        response = llm.grok_chat(
+            GROK_SYSTEM_PROMPT,
+            f"Extract all content from this YouTube video: {url}",
+            title=url,
+        )
+        content = response.text
 
         # Try to parse title from first line of response
         lines = content.strip().split("\n")
@@ -87,7 +129,7 @@ class YouTubeExtractor(BaseExtractor):
             url=url,
             source_type="YouTube",
             raw_content=content,
-            metadata={"extraction_method": "grok_api", "thumbnail": thumbnail_url},
+            metadata={"extraction_method": "grok_api", "thumbnail": thumbnail_url, "latency_ms": response.latency_ms},
         )
 
     def _extract_via_paste(self, url: str, thumbnail_url: str = "") -> ExtractionResult:
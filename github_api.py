@@ -0,0 +1,215 @@
+"""Small GitHub REST client for the issue-driven capture flow.
+
+``AsyncGitHubClient`` keeps one pooled ``httpx.AsyncClient`` for the life
+of the process, so the Telegram bot can create issues without blocking its
+event loop and without a new TLS handshake per request. ``GitHubClient`` is
+the blocking equivalent on a ``requests.Session``, used by
+``coord.py --drain-issues``. Transient failures (network errors, 5xx, rate
+limits) are retried with backoff. Whatever still fails is raised as
+``GitHubError`` with ``retryable`` set so callers can queue it for later.
+A POST (new issue, comment) is only retried when GitHub can't have acted on
+it: the connection was never made, or the request was rate limited. After a
+read timeout or a 5xx it may already have gone through, and sending it again
+would open a duplicate issue.
+
+Both talk to ``GITHUB_API_BASE``, so they can be pointed at a local
+stand-in server for testing.
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+import requests
+import urllib3
+
+import config
+
+log = logging.getLogger("megamind.github")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class GitHubError(Exception):
+    """A GitHub API call failed. ``retryable`` is True for outages and rate limits."""
+
+    def __init__(self, message: str, status: int | None = None, retryable: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+
+
+def _headers(token: str) -> dict:
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "User-Agent": config.USER_AGENT,
+    }
+    if token:
+        headers["Authorization"] = f"token {token}"
+    return headers
+
+
+def _is_rate_limited(resp: httpx.Response | requests.Response) -> bool:
+    return resp.status_code == 429 or (
+        resp.status_code == 403 and (
+            resp.headers.get("x-ratelimit-remaining") == "0" or "retry-after" in resp.headers
+        )
+    )
+
+
+def _never_sent(exc: Exception) -> bool:
+    """The request failed before reaching GitHub, so even a POST is safe to send again."""
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, requests.ConnectTimeout)):
+        return True
+    if isinstance(exc, requests.ConnectionError):
+        reason = getattr(exc.args[0] if exc.args else None, "reason", None)
+        return isinstance(reason, urllib3.exceptions.NewConnectionError)
+    return False
+
+
+def _retryable(method: str, resp: httpx.Response | requests.Response | None, exc: Exception | None = None) -> bool:
+    if resp is not None and _is_rate_limited(resp):
+        return True
+    if method == "POST":
+        return exc is not None and _never_sent(exc)
+    return exc is not None or resp.status_code in RETRY_STATUSES
+
+
+def _retry_delay(resp: httpx.Response | requests.Response | None, attempt: int) -> float:
+    """Seconds to wait before retrying: ``Retry-After`` if given, else exponential backoff."""
+    if resp is not None:
+        try:
+            return min(float(resp.headers["retry-after"]), 60.0)
+        except (KeyError, ValueError):
+            pass
+    return min(2 ** attempt, 30)
+
+
+class AsyncGitHubClient:
+    """Async, connection-pooled client for one repository's issues."""
+
+    def __init__(
+        self,
+        token: str | None = None,
+        repo: str | None = None,
+        base_url: str | None = None,
+        retries: int = 2,
+        timeout: float = 15,
+    ):
+        self.repo = repo or config.GITHUB_REPO
+        self.retries = retries
+        self._client = httpx.AsyncClient(
+            base_url=base_url or config.GITHUB_API_BASE,
+            headers=_headers(config.GITHUB_TOKEN if token is None else token),
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+        )
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        for attempt in range(self.retries + 1):
+            resp = None
+            try:
+                resp = await self._client.request(method, path, **kwargs)
+            except httpx.HTTPError as exc:
+                error = GitHubError(f"{method} {path}: {exc}", retryable=_retryable(method, None, exc))
+            else:
+                if resp.status_code < 400:
+                    return resp
+                error = GitHubError(
+                    f"{method} {path}: {resp.status_code} {resp.text[:200]}",
+                    status=resp.status_code, retryable=_retryable(method, resp),
+                )
+            if not error.retryable or attempt == self.retries:
+                raise error
+            delay = _retry_delay(resp, attempt)
+            log.warning(f"GitHub request failed (attempt {attempt + 1}), retrying in {delay:.0f}s: {error}")
+            await asyncio.sleep(delay)
+
+    async def create_issue(self, title: str, body: str = "", labels: list[str] | None = None) -> dict:
+        """Open an issue and return the API's issue object."""
+        resp = await self._request(
+            "POST", f"/repos/{self.repo}/issues",
+            json={"title": title, "body": body, "labels": labels or []},
+        )
+        return resp.json()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+class GitHubClient:
+    """Blocking, session-pooled client for one repository's issues."""
+
+    def __init__(
+        self,
+        token: str | None = None,
+        repo: str | None = None,
+        base_url: str | None = None,
+        retries: int = 2,
+        timeout: float = 15,
+    ):
+        self.repo = repo or config.GITHUB_REPO
+        self.base_url = (base_url or config.GITHUB_API_BASE).rstrip("/")
+        self.retries = retries
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers.update(_headers(config.GITHUB_TOKEN if token is None else token))
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        for attempt in range(self.retries + 1):
+            resp = None
+            try:
+                resp = self._session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+            except requests.RequestException as exc:
+                error = GitHubError(f"{method} {path}: {exc}", retryable=_retryable(method, None, exc))
+            else:
+                if resp.status_code < 400:
+                    return resp
+                error = GitHubError(
+                    f"{method} {path}: {resp.status_code} {resp.text[:200]}",
+                    status=resp.status_code, retryable=_retryable(method, resp),
+                )
+            if not error.retryable or attempt == self.retries:
+                raise error
+            delay = _retry_delay(resp, attempt)
+            log.warning(f"GitHub request failed (attempt {attempt + 1}), retrying in {delay:.0f}s: {error}")
+            time.sleep(delay)
+
+    def list_issues(self, label: str, state: str = "open") -> list[dict]:
+        """All issues with ``label``, oldest first (pull requests excluded)."""
+        issues, page = [], 1
+        while True:
+            batch = self._request(
+                "GET", f"/repos/{self.repo}/issues",
+                params={"labels": label, "state": state, "sort": "created",
+                        "direction": "asc", "per_page": 100, "page": page},
+            ).json()
+            issues += [i for i in batch if "pull_request" not in i]
+            if len(batch) < 100:
+                return issues
+            page += 1
+
+    def create_issue(self, title: str, body: str = "", labels: list[str] | None = None) -> dict:
+        return self._request(
+            "POST", f"/repos/{self.repo}/issues",
+            json={"title": title, "body": body, "labels": labels or []},
+        ).json()
+
+    def comment(self, number: int, body: str) -> dict:
+        return self._request("POST", f"/repos/{self.repo}/issues/{number}/comments", json={"body": body}).json()
+
+    def add_labels(self, number: int, labels: list[str]):
+        self._request("POST", f"/repos/{self.repo}/issues/{number}/labels", json={"labels": labels})
+
+    def close_issue(self, number: int):
+        self._request("PATCH", f"/repos/{self.repo}/issues/{number}", json={"state": "closed"})
+
+    def close(self):
+        self._session.close()
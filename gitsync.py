@@ -0,0 +1,200 @@
+"""Background git commit + push for new extractions.
+
+Extraction workers hand finished files to ``GitSync.enqueue`` and carry on.
+A single background thread batches everything queued within
+``GIT_COMMIT_WINDOW`` seconds (or ``GIT_COMMIT_MAX_FILES`` files) into one
+commit and pushes it. A rejected push is rebased onto the remote and
+retried. One thread owns the index, so nothing contends for the
+index lock.
+"""
+
+import logging
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import config
+
+log = logging.getLogger("megamind.git")
+
+
+class GitError(Exception):
+    """Raised when a git command fails."""
+
+
+def _git(args: list[str], cwd: Path) -> str:
+    proc = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise GitError(f"git {' '.join(args)}: {(proc.stderr or proc.stdout).strip()}")
+    return proc.stdout
+
+
+def commit(paths: list[str], message: str, repo_dir: Path | None = None) -> bool:
+    """Stage ``paths`` and commit. Returns False if there was nothing to commit."""
+    cwd = repo_dir or config.PROJECT_ROOT
+    _git(["add", "--", *paths], cwd)
+    if subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=cwd).returncode == 0:
+        return False
+    _git(["commit", "-m", message], cwd)
+    return True
+
+
+def push(repo_dir: Path | None = None, retries: int | None = None):
+    """Push, rebasing onto the remote and retrying when the push is rejected."""
+    cwd = repo_dir or config.PROJECT_ROOT
+    retries = config.GIT_PUSH_RETRIES if retries is None else retries
+    for attempt in range(retries + 1):
+        try:
+            _git(["push"], cwd)
+            return
+        except GitError as exc:
+            if attempt == retries:
+                raise
+            log.warning(f"Push failed (attempt {attempt + 1}), rebasing and retrying: {exc}")
+            time.sleep(min(2 ** attempt, 30))
+            try:
+                _git(["pull", "--rebase", "--autostash"], cwd)
+            except GitError as pull_exc:
+                _git_quiet(["rebase", "--abort"], cwd)
+                log.warning(f"Rebase failed: {pull_exc}")
+
+
+def _git_quiet(args: list[str], cwd: Path):
+    subprocess.run(["git", *args], cwd=cwd, capture_output=True)
+
+
+def commit_and_push(paths: list[str], message: str, repo_dir: Path | None = None) -> bool:
+    """Commit ``paths`` and push with rebase-retry. Returns False if nothing changed."""
+    if not commit(paths, message, repo_dir):
+        return False
+    push(repo_dir)
+    return True
+
+
+@dataclass
+class _Pending:
+    filename: str
+    message: str
+    queued_at: float
+
+
+class GitSync:
+    """Debounced background committer for the bot's extraction files."""
+
+    def __init__(
+        self,
+        paths: tuple[str, ...] = ("extractions/",),
+        repo_dir: Path | None = None,
+        window: float | None = None,
+        max_files: int | None = None,
+    ):
+        self.paths = list(paths)
+        self.repo_dir = repo_dir or config.PROJECT_ROOT
+        self.window = config.GIT_COMMIT_WINDOW if window is None else window
+        self.max_files = max_files or config.GIT_COMMIT_MAX_FILES
+        self._pending: list[_Pending] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        # Status
+        self.unpushed_since: float | None = None  # queue time of the oldest change not yet pushed
+        self.last_push_at: float | None = None
+        self.last_error: str | None = None
+        self.commits = 0
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="gitsync", daemon=True)
+            self._thread.start()
+
+    def stop(self, flush: bool = True):
+        """Stop the worker, committing and pushing anything still queued first."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=120)
+        if flush:
+            self._sync()
+
+    def enqueue(self, filename: str, message: str):
+        """Queue a written extraction file for the next batched commit."""
+        with self._lock:
+            self._pending.append(_Pending(filename, message, time.time()))
+        self._wake.set()  # starts the window, or ends it early once full
+
+    def status(self) -> dict:
+        """Queue depth, push lag and last push time for /status."""
+        now = time.time()
+        with self._lock:
+            depth = len(self._pending)
+        return {
+            "pending": depth,
+            "lag": now - self.unpushed_since if self.unpushed_since else 0.0,
+            "last_push_age": now - self.last_push_at if self.last_push_at else None,
+            "commits": self.commits,
+            "last_error": self.last_error,
+        }
+
+    # ── Worker ──
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.window if self.unpushed_since else None)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+
+            # Debounce: wait out the window from the first queued file, or until full
+            with self._lock:
+                first = self._pending[0].queued_at if self._pending else None
+            if first is not None:
+                while not self._stop.is_set():
+                    with self._lock:
+                        full = len(self._pending) >= self.max_files
+                    remaining = first + self.window - time.time()
+                    if full or remaining <= 0:
+                        break
+                    self._wake.wait(timeout=remaining)
+                    self._wake.clear()
+            self._sync()
+
+    def _sync(self):
+        """Commit everything queued as one commit, then push (retrying a failed push later)."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+
+        if batch:
+            if self.unpushed_since is None:
+                self.unpushed_since = batch[0].queued_at
+            if len(batch) == 1:
+                message = f"Extract: {batch[0].message}"
+            else:
+                message = f"Extract: {len(batch)} items\n\n" + "\n".join(f"- {p.message}" for p in batch)
+            try:
+                if commit(self.paths, message, self.repo_dir):
+                    self.commits += 1
+                    log.info(f"Git: committed {len(batch)} extraction(s)")
+            except GitError as exc:
+                self.last_error = str(exc)
+                log.warning(f"Git commit failed, will retry: {exc}")
+                with self._lock:
+                    self._pending[:0] = batch
+                return
+
+        if self.unpushed_since is None:
+            return
+        try:
+            push(self.repo_dir)
+        except GitError as exc:
+            self.last_error = str(exc)
+            log.warning(f"Git push failed, will retry: {exc}")
+            return
+        self.last_push_at = time.time()
+        self.unpushed_since = None
+        self.last_error = None
+        log.info("Git: pushed")
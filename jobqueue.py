@@ -0,0 +1,480 @@
+"""Durable SQLite job queue for extractions.
+
+Jobs move through ``queued → extracting → processing → posting → done``
+(or ``failed``). A worker claims a job under a lease and keeps it alive
+with heartbeats; if the worker dies, the lease expires and the job is
+re-queued. A job that already produced its result resumes at ``posting``
+instead of re-running the pipeline. Failures are retried with exponential
+backoff up to ``max_attempts``.
+
+Jobs are claimed by priority class (interactive before batch), with aging
+so a long batch backlog can't starve, and workers may be reserved for
+interactive jobs only.
+
+Discord, the YouTube playlist watcher and the CLI all submit here.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import config
+
+log = logging.getLogger("megamind.jobs")
+
+QUEUED = "queued"
+EXTRACTING = "extracting"
+PROCESSING = "processing"
+POSTING = "posting"
+DONE = "done"
+FAILED = "failed"
+
+ACTIVE_STATES = (EXTRACTING, PROCESSING, POSTING)
+OPEN_STATES = (QUEUED,) + ACTIVE_STATES
+
+# Priority classes — lower runs first
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+# Someone is waiting on the result of these; everything else is batch
+INTERACTIVE_SOURCES = {"slash_command", "discord_extract", "cli", "telegram"}
+
+
+def priority_for(source: str) -> int:
+    """Return the priority class for a job source."""
+    return INTERACTIVE if source in INTERACTIVE_SOURCES else BATCH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    url          TEXT NOT NULL,
+    key          TEXT NOT NULL,
+    source       TEXT NOT NULL,
+    state        TEXT NOT NULL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    not_before   REAL NOT NULL DEFAULT 0,
+    lease_until  REAL,
+    worker       TEXT,
+    error        TEXT,
+    meta         TEXT NOT NULL DEFAULT '{}',
+    result       TEXT,
+    created_at   REAL NOT NULL,
+    started_at   REAL,
+    updated_at   REAL NOT NULL,
+    priority     INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, not_before);
+CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key);
+CREATE TABLE IF NOT EXISTS workers (
+    name       TEXT PRIMARY KEY,
+    last_seen  REAL NOT NULL
+);
+"""
+
+# Columns added after the first release: (name, definition)
+MIGRATIONS = [
+    ("priority", "INTEGER NOT NULL DEFAULT 1"),
+]
+
+
+@dataclass
+class Job:
+    """A single queued extraction."""
+    id: int
+    url: str
+    key: str
+    source: str
+    state: str
+    attempts: int
+    max_attempts: int
+    not_before: float
+    lease_until: float | None
+    worker: str | None
+    error: str | None
+    created_at: float
+    started_at: float | None
+    updated_at: float
+    priority: int = BATCH
+    meta: dict = field(default_factory=dict)
+    result: dict | None = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        data = dict(row)
+        data["meta"] = json.loads(data["meta"] or "{}")
+        data["result"] = json.loads(data["result"]) if data["result"] else None
+        return cls(**data)
+
+
+class LeaseLost(RuntimeError):
+    """The job was recovered from this worker and may now be running elsewhere."""
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff before retry number ``attempts`` (1-based)."""
+    return min(config.JOB_RETRY_BASE * 2 ** (attempts - 1), config.JOB_RETRY_MAX)
+
+
+class JobQueue:
+    """SQLite-backed job queue, safe to share between threads and processes."""
+
+    def __init__(self, path=None):
+        self.path = str(path or config.JOB_DB_PATH)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for name, definition in MIGRATIONS:
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+
+    @contextmanager
+    def _conn(self):
+        """Yield this thread's connection (autocommit, WAL, busy timeout)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        yield conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write transaction that takes the lock up front."""
+        with self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ── Submission ──
+
+    def submit(
+        self,
+        url: str,
+        source: str,
+        key: str | None = None,
+        meta: dict | None = None,
+        max_attempts: int | None = None,
+        priority: int | None = None,
+    ) -> tuple[Job, bool]:
+        """Queue a URL. Returns ``(job, created)``.
+
+        If an open job already exists for the same canonical key, that job
+        is returned with ``created=False`` instead of queueing a duplicate
+        (and promoted if the new request has a higher priority).
+        """
+        if key is None:
+            from extractors.detector import canonical_key
+            key = canonical_key(url)
+        if priority is None:
+            priority = priority_for(source)
+
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                f"SELECT * FROM jobs WHERE key = ? AND state IN ({','.join('?' * len(OPEN_STATES))}) "
+                f"ORDER BY id LIMIT 1",
+                (key, *OPEN_STATES),
+            ).fetchone()
+            if row:
+                if priority < row["priority"]:
+                    conn.execute("UPDATE jobs SET priority = ? WHERE id = ?", (priority, row["id"]))
+                    row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                return Job.from_row(row), False
+            cur = conn.execute(
+                "INSERT INTO jobs (url, key, source, state, max_attempts, meta, created_at, updated_at, priority) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, key, source, QUEUED, max_attempts or config.JOB_MAX_ATTEMPTS,
+                 json.dumps(meta or {}), now, now, priority),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (cur.lastrowid,)).fetchone()
+        log.info(f"Queued job {row['id']}: {url} (source: {source})")
+        return Job.from_row(row), True
+
+    # ── Worker side ──
+
+    def claim(
+        self,
+        worker: str,
+        job_id: int | None = None,
+        max_priority: int | None = None,
+        class_limits: dict[int, int] | None = None,
+    ) -> Job | None:
+        """Lease the next runnable job (or a specific one) to ``worker``.
+
+        Jobs are taken in order of effective priority: the class number minus
+        one for every ``JOB_PRIORITY_AGING`` seconds spent waiting, so old
+        batch jobs eventually run level with new interactive ones. With
+        ``max_priority``, only jobs of that class or better are considered
+        (reserved workers). ``class_limits`` caps how many jobs of a class may
+        be in flight at once, e.g. ``{BATCH: 2}``. A job that already has a
+        result resumes at ``posting``.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            if job_id is not None:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE id = ? AND state = ?", (job_id, QUEUED),
+                ).fetchone()
+            else:
+                limit = BATCH if max_priority is None else max_priority
+                excluded = []
+                if class_limits:
+                    running = dict(conn.execute(
+                        f"SELECT priority, COUNT(*) FROM jobs "
+                        f"WHERE state IN ({','.join('?' * len(ACTIVE_STATES))}) GROUP BY priority",
+                        ACTIVE_STATES,
+                    ).fetchall())
+                    excluded = [p for p, cap in class_limits.items() if running.get(p, 0) >= cap]
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE state = ? AND not_before <= ? AND priority <= ? "
+                    f"AND priority NOT IN ({','.join('?' * len(excluded))}) "
+                    "ORDER BY priority - (? - created_at) / ?, id LIMIT 1",
+                    (QUEUED, now, limit, *excluded, now, max(config.JOB_PRIORITY_AGING, 1)),
+                ).fetchone()
+            if not row:
+                return None
+            state = POSTING if row["result"] else EXTRACTING
+            conn.execute(
+                "UPDATE jobs SET state = ?, worker = ?, lease_until = ?, attempts = attempts + 1, "
+                "started_at = ?, updated_at = ? WHERE id = ?",
+                (state, worker, now + config.JOB_LEASE_SECONDS, now, now, row["id"]),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return Job.from_row(row)
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """Extend a lease. Returns False if the job is no longer held by ``worker``."""
+        now = time.time()
+        with self._conn() as conn:
+            cur = conn.execute(
+                f"UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND worker = ? "
+                f"AND state IN ({','.join('?' * len(ACTIVE_STATES))})",
+                (now + config.JOB_LEASE_SECONDS, now, job_id, worker, *ACTIVE_STATES),
+            )
+        return cur.rowcount == 1
+
+    @contextmanager
+    def lease_keeper(self, job_id: int, worker: str):
+        """Heartbeat a job's lease from a background thread while the block runs."""
+        stop = threading.Event()
+        interval = max(config.JOB_LEASE_SECONDS / 3, 1)
+
+        def beat():
+            while not stop.wait(interval):
+                if not self.heartbeat(job_id, worker):
+                    log.warning(f"Lost lease on job {job_id}")
+                    return
+
+        thread = threading.Thread(target=beat, name=f"lease-{job_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+
+    def advance(self, job_id: int, worker: str, state: str, result: dict | None = None) -> bool:
+        """Record progress to a new stage, optionally storing the pipeline result.
+
+        Returns False (and changes nothing) if ``worker`` no longer holds the job.
+        """
+        now = time.time()
+        with self._conn() as conn:
+            if result is None:
+                cur = conn.execute(
+                    "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ? AND worker = ?",
+                    (state, now, job_id, worker),
+                )
+            else:
+                cur = conn.execute(
+                    "UPDATE jobs SET state = ?, result = ?, updated_at = ? WHERE id = ? AND worker = ?",
+                    (state, json.dumps(result), now, job_id, worker),
+                )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: int, worker: str) -> bool:
+        """Mark a job done and release its lease. False if ``worker`` no longer holds it."""
+        now = time.time()
+        with self._conn() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET state = ?, lease_until = NULL, error = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ?",
+                (DONE, now, job_id, worker),
+            )
+        if cur.rowcount != 1:
+            log.warning(f"Job {job_id} finished by {worker}, which no longer holds it — not marked done")
+        return cur.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str) -> Job | None:
+        """Record a failure: re-queue with backoff, or mark failed once out of attempts.
+
+        If ``worker`` no longer holds the job (its lease was recovered and the
+        job re-claimed), nothing changes and the job is returned as it stands.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if not row:
+                return None
+            if row["worker"] != worker:
+                log.warning(f"Job {job_id} failed under {worker}, which no longer holds it — ignored")
+            elif row["attempts"] < row["max_attempts"]:
+                delay = retry_delay(row["attempts"])
+                conn.execute(
+                    "UPDATE jobs SET state = ?, not_before = ?, worker = NULL, lease_until = NULL, "
+                    "error = ?, updated_at = ? WHERE id = ?",
+                    (QUEUED, now + delay, error[:2000], now, job_id),
+                )
+                log.warning(
+                    f"Job {job_id} failed (attempt {row['attempts']}/{row['max_attempts']}), "
+                    f"retrying in {delay:.0f}s: {error[:200]}"
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET state = ?, lease_until = NULL, error = ?, updated_at = ? WHERE id = ?",
+                    (FAILED, error[:2000], now, job_id),
+                )
+                log.error(f"Job {job_id} failed permanently: {error[:200]}")
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row)
+
+    def recover(self, worker_prefix: str | None = None, workers: list[str] | None = None) -> int:
+        """Re-queue in-flight jobs whose lease has expired.
+
+        With ``worker_prefix``, also re-queue every in-flight job held by a
+        matching worker regardless of lease — used at startup, when any job
+        still held under our own name belongs to a previous, dead process.
+        ``workers`` does the same for exact worker names known to be dead.
+        """
+        now = time.time()
+        placeholders = ",".join("?" * len(ACTIVE_STATES))
+        condition, params = "lease_until < ?", [now]
+        if worker_prefix:
+            condition += " OR worker LIKE ?"
+            params.append(f"{worker_prefix}%")
+        if workers:
+            condition += f" OR worker IN ({','.join('?' * len(workers))})"
+            params.extend(workers)
+        with self._conn() as conn:
+            cur = conn.execute(
+                f"UPDATE jobs SET state = ?, worker = NULL, lease_until = NULL, updated_at = ? "
+                f"WHERE state IN ({placeholders}) AND ({condition})",
+                (QUEUED, now, *ACTIVE_STATES, *params),
+            )
+        if cur.rowcount:
+            log.warning(f"Recovered {cur.rowcount} interrupted job(s)")
+        return cur.rowcount
+
+    def holders(self, worker_prefix: str) -> set[str]:
+        """Names of the workers holding in-flight jobs, among those starting with ``worker_prefix``."""
+        with self._conn() as conn:
+            rows = conn.execute(
+                f"SELECT DISTINCT worker FROM jobs WHERE state IN ({','.join('?' * len(ACTIVE_STATES))}) "
+                "AND worker LIKE ?",
+                (*ACTIVE_STATES, f"{worker_prefix}%"),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    # ── Worker liveness ──
+
+    def touch_worker(self, name: str):
+        """Record that a worker process is alive and taking jobs."""
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO workers (name, last_seen) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET last_seen = excluded.last_seen",
+                (name, time.time()),
+            )
+
+    def remove_worker(self, name: str):
+        """Forget a worker on clean shutdown."""
+        with self._conn() as conn:
+            conn.execute("DELETE FROM workers WHERE name = ?", (name,))
+
+    def live_workers(self, within: float | None = None) -> list[str]:
+        """Names of workers seen in the last ``within`` seconds (default ``JOB_WORKER_TIMEOUT``)."""
+        cutoff = time.time() - (within or config.JOB_WORKER_TIMEOUT)
+        with self._conn() as conn:
+            rows = conn.execute("SELECT name FROM workers WHERE last_seen >= ?", (cutoff,)).fetchall()
+        return [r["name"] for r in rows]
+
+    # ── Inspection ──
+
+    def get(self, job_id: int) -> Job | None:
+        with self._conn() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def open_jobs(self, source: str | None = None) -> list[Job]:
+        """Jobs not yet done or failed, oldest first, optionally for one source."""
+        placeholders = ",".join("?" * len(OPEN_STATES))
+        with self._conn() as conn:
+            if source:
+                rows = conn.execute(
+                    f"SELECT * FROM jobs WHERE state IN ({placeholders}) AND source = ? ORDER BY id",
+                    (*OPEN_STATES, source),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT * FROM jobs WHERE state IN ({placeholders}) ORDER BY id", OPEN_STATES,
+                ).fetchall()
+        return [Job.from_row(r) for r in rows]
+
+    def recent(self, limit: int = 20, state: str | None = None) -> list[Job]:
+        """Return the most recent jobs, newest first."""
+        with self._conn() as conn:
+            if state:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE state = ? ORDER BY id DESC LIMIT ?", (state, limit),
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [Job.from_row(r) for r in rows]
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of jobs in each state."""
+        with self._conn() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: n for state, n in rows}
+
+    def class_stats(self, window: float = 3600) -> dict[str, dict]:
+        """Per priority class: queue depth, running count, oldest queued wait,
+        and the average queue wait of jobs started in the last ``window`` seconds."""
+        now = time.time()
+        stats = {
+            name: {"queued": 0, "running": 0, "oldest_wait": 0.0, "avg_wait": None, "started": 0}
+            for name in PRIORITY_NAMES.values()
+        }
+        with self._conn() as conn:
+            for row in conn.execute(
+                "SELECT priority, state, COUNT(*) AS n, MIN(created_at) AS oldest FROM jobs "
+                f"WHERE state IN ({','.join('?' * len(OPEN_STATES))}) GROUP BY priority, state",
+                OPEN_STATES,
+            ):
+                entry = stats[PRIORITY_NAMES.get(row["priority"], "batch")]
+                if row["state"] == QUEUED:
+                    entry["queued"] += row["n"]
+                    entry["oldest_wait"] = max(entry["oldest_wait"], now - row["oldest"])
+                else:
+                    entry["running"] += row["n"]
+            for row in conn.execute(
+                "SELECT priority, COUNT(*) AS n, AVG(started_at - created_at) AS wait FROM jobs "
+                "WHERE started_at >= ? GROUP BY priority",
+                (now - window,),
+            ):
+                entry = stats[PRIORITY_NAMES.get(row["priority"], "batch")]
+                entry["started"] += row["n"]
+                entry["avg_wait"] = row["wait"]
+        return stats
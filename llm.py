@@ -0,0 +1,233 @@
+"""Shared LLM client layer for Co-Ord Executor.
+
+Owns one long-lived client per provider (the SDK clients are thread-safe
+and pool connections), applies a per-call deadline with jittered
+exponential backoff on retryable errors, and reports token usage to
+``budget.record_usage`` in one place.
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+import anthropic
+import openai
+
+import config
+
+log = logging.getLogger("megamind.llm")
+
+# HTTP statuses worth retrying (429 rate limit, 529 Anthropic overloaded, 5xx)
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+BACKOFF_BASE = 1.0   # seconds
+BACKOFF_CAP = 30.0   # seconds
+
+_lock = threading.Lock()
+_clients: dict[str, object] = {}
+
+# Per-upstream concurrency caps, shared by every thread in the process
+_limits = {
+    "anthropic": threading.BoundedSemaphore(max(config.LLM_ANTHROPIC_CONCURRENCY, 1)),
+    "grok": threading.BoundedSemaphore(max(config.LLM_GROK_CONCURRENCY, 1)),
+}
+
+
+@dataclass
+class LLMResponse:
+    """Text plus usage for a single completed LLM call."""
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: int = 0
+    attempts: int = 1
+    content: list = field(default_factory=list)  # raw content blocks (tool use etc.)
+
+
+# ---------------------------------------------------------------------------
+# Long-lived clients
+# ---------------------------------------------------------------------------
+
+def anthropic_client() -> anthropic.Anthropic:
+    """Return the shared Anthropic client, creating it on first use."""
+    with _lock:
+        client = _clients.get("anthropic")
+        if client is None:
+            client = anthropic.Anthropic(
+                api_key=config.ANTHROPIC_API_KEY,
+                timeout=config.LLM_TIMEOUT,
+                max_retries=0,  # retries are handled here, under one deadline
+            )
+            _clients["anthropic"] = client
+        return client
+
+
+def grok_client() -> openai.OpenAI:
+    """Return the shared Grok (xAI, OpenAI-compatible) client, creating it on first use."""
+    with _lock:
+        client = _clients.get("grok")
+        if client is None:
+            client = openai.OpenAI(
+                api_key=config.XAI_API_KEY,
+                base_url=config.GROK_API_BASE,
+                timeout=config.LLM_TIMEOUT,
+                max_retries=0,
+            )
+            _clients["grok"] = client
+        return client
+
+
+# ---------------------------------------------------------------------------
+# Retry policy
+# ---------------------------------------------------------------------------
+
+def _is_retryable(exc: Exception) -> bool:
+    """Connection errors, timeouts and retryable HTTP statuses."""
+    if isinstance(exc, (anthropic.APIConnectionError, openai.APIConnectionError)):
+        return True
+    return getattr(exc, "status_code", None) in RETRYABLE_STATUS
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Honour a ``retry-after`` header (seconds) if the server sent one."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+def _call_with_retry(call, what: str, deadline: float | None = None):
+    """Run ``call(timeout)`` until it succeeds, fails permanently or the deadline passes.
+
+    Each attempt gets ``min(LLM_TIMEOUT, time left)``. Backoff is full-jitter
+    exponential, capped at ``BACKOFF_CAP``. Returns ``(result, attempts)``.
+    """
+    deadline_at = time.monotonic() + (deadline or config.LLM_DEADLINE)
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = deadline_at - time.monotonic()
+        try:
+            return call(max(min(config.LLM_TIMEOUT, remaining), 1.0)), attempt
+        except Exception as exc:
+            if not _is_retryable(exc) or attempt > config.LLM_MAX_RETRIES:
+                raise
+            delay = _retry_after(exc)
+            if delay is None:
+                delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)))
+            if time.monotonic() + delay >= deadline_at:
+                raise
+            log.warning(
+                f"{what} failed ({exc.__class__.__name__}); "
+                f"retry {attempt}/{config.LLM_MAX_RETRIES} in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+
+def _record(model: str, api: str, title: str, resp: LLMResponse):
+    """Report usage to the budget tracker without ever breaking the caller."""
+    try:
+        from budget import record_usage
+        record_usage(
+            model=model,
+            input_tokens=resp.input_tokens,
+            output_tokens=resp.output_tokens,
+            api=api,
+            title=title,
+            latency_ms=resp.latency_ms,
+        )
+    except Exception:
+        pass  # Don't let budget tracking break extraction
+
+
+# ---------------------------------------------------------------------------
+# Calls
+# ---------------------------------------------------------------------------
+
+def claude_message(
+    system: str,
+    user: str,
+    *,
+    max_tokens: int = 4096,
+    title: str = "",
+    model: str | None = None,
+    deadline: float | None = None,
+    **kwargs,
+) -> LLMResponse:
+    """Send one user message to Claude and return the text reply.
+
+    Extra keyword arguments (e.g. ``tools``) are passed to ``messages.create``.
+    """
+    model = model or config.CLAUDE_MODEL
+    client = anthropic_client()
+    started = time.monotonic()
+
+    with _limits["anthropic"]:
+        response, attempts = _call_with_retry(
+            lambda timeout: client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                system=system,
+                messages=[{"role": "user", "content": user}],
+                timeout=timeout,
+                **kwargs,
+            ),
+            what=f"Claude ({model})",
+            deadline=deadline,
+        )
+
+    result = LLMResponse(
+        text="".join(block.text for block in response.content if block.type == "text"),
+        input_tokens=response.usage.input_tokens,
+        output_tokens=response.usage.output_tokens,
+        latency_ms=int((time.monotonic() - started) * 1000),
+        attempts=attempts,
+        content=list(response.content),
+    )
+    _record(model, "anthropic", title, result)
+    return result
+
+
+def grok_chat(
+    system: str,
+    user: str,
+    *,
+    title: str = "",
+    model: str | None = None,
+    deadline: float | None = None,
+) -> LLMResponse:
+    """Send one system + user exchange to Grok and return the text reply."""
+    model = model or config.GROK_MODEL
+    client = grok_client()
+    started = time.monotonic()
+
+    with _limits["grok"]:
+        response, attempts = _call_with_retry(
+            lambda timeout: client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user},
+                ],
+                timeout=timeout,
+            ),
+            what=f"Grok ({model})",
+            deadline=deadline,
+        )
+
+    usage = response.usage
+    result = LLMResponse(
+        text=response.choices[0].message.content or "",
+        input_tokens=(usage.prompt_tokens or 0) if usage else 0,
+        output_tokens=(usage.completion_tokens or 0) if usage else 0,
+        latency_ms=int((time.monotonic() - started) * 1000),
+        attempts=attempts,
+    )
+    if usage:
+        _record(model, "grok", title, result)
+    return result
@@ -0,0 +1,285 @@
+"""Per-extraction metadata sidecars and a compact catalog snapshot.
+
+Every extraction gets ``<name>.meta.json`` next to its markdown. It holds
+the full metadata that INDEX.md can't: URL, canonical key, every tag,
+category, links, timings, token usage and content hashes. Sidecars are
+committed with the extraction.
+
+``load_catalog`` reads all of them through ``.catalog.pickle``, a local
+binary snapshot that is brought up to date incrementally. Only sidecars that
+changed since the last snapshot are re-read, and nothing is touched if the
+extractions folder hasn't changed. Markdown files from before sidecars
+existed are backfilled from their header and INDEX.md row the first time
+they're seen.
+"""
+
+import json
+import logging
+import pickle
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import config
+from outputs.storage import document_hash, raw_hash
+
+log = logging.getLogger("megamind.catalog")
+
+CATALOG_FILE = config.PROJECT_ROOT / ".catalog.pickle"
+SIDECAR_SUFFIX = ".meta.json"
+SNAPSHOT_VERSION = 1
+
+_HEADER_RE = {
+    "title": re.compile(r"^# (.+)$", re.MULTILINE),
+    "url": re.compile(r"^> \*\*URL:\*\* (\S+)", re.MULTILINE),
+    "source_type": re.compile(r"\*\*Source:\*\* ([^|\n]+?) \|"),
+    "extracted": re.compile(r"\*\*Extracted:\*\* ([^|\n]+?) \|"),
+    "extraction_method": re.compile(r"\*\*Method:\*\* (\S+)"),
+}
+
+_lock = threading.Lock()
+_catalog: dict | None = None  # {"version", "dir_mtime", "files": {md filename: [sidecar mtime, meta]}}
+_facets: tuple | None = None  # ((dir_mtime, taxonomy generation), facet_index())
+
+
+def sidecar_path(filename: str) -> Path:
+    return config.EXTRACTIONS_PATH / (Path(filename).stem + SIDECAR_SUFFIX)
+
+
+def write_sidecar(filename: str, meta: dict):
+    path = sidecar_path(filename)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _create_sidecar(filename: str, meta: dict) -> bool:
+    """Write a sidecar only if none exists yet. False if one was already there.
+
+    Used for backfills, so a sidecar written meanwhile by a pipeline always wins.
+    """
+    try:
+        with open(sidecar_path(filename), "x", encoding="utf-8") as f:
+            f.write(json.dumps(meta, indent=2, ensure_ascii=False))
+    except FileExistsError:
+        return False
+    return True
+
+
+def read_sidecar(filename: str) -> dict | None:
+    path = sidecar_path(filename)
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, IOError):
+        log.warning(f"Corrupt sidecar {path.name}")
+        return None
+
+
+def update_sidecar(filename: str, **changes) -> bool:
+    """Merge ``changes`` into an extraction's sidecar. False if it has none."""
+    meta = read_sidecar(filename)
+    if meta is None:
+        return False
+    meta.update(changes)
+    write_sidecar(filename, meta)
+    return True
+
+
+def extraction_metadata(
+    result,
+    doc,
+    filename: str,
+    document: str,
+    date_str: str,
+    num: int | None = None,
+    timings: dict | None = None,
+) -> dict:
+    """Sidecar contents for a freshly processed extraction."""
+    usage = result.metadata.get("usage", {})
+    return {
+        "filename": filename,
+        "num": num,
+        "title": result.title,
+        "url": result.url,
+        "canonical_key": result.metadata.get("canonical_key"),
+        "source_type": result.source_type,
+        "category": doc.category,
+        "tags": doc.tags,
+        "links": doc.links,
+        "status": "Backlog",
+        "date": date_str,
+        "extracted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "extraction_method": result.metadata.get("extraction_method", "scrape"),
+        "timings": timings or {},
+        "tokens": {"input": usage.get("input_tokens", 0), "output": usage.get("output_tokens", 0)},
+        "model": usage.get("model"),
+        "content_hash": document_hash(document),
+        "raw_hash": raw_hash(result.raw_content),
+        "near_duplicate": result.metadata.get("near_duplicate"),
+    }
+
+
+def _legacy_metadata(path: Path, row: dict | None) -> dict:
+    """Reconstruct a sidecar for an extraction written before sidecars existed."""
+    from outputs.document import parse_document
+    from outputs.index import _key_for
+
+    text = path.read_text(encoding="utf-8", errors="replace")
+    head = text[:4096]
+    found = {name: (m.group(1).strip() if (m := rx.search(head)) else None) for name, rx in _HEADER_RE.items()}
+    doc = parse_document(text)
+    url = found["url"] if found["url"] not in (None, "N/A") else None
+    row = row or {}
+    return {
+        "filename": path.name,
+        "num": int(row["num"]) if str(row.get("num", "")).isdigit() else None,
+        "title": found["title"] or row.get("title") or path.stem,
+        "url": url,
+        "canonical_key": _key_for(url) if url else None,
+        "source_type": found["source_type"] or row.get("source"),
+        "category": doc.category,
+        "tags": doc.tags,
+        "links": doc.links,
+        "status": row.get("status", "Backlog"),
+        "date": row.get("date") or path.name[:10],
+        "extracted_at": found["extracted"],
+        "extraction_method": found["extraction_method"],
+        "timings": {},
+        "tokens": {},
+        "model": None,
+        "content_hash": document_hash(text),
+        "raw_hash": None,  # the raw content of old extractions wasn't kept
+        "backfilled": True,
+    }
+
+
+def _load_snapshot() -> dict:
+    if CATALOG_FILE.exists():
+        try:
+            data = pickle.loads(CATALOG_FILE.read_bytes())
+            if data.get("version") == SNAPSHOT_VERSION:
+                return data
+        except Exception:
+            log.warning("Unreadable catalog snapshot — rebuilding")
+    return {"version": SNAPSHOT_VERSION, "dir_mtime": 0, "files": {}}
+
+
+def _save_snapshot(data: dict):
+    tmp = CATALOG_FILE.with_suffix(".tmp")
+    tmp.write_bytes(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    tmp.replace(CATALOG_FILE)
+
+
+def _refresh() -> dict:
+    """Bring the snapshot up to date with the extractions folder."""
+    global _catalog
+    if _catalog is None:
+        _catalog = _load_snapshot()
+
+    folder = config.EXTRACTIONS_PATH
+    if not folder.exists():
+        return _catalog
+    dir_mtime = folder.stat().st_mtime
+    if dir_mtime == _catalog["dir_mtime"]:
+        return _catalog
+
+    files = _catalog["files"]
+    rows = None
+    seen = set()
+    for path in folder.glob("*.md"):
+        if path.name == config.INDEX_FILE.name:
+            continue
+        seen.add(path.name)
+        side = sidecar_path(path.name)
+        if not side.exists():
+            if rows is None:
+                from outputs.index import parse_index_entries
+                rows = {r["filename"]: r for r in parse_index_entries()}
+            _create_sidecar(path.name, _legacy_metadata(path, rows.get(path.name)))
+        mtime = side.stat().st_mtime
+        if path.name in files and files[path.name][0] == mtime:
+            continue
+        meta = read_sidecar(path.name)
+        if meta is not None:
+            files[path.name] = [mtime, meta]
+    for name in set(files) - seen:
+        del files[name]
+
+    _catalog["dir_mtime"] = dir_mtime
+    _save_snapshot(_catalog)
+    return _catalog
+
+
+def _index_order(meta: dict):
+    return meta.get("num") is None, meta.get("num") or 0, meta["filename"]
+
+
+def load_catalog() -> list[dict]:
+    """Metadata for every extraction, in index order."""
+    with _lock:
+        entries = [meta for _, meta in _refresh()["files"].values()]
+    return sorted(entries, key=_index_order)
+
+
+def find_by_raw_hash(digest: str) -> dict | None:
+    """The catalog entry extracted from raw content with hash ``digest``, if any."""
+    with _lock:
+        for _, meta in _refresh()["files"].values():
+            if meta.get("raw_hash") == digest:
+                return meta
+    return None
+
+
+def catalog_stamp() -> tuple[float, int]:
+    """Changes whenever the catalog or the taxonomy alias table does; keys caches of derived views."""
+    from outputs.taxonomy import taxonomy
+
+    with _lock:
+        dir_mtime = _refresh()["dir_mtime"]
+    return dir_mtime, taxonomy().generation
+
+
+def facet_index() -> dict[tuple[str, str], list[dict]]:
+    """Entries grouped by canonical tag and category: ``("tags", "llm")`` → entries, in index order.
+
+    Rebuilt only when the catalog or the taxonomy alias table has changed.
+    """
+    from outputs.taxonomy import canonical_category, canonical_tags
+
+    global _facets
+    stamp = catalog_stamp()
+    if _facets is not None and _facets[0] == stamp:
+        return _facets[1]
+    facets: dict[tuple[str, str], list[dict]] = {}
+    for meta in load_catalog():
+        if meta.get("category"):
+            facets.setdefault(("categories", canonical_category(meta["category"])), []).append(meta)
+        for tag in canonical_tags(meta.get("tags") or []):
+            facets.setdefault(("tags", tag), []).append(meta)
+    _facets = (stamp, facets)
+    return facets
+
+
+def search(query: str) -> list[dict]:
+    """Entries tagged or categorised as ``query``, in any spelling; else those whose title,
+    category, tags or URL contain it (case-insensitive).
+    """
+    from outputs.taxonomy import lookup
+
+    q = query.strip().lower().lstrip("#")
+    matches = lookup(q) if q else []
+    if matches:
+        facets = facet_index()
+        exact = {m["filename"]: m for match in matches for m in facets.get(match, [])}
+        if exact:
+            return sorted(exact.values(), key=_index_order)
+    return [
+        m for m in load_catalog()
+        if q in (m.get("title") or "").lower()
+        or q in (m.get("category") or "").lower()
+        or q in (m.get("url") or "").lower()
+        or any(q in t.lower() for t in m.get("tags", []))
+    ]
@@ -0,0 +1,209 @@
+"""Parse-once structured view of Claude's processed output.
+
+``parse_document`` walks the markdown a single time and returns a
+``ProcessedDocument`` with the sections, prompts, tags, category and links
+already split out. The pipeline parses once and hands the same object to the
+index, the Discord poster and the Telegram reply, so none of them re-scan
+the text. ``to_dict``/``from_result`` carry it through the job queue's JSON
+result column.
+
+In structured-output mode Claude returns the fields as JSON, and
+``document_from_fields`` builds the document from them without any parsing.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+_SECTION_RE = re.compile(r"^###\s+(.+)$")
+_PROMPT_RE = re.compile(r"^####\s+Prompt\s+\d+:\s*(.+)$")
+_TAG_RE = re.compile(r"`#([^`]+)`")
+_MD_LINK_RE = re.compile(r"\[[^\]]*\]\((https?://[^)\s]+)\)")
+_URL_RE = re.compile(r"https?://[^\s<>\"')}\]]+")
+
+PROMPTS_SECTION = "Implementation Prompts"
+LINKS_SECTION = "Links & Resources"
+CATEGORY_SECTION = "Category"
+
+
+@dataclass(slots=True)
+class Prompt:
+    title: str
+    body: str
+
+
+@dataclass(slots=True)
+class ProcessedDocument:
+    """Claude's output split into its parts. ``raw`` is the original markdown."""
+    raw: str
+    sections: dict[str, str] = field(default_factory=dict)
+    prompts: list[Prompt] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    category: str = "Other"
+    links: list[str] = field(default_factory=list)
+
+    def section(self, name: str) -> str:
+        return self.sections.get(name, "")
+
+    @property
+    def summary(self) -> str:
+        return self.sections.get("Summary", "")
+
+    def to_dict(self) -> dict:
+        """JSON-safe form, without ``raw`` (callers store that already)."""
+        return {
+            "sections": self.sections,
+            "prompts": [{"title": p.title, "body": p.body} for p in self.prompts],
+            "tags": self.tags,
+            "category": self.category,
+            "links": self.links,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, raw: str = "") -> "ProcessedDocument":
+        return cls(
+            raw=raw,
+            sections=dict(data.get("sections", {})),
+            prompts=[Prompt(p["title"], p["body"]) for p in data.get("prompts", [])],
+            tags=list(data.get("tags", [])),
+            category=data.get("category", "Other"),
+            links=list(data.get("links", [])),
+        )
+
+    @classmethod
+    def from_result(cls, result: dict) -> "ProcessedDocument":
+        """The document for a pipeline/job result: reuse ``doc`` if present, else parse ``processed``."""
+        doc = result.get("doc")
+        if isinstance(doc, cls):
+            return doc
+        if isinstance(doc, dict):
+            return cls.from_dict(doc, result.get("processed", ""))
+        return parse_document(result.get("processed", ""))
+
+
+def _prompt_body(lines: list[str]) -> str:
+    return "\n".join(lines).strip().strip(">").strip()
+
+
+def parse_document(text: str) -> ProcessedDocument:
+    """Split processed markdown into a ``ProcessedDocument`` in one pass over its lines."""
+    sections: dict[str, str] = {}
+    prompts: list[Prompt] = []
+    tags: list[str] = []
+    category = None
+
+    heading = None
+    lines: list[str] = []
+    prompt_title = None
+    prompt_lines: list[str] = []
+
+    def close_section():
+        nonlocal prompt_title, prompt_lines
+        if heading is not None:
+            sections[heading] = "\n".join(lines).strip()
+        if prompt_title is not None:
+            prompts.append(Prompt(prompt_title, _prompt_body(prompt_lines)))
+            prompt_title, prompt_lines = None, []
+
+    for line in text.split("\n"):
+        if "`#" in line:
+            tags.extend(_TAG_RE.findall(line))
+        if line.startswith("###"):
+            match = _SECTION_RE.match(line)
+            if match:
+                close_section()
+                heading, lines = match.group(1).strip(), []
+                continue
+            if heading == PROMPTS_SECTION:
+                match = _PROMPT_RE.match(line)
+                if match:
+                    if prompt_title is not None:
+                        prompts.append(Prompt(prompt_title, _prompt_body(prompt_lines)))
+                    prompt_title, prompt_lines = match.group(1).strip(), []
+                    lines.append(line)
+                    continue
+        if heading is None:
+            continue
+        lines.append(line)
+        if prompt_title is not None:
+            prompt_lines.append(line)
+        elif category is None and heading == CATEGORY_SECTION and line.strip():
+            category = line.strip().strip("`").strip()
+    close_section()
+
+    # Fallback: no "#### Prompt N:" headings — split the section on blockquotes
+    prompts_text = sections.get(PROMPTS_SECTION, "")
+    if not prompts and prompts_text:
+        for i, block in enumerate(re.split(r"\n(?=>)", prompts_text), 1):
+            body = block.strip().strip(">").strip()
+            if body:
+                prompts.append(Prompt(f"Prompt {i}", body))
+
+    links_text = sections.get(LINKS_SECTION, "")
+    links = list(dict.fromkeys(_MD_LINK_RE.findall(links_text) + _URL_RE.findall(_MD_LINK_RE.sub("", links_text))))
+
+    return ProcessedDocument(
+        raw=text,
+        sections=sections,
+        prompts=prompts,
+        tags=tags,
+        category=category or "Other",
+        links=links,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Structured output
+# ---------------------------------------------------------------------------
+
+def _str_list(value) -> list[str]:
+    if isinstance(value, str):
+        value = [value]
+    return [str(v).strip() for v in value or [] if str(v).strip()]
+
+
+def document_from_fields(data: dict) -> ProcessedDocument:
+    """Build a document from structured (tool-use) output.
+
+    Fields become the document directly; no parsing. The markdown in ``raw``
+    and ``sections`` is rendered from them in the same layout the markdown
+    prompt asks for, so saved files and INDEX.md look the same either way.
+    """
+    prompts = [
+        Prompt(str(p.get("title") or f"Prompt {i}").strip(), str(p.get("body") or "").strip())
+        for i, p in enumerate(data.get("prompts") or [], 1)
+        if isinstance(p, dict) and str(p.get("body") or "").strip()
+    ]
+    links = []
+    link_lines = []
+    for link in data.get("links") or []:
+        url = (str(link.get("url") or "") if isinstance(link, dict) else str(link)).strip()
+        if not url:
+            continue
+        title = (str(link.get("title") or "") if isinstance(link, dict) else "").strip() or url
+        links.append(url)
+        link_lines.append(f"- [{title}]({url})")
+    tags = [t.lstrip("#").strip().lower().replace(" ", "-") for t in _str_list(data.get("tags"))]
+    category = str(data.get("category") or "").strip().strip("`") or "Other"
+
+    sections = {
+        "Summary": str(data.get("summary") or "").strip(),
+        "Key Insights": "\n".join(f"- {i}" for i in _str_list(data.get("key_insights"))),
+        "Actions": "\n".join(f"- [ ] {a}" for a in _str_list(data.get("actions"))),
+        PROMPTS_SECTION: "\n\n".join(
+            f"#### Prompt {n}: {p.title}\n" + "\n".join(f"> {line}" for line in p.body.split("\n"))
+            for n, p in enumerate(prompts, 1)
+        ),
+        LINKS_SECTION: "\n".join(link_lines),
+        "Tags": " ".join(f"`#{t}`" for t in tags),
+        CATEGORY_SECTION: category,
+    }
+    raw = "\n\n".join(f"### {name}\n{text}" for name, text in sections.items())
+
+    return ProcessedDocument(
+        raw=raw,
+        sections=sections,
+        prompts=prompts,
+        tags=tags,
+        category=category,
+        links=list(dict.fromkeys(links)),
+    )
@@ -1,11 +1,35 @@
-"""Centralised index manager — maintains INDEX.md with all extractions."""
+"""Centralised index manager — maintains INDEX.md with all extractions.
 
+Also keeps a canonical-key → file lookup (``.url_index.json``) so "has this
+URL been extracted?" is a dict lookup rather than a scan of the catalog.
+"""
+
+import json
+import logging
 import re
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 import config
 from extractors.base import ExtractionResult
-from outputs.formatter import extract_tags_from_content, extract_category_from_content
+from outputs.document import ProcessedDocument, parse_document
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+log = logging.getLogger("megamind.index")
+
+URL_INDEX_FILE = config.PROJECT_ROOT / ".url_index.json"
+INDEX_LOCK_FILE = config.PROJECT_ROOT / ".index.lock"
+
+_URL_LINE_RE = re.compile(r"^> \*\*URL:\*\* (\S+)", re.MULTILINE)
+
+_index_lock = threading.Lock()  # INDEX.md read-modify-write from concurrent pipelines (see _locked_index)
+_url_lock = threading.Lock()
+_url_index: dict | None = None
 
 
 INDEX_HEADER = """\
@@ -18,6 +42,27 @@ INDEX_HEADER = """\
 """
 
 
+@contextmanager
+def _locked_index():
+    """Exclusive INDEX.md access across threads and (where supported) processes,
+    so the bot, ``--worker`` and ``--reprocess`` can update it side by side.
+    """
+    with _index_lock, open(INDEX_LOCK_FILE, "a") as fh:
+        if fcntl:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _write_index(content: str):
+    tmp = config.INDEX_FILE.with_suffix(".tmp")
+    tmp.write_text(content, encoding="utf-8")
+    tmp.replace(config.INDEX_FILE)
+
+
 def _read_index() -> str:
     """Read the current index file, or return the header if it doesn't exist."""
     if config.INDEX_FILE.exists():
@@ -37,37 +82,43 @@ def _count_entries(index_content: str) -> int:
 
 def add_to_index(
     result: ExtractionResult,
-    processed_content: str,
+    processed: ProcessedDocument | str,
     filename: str,
     date_str: str,
     status: str = "Backlog",
-) -> None:
-    """Add a new entry to the centralised index."""
+) -> int:
+    """Add a new entry to the centralised index. Returns its entry number."""
     config.EXTRACTIONS_PATH.mkdir(parents=True, exist_ok=True)
 
-    index_content = _read_index()
-    entry_num = _count_entries(index_content) + 1
-
-    tags = extract_tags_from_content(processed_content)
-    category = extract_category_from_content(processed_content)
+    doc = parse_document(processed) if isinstance(processed, str) else processed
+    tags, category = doc.tags, doc.category
 
     tags_str = " ".join(f"`#{t}`" for t in tags[:4])
     # Truncate title for table readability
     title_display = result.title[:50] + "..." if len(result.title) > 50 else result.title
     file_link = f"[view](./{filename})"
 
-    new_row = (
-        f"| {entry_num} | {title_display} | {result.source_type} "
-        f"| {category} | {tags_str} | {status} | {date_str} | {file_link} |\n"
-    )
+    with _locked_index():
+        index_content = _read_index()
+        entry_num = _count_entries(index_content) + 1
 
-    # Append the new row
-    if index_content.rstrip().endswith("|"):
-        index_content = index_content.rstrip() + "\n" + new_row
-    else:
-        index_content = index_content + new_row
+        new_row = (
+            f"| {entry_num} | {title_display} | {result.source_type} "
+            f"| {category} | {tags_str} | {status} | {date_str} | {file_link} |\n"
+        )
 
-    config.INDEX_FILE.write_text(index_content, encoding="utf-8")
+        # Append the new row
+        if index_content.rstrip().endswith("|"):
+            index_content = index_content.rstrip() + "\n" + new_row
+        else:
+            index_content = index_content + new_row
+
+        _write_index(index_content)
+
+    key = result.metadata.get("canonical_key")
+    if key or result.url not in ("", "N/A"):
+        record_url(key or _key_for(result.url), filename)
+    return entry_num
 
 
 def update_status(entry_num: int, new_status: str) -> bool:
@@ -75,30 +126,92 @@ def update_status(entry_num: int, new_status: str) -> bool:
 
     Returns True if the entry was found and updated.
     """
-    if not config.INDEX_FILE.exists():
-        return False
+    filename = None
+    with _locked_index():
+        if not config.INDEX_FILE.exists():
+            return False
+        lines = config.INDEX_FILE.read_text(encoding="utf-8").split("\n")
+        updated = False
 
-    content = config.INDEX_FILE.read_text(encoding="utf-8")
-    lines = content.split("\n")
-    updated = False
+        for i, line in enumerate(lines):
+            if line.startswith("|") and not line.startswith("| #") and not line.startswith("|---"):
+                cells = [c.strip() for c in line.split("|")]
+                # cells[0] is empty (before first |), cells[1] is the number
+                if cells[1] == str(entry_num):
+                    # Status is in the 6th column (index 5)
+                    cells[5] = f" {new_status} "
+                    lines[i] = "|".join(cells)
+                    updated = True
+                    break
 
-    for i, line in enumerate(lines):
-        if line.startswith("|") and not line.startswith("| #") and not line.startswith("|---"):
-            cells = [c.strip() for c in line.split("|")]
-            # cells[0] is empty (before first |), cells[1] is the number
-            if cells[1] == str(entry_num):
-                # Status is in the 6th column (index 5)
-                cells[5] = f" {new_status} "
-                lines[i] = "|".join(cells)
-                updated = True
-                break
+        if updated:
+            _write_index("\n".join(lines))
+            file_match = re.search(r"\[view\]\(\./(.+?)\)", cells[8]) if len(cells) > 8 else None
+            filename = file_match.group(1) if file_match else None
 
-    if updated:
-        config.INDEX_FILE.write_text("\n".join(lines), encoding="utf-8")
+    # The sidecar has its own lock; no need to hold INDEX.md's while writing it
+    if filename:
+        from outputs.catalog import update_sidecar
+        update_sidecar(filename, status=new_status)
 
     return updated
 
 
+def update_entry(entry_num: int, result: ExtractionResult, processed: ProcessedDocument | str) -> bool:
+    """Rewrite an entry's title, source, category and tags in place (status, date and file kept).
+
+    Returns True if the entry was found and updated.
+    """
+    doc = parse_document(processed) if isinstance(processed, str) else processed
+    tags_str = " ".join(f"`#{t}`" for t in doc.tags[:4])
+    title_display = result.title[:50] + "..." if len(result.title) > 50 else result.title
+
+    with _locked_index():
+        if not config.INDEX_FILE.exists():
+            return False
+        lines = config.INDEX_FILE.read_text(encoding="utf-8").split("\n")
+        for i, line in enumerate(lines):
+            if not line.startswith("|") or line.startswith("| #") or line.startswith("|---"):
+                continue
+            cells = [c.strip() for c in line.split("|")]
+            if len(cells) > 8 and cells[1] == str(entry_num):
+                lines[i] = (
+                    f"| {entry_num} | {title_display} | {result.source_type} "
+                    f"| {doc.category} | {tags_str} | {cells[6]} | {cells[7]} | {cells[8]} |"
+                )
+                _write_index("\n".join(lines))
+                return True
+    return False
+
+
+def parse_index_entries() -> list[dict]:
+    """Parse INDEX.md's table into entry dicts (num, title, source, category, tags, status, date, filename).
+
+    Titles are truncated and tags capped in the table; the catalog
+    (``outputs.catalog``) has the full metadata.
+    """
+    entries = []
+    for line in _read_index().split("\n"):
+        if not line.startswith("|") or line.startswith("| #") or line.startswith("|---"):
+            continue
+        cells = [c.strip() for c in line.split("|")]
+        if len(cells) < 9:
+            continue
+        # cells: ['', '#', 'Title', 'Source', 'Category', 'Tags', 'Status', 'Date', 'File', '']
+        file_match = re.search(r"\[view\]\(\./(.+?)\)", cells[8])
+        entries.append({
+            "num": cells[1],
+            "title": cells[2],
+            "source": cells[3],
+            "category": cells[4],
+            "tags": re.findall(r"`#([^`]+)`", cells[5]),
+            "status": cells[6],
+            "date": cells[7],
+            "filename": file_match.group(1) if file_match else "",
+        })
+    return entries
+
+
 def list_entries(status_filter: str | None = None) -> str:
     """Return a formatted view of index entries, optionally filtered by status."""
     if not config.INDEX_FILE.exists():
@@ -120,3 +233,84 @@ def list_entries(status_filter: str | None = None) -> str:
             filtered.append(line)
 
     return "\n".join(filtered)
+
+
+# ---------------------------------------------------------------------------
+# URL lookup index
+# ---------------------------------------------------------------------------
+
+def _key_for(url: str) -> str:
+    from extractors.detector import canonical_key
+    return canonical_key(url, resolve=False)
+
+
+def _save_url_index(index: dict):
+    tmp = URL_INDEX_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(index), encoding="utf-8")
+    tmp.replace(URL_INDEX_FILE)
+
+
+def _load_url_index() -> dict:
+    """Return the URL index, catching up with any extraction files it hasn't seen.
+
+    Files are only re-read when the extractions folder changed since the
+    last check, and then only files that are new or modified.
+    """
+    global _url_index
+    if _url_index is None:
+        _url_index = {"dir_mtime": 0, "files": {}, "keys": {}}
+        if URL_INDEX_FILE.exists():
+            try:
+                _url_index = json.loads(URL_INDEX_FILE.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, IOError):
+                log.warning("Corrupt URL index — rebuilding")
+
+    folder = config.EXTRACTIONS_PATH
+    if not folder.exists():
+        return _url_index
+    dir_mtime = folder.stat().st_mtime
+    if dir_mtime == _url_index["dir_mtime"]:
+        return _url_index
+
+    files, keys = _url_index["files"], _url_index["keys"]
+    seen = set()
+    for path in folder.glob("*.md"):
+        if path.name == config.INDEX_FILE.name:
+            continue
+        seen.add(path.name)
+        mtime = path.stat().st_mtime
+        if path.name in files and files[path.name][0] == mtime:
+            continue
+        with path.open(encoding="utf-8", errors="replace") as fh:
+            match = _URL_LINE_RE.search(fh.read(4096))
+        key = _key_for(match.group(1)) if match and match.group(1) != "N/A" else None
+        files[path.name] = [mtime, key]
+        if key:
+            keys[key] = path.name
+    for name in set(files) - seen:
+        _, key = files.pop(name)
+        if key and keys.get(key) == name:
+            del keys[key]
+    _url_index["dir_mtime"] = dir_mtime
+    _save_url_index(_url_index)
+    return _url_index
+
+
+def record_url(key: str, filename: str):
+    """Record that ``key`` was extracted to ``filename``."""
+    with _url_lock:
+        index = _load_url_index()
+        index["keys"][key] = filename
+        _save_url_index(index)
+
+
+def lookup_url(key: str) -> str | None:
+    """Return the extraction filename for a canonical key, if already extracted."""
+    with _url_lock:
+        return _load_url_index()["keys"].get(key)
+
+
+def indexed_keys(prefix: str = "") -> set[str]:
+    """Return every extracted canonical key starting with ``prefix`` (e.g. ``youtube:``)."""
+    with _url_lock:
+        return {k for k in _load_url_index()["keys"] if k.startswith(prefix)}
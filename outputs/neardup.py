@@ -0,0 +1,229 @@
+"""Near-duplicate detection over raw content (MinHash + LSH banding).
+
+The same talk often arrives as a YouTube link, a blog post about it and a
+thread summarising it. Before paying for a Claude call, ``run_pipeline``
+asks this index for extractions whose raw content is similar to the new one:
+
+* at or above ``NEARDUP_LINK_THRESHOLD``, the URL is linked to the existing
+  extraction and nothing new is processed;
+* at or above ``NEARDUP_DELTA_THRESHOLD``, Claude is asked only for what
+  the new source adds (see ``processors.ai_processor``).
+
+Each document's content is reduced to word shingles and then to a
+``NUM_PERM``-value MinHash signature. The fraction of equal values between
+two signatures estimates the Jaccard similarity of their shingle sets.
+Signatures use one-permutation hashing: each shingle hash falls into one of
+``NUM_PERM`` bins and the bin keeps its minimum, with empty bins filled from
+their neighbour. That is one pass over the shingles instead of ``NUM_PERM``,
+about 15 ms for a long transcript.
+
+Signatures are split into ``BANDS`` bands, and only documents that share a
+band bucket are compared, so a query touches a handful of candidates rather
+than the whole collection.
+
+Signatures are appended to ``.neardup_index.jsonl``, one line per extraction.
+Adding is an append and other processes' appends are picked up by reading
+the file's tail. If the file is missing, it is rebuilt from the raw store.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import re
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import config
+
+log = logging.getLogger("megamind.neardup")
+
+NUM_PERM = 128
+BANDS = 32  # 4 rows per band: pairs above ~0.45 Jaccard usually become candidates
+ROWS = NUM_PERM // BANDS
+
+_BIN_SHIFT = 64 - (NUM_PERM.bit_length() - 1)  # top bits of a shingle hash pick its bin
+_MASK = 0xFFFFFFFF
+_ROTATION = 0x9E3779B1  # offset per bin moved when densifying, so borrowed values differ by distance
+_SIG_STRUCT = struct.Struct(f"<{NUM_PERM}I")
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass(slots=True)
+class Match:
+    key: str
+    filename: str
+    similarity: float
+
+
+def shingles(text: str, k: int | None = None) -> set[int]:
+    """64-bit hashes of the ``k``-word shingles of ``text`` (lowercased, punctuation dropped)."""
+    k = k or config.NEARDUP_SHINGLE_WORDS
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < config.NEARDUP_MIN_WORDS:
+        return set()
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + k]).encode(), digest_size=8).digest(), "little")
+        for i in range(len(words) - k + 1)
+    }
+
+
+def signature(text: str) -> list[int] | None:
+    """MinHash signature of ``text``, or None if it is too short to compare meaningfully."""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    bins: list[int | None] = [None] * NUM_PERM
+    for h in hashes:
+        b, v = h >> _BIN_SHIFT, h & _MASK
+        if bins[b] is None or v < bins[b]:
+            bins[b] = v
+    # Densify: an empty bin takes the next non-empty bin's value (circularly), offset by distance
+    sig = []
+    for i, v in enumerate(bins):
+        distance = 0
+        while v is None:
+            distance += 1
+            v = bins[(i + distance) % NUM_PERM]
+        sig.append((v + distance * _ROTATION) & _MASK)
+    return sig
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def _encode(sig: list[int]) -> str:
+    return base64.b64encode(_SIG_STRUCT.pack(*sig)).decode("ascii")
+
+
+def _decode(data: str) -> list[int]:
+    return list(_SIG_STRUCT.unpack(base64.b64decode(data)))
+
+
+class NearDupIndex:
+    """Signatures for every extraction plus in-memory LSH buckets."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path or config.NEARDUP_INDEX_PATH)
+        self._lock = threading.Lock()
+        self._sigs: dict[str, tuple[str, list[int]]] = {}
+        self._buckets: list[dict[tuple, set[str]]] = [{} for _ in range(BANDS)]
+        self._offset = 0
+        self._loaded = False
+
+    def _bands(self, sig: list[int]):
+        for band in range(BANDS):
+            yield band, tuple(sig[band * ROWS:(band + 1) * ROWS])
+
+    def _insert(self, key: str, filename: str, sig: list[int]):
+        old = self._sigs.get(key)
+        if old:
+            for band, bucket in self._bands(old[1]):
+                self._buckets[band].get(bucket, set()).discard(key)
+        self._sigs[key] = (filename, sig)
+        for band, bucket in self._bands(sig):
+            self._buckets[band].setdefault(bucket, set()).add(key)
+
+    def _sync(self):
+        """Load the index on first use and pick up lines appended since (by any process)."""
+        if not self._loaded:
+            self._loaded = True
+            if not self.path.exists():
+                self._backfill()
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size <= self._offset:
+            return
+        with open(self.path, "rb") as fh:
+            fh.seek(self._offset)
+            data = fh.read()
+        end = data.rfind(b"\n") + 1  # ignore a half-written last line until it's complete
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+                self._insert(entry["key"], entry["filename"], _decode(entry["sig"]))
+            except (ValueError, KeyError, struct.error):
+                log.warning("Skipping unreadable near-duplicate index line")
+        self._offset += end
+
+    def _append(self, key: str, filename: str, sig: list[int]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"key": key, "filename": filename, "sig": _encode(sig)}) + "\n"
+        with open(self.path, "ab") as fh:
+            fh.write(line.encode("utf-8"))
+
+    def _backfill(self):
+        """Build the index from the raw store for extractions that are already indexed."""
+        from outputs.index import lookup_url
+        from outputs.rawstore import raw_store
+
+        count = 0
+        for record in raw_store().iter_records():
+            filename = lookup_url(record["key"])
+            sig = signature(record["raw_content"]) if filename else None
+            if sig:
+                self._append(record["key"], filename, sig)
+                count += 1
+        self.path.touch()
+        if count:
+            log.info(f"Near-duplicate index backfilled with {count} extraction(s)")
+
+    def add(self, key: str, filename: str, sig: list[int] | None):
+        """Record an extraction's signature (no-op for content too short to sign)."""
+        if not sig:
+            return
+        with self._lock:
+            self._sync()
+            self._append(key, filename, sig)
+            self._sync()
+
+    def query(self, sig: list[int], exclude: str | None = None, limit: int = 5) -> list[Match]:
+        """Extractions sharing an LSH bucket with ``sig``, most similar first."""
+        with self._lock:
+            self._sync()
+            candidates = set()
+            for band, bucket in self._bands(sig):
+                candidates |= self._buckets[band].get(bucket, set())
+            candidates.discard(exclude)
+            matches = [
+                Match(key, self._sigs[key][0], similarity(sig, self._sigs[key][1]))
+                for key in candidates
+            ]
+        matches.sort(key=lambda m: m.similarity, reverse=True)
+        return matches[:limit]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._sigs)
+
+
+_index: NearDupIndex | None = None
+
+
+def neardup_index() -> NearDupIndex:
+    """The shared index at ``NEARDUP_INDEX_PATH``."""
+    global _index
+    if _index is None:
+        _index = NearDupIndex()
+    return _index
+
+
+def find_near_duplicate(key: str, sig: list[int] | None) -> Match | None:
+    """The closest existing extraction at or above ``NEARDUP_DELTA_THRESHOLD``, if any."""
+    if not config.NEARDUP_ENABLED or not sig:
+        return None
+    try:
+        matches = neardup_index().query(sig, exclude=key, limit=1)
+    except Exception as e:
+        log.warning(f"Near-duplicate lookup failed: {e}")
+        return None
+    if matches and matches[0].similarity >= min(config.NEARDUP_DELTA_THRESHOLD, config.NEARDUP_LINK_THRESHOLD):
+        return matches[0]
+    return None
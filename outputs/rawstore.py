@@ -0,0 +1,297 @@
+"""Compressed, append-only store of raw extractions, keyed by canonical URL.
+
+Every ``ExtractionResult`` the pipeline fetches is appended here before AI
+processing. Prompts and models can then be re-run later (``coord.py
+--reprocess``, benchmarks, analytics) without re-scraping or paying for Grok
+again.
+
+Layout under ``RAW_STORE_PATH``:
+
+* ``segment-NNNN.bin``: records appended back to back. Each record is a
+  5-byte header (codec, length) followed by the compressed JSON. A segment
+  is closed once it passes ``RAW_STORE_SEGMENT_BYTES``.
+* ``index.json``: canonical key → ``[segment, offset, length]`` of the
+  latest record for that key. It can be rebuilt from the segments at any
+  time (``rebuild_index``).
+
+Records are compressed with zstd when ``zstandard`` is installed, else zlib.
+The codec is stored per record, so a store can mix both. Appends hold an
+exclusive file lock, so the bot and CLI workers can share one store. A
+partial record left by an interrupted append is truncated before the next
+one is written.
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import config
+from extractors.base import ExtractionResult
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+log = logging.getLogger("megamind.rawstore")
+
+HEADER = struct.Struct(">BI")  # codec, compressed length
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+
+def _compress(data: bytes) -> tuple[int, bytes]:
+    if zstandard is not None:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=10).compress(data)
+    return CODEC_ZLIB, zlib.compress(data, 9)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Record is zstd-compressed; pip install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown raw store codec {codec}")
+
+
+def _to_record(key: str, result: ExtractionResult) -> dict:
+    return {
+        "key": key,
+        "title": result.title,
+        "url": result.url,
+        "source_type": result.source_type,
+        "raw_content": result.raw_content,
+        "metadata": result.metadata,
+        "stored_at": time.time(),
+    }
+
+
+def _to_result(record: dict) -> ExtractionResult:
+    return ExtractionResult(
+        title=record["title"],
+        url=record["url"],
+        source_type=record["source_type"],
+        raw_content=record["raw_content"],
+        metadata=record.get("metadata") or {},
+    )
+
+
+class RawStore:
+    """Append-only compressed record store with random access by canonical key."""
+
+    def __init__(self, root: Path | None = None, segment_bytes: int | None = None):
+        self.root = Path(root or config.RAW_STORE_PATH)
+        self.segment_bytes = segment_bytes or config.RAW_STORE_SEGMENT_BYTES
+        self.index_file = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._index: dict[str, list] | None = None
+        self._index_mtime = 0.0
+        self._tail: tuple[int, int] | None = None  # (segment, size) after our last append or tail check
+
+    # ── Locking and index ──
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive across threads and (where supported) processes."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.root / ".lock", "a") as fh:
+            if fcntl:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _load_index(self) -> dict[str, list]:
+        """The key index, re-read if another process has written it since."""
+        try:
+            mtime = self.index_file.stat().st_mtime
+        except FileNotFoundError:
+            if self._index is None:
+                self._index = self.rebuild_index(save=False) if self._segments() else {}
+            return self._index
+        if self._index is None or mtime != self._index_mtime:
+            try:
+                self._index = json.loads(self.index_file.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, IOError):
+                log.warning("Corrupt raw store index — rebuilding from segments")
+                self._index = self.rebuild_index(save=False)
+            self._index_mtime = mtime
+        return self._index
+
+    def _save_index(self, index: dict):
+        tmp = self.index_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.index_file)
+        self._index, self._index_mtime = index, self.index_file.stat().st_mtime
+
+    def _segments(self) -> list[Path]:
+        return sorted(self.root.glob("segment-*.bin")) if self.root.exists() else []
+
+    def _segment_path(self, number: int) -> Path:
+        return self.root / f"segment-{number:04d}.bin"
+
+    # ── Writing ──
+
+    def put(self, key: str, result: ExtractionResult):
+        """Append a raw extraction; it becomes the record returned for ``key``."""
+        payload = json.dumps(_to_record(key, result), ensure_ascii=False, default=str).encode("utf-8")
+        codec, blob = _compress(payload)
+        with self._locked():
+            index = dict(self._load_index())
+            segments = self._segments()
+            number = int(segments[-1].stem.split("-")[1]) if segments else 0
+            path = self._segment_path(number)
+            if path.exists():
+                self._drop_torn_tail(number)
+                if path.stat().st_size >= self.segment_bytes:
+                    number += 1
+                    path = self._segment_path(number)
+            with open(path, "ab") as fh:
+                offset = fh.tell()
+                fh.write(HEADER.pack(codec, len(blob)) + blob)
+                fh.flush()
+                os.fsync(fh.fileno())
+            index[key] = [number, offset, HEADER.size + len(blob)]
+            self._save_index(index)
+            self._tail = (number, offset + HEADER.size + len(blob))
+
+    def _drop_torn_tail(self, number: int):
+        """Truncate a partial record left at the end of a segment by an interrupted append.
+
+        Otherwise the next record would be written after it, and a scan
+        (``rebuild_index``) would stop at the torn bytes and lose everything
+        appended since. Must be called with the store locked.
+        """
+        path = self._segment_path(number)
+        size = path.stat().st_size
+        if self._tail == (number, size):
+            return  # ends where our last append did
+        with open(path, "r+b") as fh:
+            end = 0
+            while end + HEADER.size <= size:
+                fh.seek(end)
+                _, length = HEADER.unpack(fh.read(HEADER.size))
+                if end + HEADER.size + length > size:
+                    break
+                end += HEADER.size + length
+            if end < size:
+                log.warning(f"Dropping {size - end} byte(s) of torn record at {path.name}:{end}")
+                fh.truncate(end)
+                fh.flush()
+                os.fsync(fh.fileno())
+        self._tail = (number, end)
+
+    # ── Reading ──
+
+    def _read_at(self, number: int, offset: int, length: int) -> dict:
+        with open(self._segment_path(number), "rb") as fh:
+            fh.seek(offset)
+            data = fh.read(length)
+        codec, size = HEADER.unpack_from(data)
+        return json.loads(_decompress(codec, data[HEADER.size:HEADER.size + size]))
+
+    def get_record(self, key: str) -> dict | None:
+        """The latest stored record for ``key`` (raw fields plus ``key`` and ``stored_at``)."""
+        with self._lock:
+            loc = self._load_index().get(key)
+        return self._read_at(*loc) if loc else None
+
+    def get(self, key: str) -> ExtractionResult | None:
+        record = self.get_record(key)
+        return _to_result(record) if record else None
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._load_index()
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._load_index())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+    def _scan(self) -> Iterator[tuple[int, int, int, dict]]:
+        """Every record in append order as ``(segment, offset, length, record)``; tolerates a torn tail."""
+        for path in self._segments():
+            number = int(path.stem.split("-")[1])
+            with open(path, "rb") as fh:
+                while True:
+                    offset = fh.tell()
+                    header = fh.read(HEADER.size)
+                    if len(header) < HEADER.size:
+                        break
+                    codec, size = HEADER.unpack(header)
+                    blob = fh.read(size)
+                    if len(blob) < size:
+                        log.warning(f"Truncated record at {path.name}:{offset} — ignoring the rest")
+                        break
+                    yield number, offset, HEADER.size + size, json.loads(_decompress(codec, blob))
+
+    def iter_records(self, latest_only: bool = True) -> Iterator[dict]:
+        """Stream records sequentially, segment by segment.
+
+        With ``latest_only`` (default), superseded records for a key are skipped.
+        """
+        with self._lock:
+            current = {tuple(loc[:2]) for loc in self._load_index().values()} if latest_only else None
+        for number, offset, _, record in self._scan():
+            if current is None or (number, offset) in current:
+                yield record
+
+    def __iter__(self) -> Iterator[tuple[str, ExtractionResult]]:
+        for record in self.iter_records():
+            yield record["key"], _to_result(record)
+
+    def rebuild_index(self, save: bool = True) -> dict[str, list]:
+        """Recreate the key index by scanning every segment (last record per key wins)."""
+        index = {record["key"]: [number, offset, length] for number, offset, length, record in self._scan()}
+        if save:
+            with self._locked():
+                self._save_index(index)
+        return index
+
+    def stats(self) -> dict:
+        segments = self._segments()
+        return {
+            "keys": len(self),
+            "segments": len(segments),
+            "bytes": sum(p.stat().st_size for p in segments),
+            "codec": "zstd" if zstandard is not None else "zlib",
+        }
+
+
+_store: RawStore | None = None
+
+
+def raw_store() -> RawStore:
+    """The shared store at ``RAW_STORE_PATH``."""
+    global _store
+    if _store is None:
+        _store = RawStore()
+    return _store
+
+
+def store_raw(key: str, result: ExtractionResult):
+    """Keep a raw extraction for later reprocessing. Never fails the pipeline."""
+    try:
+        raw_store().put(key, result)
+    except Exception as e:
+        log.warning(f"Could not store raw content for {key}: {e}")
@@ -0,0 +1,336 @@
+"""TF-IDF "related extractions", kept incrementally in SQLite.
+
+Every saved extraction is tokenised once and its term counts are written as
+postings (``term → document, log-scaled tf``) to ``.related.sqlite3``.
+Adding or replacing a document touches only its own rows and the document
+frequencies of its terms. Nothing is rebuilt, and startup reads nothing:
+the database is opened memory-mapped and queried in place.
+
+``related(num)`` scores by cosine similarity, using the document's
+``RELATED_QUERY_TERMS`` highest-weighted terms as the query. Those are its
+rarest and most distinctive words, whose postings lists are short, so a
+query reads a few thousand index rows even across tens of thousands of
+documents. IDF is evaluated at query time from live document frequencies.
+Stored document norms are refreshed in one pass whenever the collection
+has grown by ``NORM_REFRESH_GROWTH`` since they were computed.
+"""
+
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+import config
+
+log = logging.getLogger("megamind.related")
+
+NORM_REFRESH_GROWTH = 2.0  # recompute norms once the collection has doubled since they were computed
+
+_URL_RE = re.compile(r"https?://\S+")
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9]{2,}")
+STOPWORDS = frozenset("""
+    the and for are but not you all any can had her was one our out has him his how its may new now
+    old see two who did get let put say she too use this that with from they will would there their
+    what about which when make like time just know take into year your some could them than then look
+    only come over think also back after work first well even want because these give most been have
+    more were here such should very each where while those through being other many much does using
+    used upon within without between both same via per etc extracted source method
+    url view summary key insights actions implementation prompt prompts links resources tags category
+""".split())
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id    INTEGER PRIMARY KEY,
+    term  TEXT NOT NULL UNIQUE,
+    df    INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS docs (
+    id        INTEGER PRIMARY KEY,
+    filename  TEXT NOT NULL UNIQUE,
+    num       INTEGER,
+    norm      REAL NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS docs_num ON docs(num);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id  INTEGER NOT NULL,
+    doc_id   INTEGER NOT NULL,
+    ltf      REAL NOT NULL,
+    PRIMARY KEY (term_id, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings(doc_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key    TEXT PRIMARY KEY,
+    value  REAL NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> Counter:
+    """Term counts for a document: lowercase words of 3+ characters, URLs and stopwords dropped."""
+    return Counter(t for t in _TOKEN_RE.findall(_URL_RE.sub(" ", text.lower())) if t not in STOPWORDS)
+
+
+def _idf(df: int, n_docs: int) -> float:
+    return math.log((n_docs + 1) / (df + 1)) + 1
+
+
+class RelatedIndex:
+    """Incremental TF-IDF index over saved extractions, safe across threads and processes."""
+
+    def __init__(self, path=None):
+        self.path = str(path or config.RELATED_DB_PATH)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _conn(self):
+        """Yield this thread's connection (autocommit, WAL, memory-mapped)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")  # derived data: rebuildable from the extractions
+            conn.execute(f"PRAGMA mmap_size={config.RELATED_MMAP_BYTES}")
+            self._local.conn = conn
+        yield conn
+
+    @contextmanager
+    def _transaction(self):
+        with self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _count(self, conn) -> int:
+        return conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    # ── Writing ──
+
+    def _remove(self, conn, doc_id: int):
+        conn.execute(
+            "UPDATE terms SET df = df - 1 WHERE id IN (SELECT term_id FROM postings WHERE doc_id = ?)", (doc_id,),
+        )
+        conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+
+    def _add(self, conn, filename: str, num: int | None, text: str):
+        counts = tokenize(text)
+        row = conn.execute("SELECT id FROM docs WHERE filename = ?", (filename,)).fetchone()
+        if row:
+            doc_id = row[0]
+            self._remove(conn, doc_id)
+            conn.execute("UPDATE docs SET num = ? WHERE id = ?", (num, doc_id))
+        else:
+            doc_id = conn.execute("INSERT INTO docs (filename, num) VALUES (?, ?)", (filename, num)).lastrowid
+
+        conn.executemany("INSERT OR IGNORE INTO terms (term) VALUES (?)", ((t,) for t in counts))
+        ids = {}
+        terms = list(counts)
+        for i in range(0, len(terms), 500):  # stay under SQLite's bound-variable limit
+            chunk = terms[i:i + 500]
+            ids.update(conn.execute(
+                f"SELECT term, id FROM terms WHERE term IN ({','.join('?' * len(chunk))})", chunk,
+            ).fetchall())
+        conn.executemany(
+            "INSERT INTO postings (term_id, doc_id, ltf) VALUES (?, ?, ?)",
+            ((ids[t], doc_id, 1 + math.log(c)) for t, c in counts.items()),
+        )
+        conn.execute(
+            "UPDATE terms SET df = df + 1 WHERE id IN (SELECT term_id FROM postings WHERE doc_id = ?)", (doc_id,),
+        )
+
+        n_docs = self._count(conn)
+        dfs = dict(conn.execute(
+            "SELECT t.id, t.df FROM postings p JOIN terms t ON t.id = p.term_id WHERE p.doc_id = ?", (doc_id,),
+        ).fetchall())
+        norm = math.sqrt(sum(((1 + math.log(c)) * _idf(dfs[ids[t]], n_docs)) ** 2 for t, c in counts.items()))
+        conn.execute("UPDATE docs SET norm = ? WHERE id = ?", (norm or 1.0, doc_id))
+
+    def _maybe_refresh_norms(self, conn):
+        n_docs = self._count(conn)
+        normed_at = conn.execute("SELECT value FROM meta WHERE key = 'norm_docs'").fetchone()
+        if normed_at is None or n_docs >= normed_at[0] * NORM_REFRESH_GROWTH:
+            self._refresh_norms(conn, n_docs)
+
+    def add(self, filename: str, num: int | None, text: str):
+        """Index (or re-index) one extraction's document."""
+        with self._transaction() as conn:
+            self._add(conn, filename, num, text)
+            self._maybe_refresh_norms(conn)
+
+    def add_many(self, docs: list[tuple[str, int | None, str]]):
+        """Index ``(filename, num, text)`` documents in one transaction (backfills)."""
+        with self._transaction() as conn:
+            for filename, num, text in docs:
+                self._add(conn, filename, num, text)
+            self._maybe_refresh_norms(conn)
+
+    def remove(self, filename: str):
+        with self._transaction() as conn:
+            row = conn.execute("SELECT id FROM docs WHERE filename = ?", (filename,)).fetchone()
+            if row:
+                self._remove(conn, row[0])
+                conn.execute("DELETE FROM docs WHERE id = ?", (row[0],))
+
+    def _refresh_norms(self, conn, n_docs: int):
+        """Recompute every document norm against the current IDF (collection has grown)."""
+        conn.create_function("idf", 1, lambda df: _idf(df, n_docs), deterministic=True)
+        conn.create_function("sqrt", 1, math.sqrt, deterministic=True)
+        conn.execute("""
+            UPDATE docs SET norm = COALESCE((
+                SELECT sqrt(SUM((p.ltf * idf(t.df)) * (p.ltf * idf(t.df))))
+                FROM postings p JOIN terms t ON t.id = p.term_id WHERE p.doc_id = docs.id
+            ), 1)
+        """)
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('norm_docs', ?)", (n_docs,))
+        log.info(f"Refreshed TF-IDF norms for {n_docs} documents")
+
+    # ── Querying ──
+
+    def related(self, filename: str | None = None, num: int | None = None, k: int | None = None) -> list[dict]:
+        """Top-``k`` most similar extractions to one identified by ``filename`` or ``num``.
+
+        Returns ``[{"filename", "num", "score"}]``, best first.
+        """
+        k = k or config.RELATED_TOP_K
+        with self._conn() as conn:
+            if filename is not None:
+                row = conn.execute("SELECT id, norm FROM docs WHERE filename = ?", (filename,)).fetchone()
+            else:
+                row = conn.execute("SELECT id, norm FROM docs WHERE num = ?", (num,)).fetchone()
+            if row is None:
+                return []
+            doc_id, norm = row
+            n_docs = self._count(conn)
+
+            weighted = []
+            for term_id, ltf, df in conn.execute(
+                "SELECT p.term_id, p.ltf, t.df FROM postings p JOIN terms t ON t.id = p.term_id "
+                "WHERE p.doc_id = ? AND t.df > 1", (doc_id,),  # df 1: no other document has the term
+            ):
+                idf = _idf(df, n_docs)
+                weighted.append((ltf * idf, term_id, idf))
+            weighted.sort(reverse=True)
+            if not weighted:
+                return []
+
+            # Postings of the query terms, scored as sum(query weight * ltf * idf) per document
+            weights = {term_id: w * idf for w, term_id, idf in weighted[:config.RELATED_QUERY_TERMS]}
+            scores: dict[int, float] = {}
+            placeholders = ",".join("?" * len(weights))
+            for term_id, other, ltf in conn.execute(
+                f"SELECT term_id, doc_id, ltf FROM postings WHERE term_id IN ({placeholders}) AND doc_id != ?",
+                (*weights, doc_id),
+            ):
+                scores[other] = scores.get(other, 0.0) + weights[term_id] * ltf
+            if not scores:
+                return []
+
+            best = sorted(scores.items(), key=lambda s: s[1], reverse=True)[:k * 3]
+            info = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    f"SELECT id, filename, num, norm FROM docs WHERE id IN ({','.join('?' * len(best))})",
+                    [d for d, _ in best],
+                )
+            }
+        ranked = sorted(
+            (
+                {"filename": info[d][0], "num": info[d][1], "score": round(s / ((norm or 1) * (info[d][2] or 1)), 4)}
+                for d, s in best if d in info
+            ),
+            key=lambda r: r["score"],
+            reverse=True,
+        )
+        return ranked[:k]
+
+    def filenames(self) -> set[str]:
+        with self._conn() as conn:
+            return {row[0] for row in conn.execute("SELECT filename FROM docs")}
+
+    def __len__(self) -> int:
+        with self._conn() as conn:
+            return self._count(conn)
+
+
+_index: RelatedIndex | None = None
+_index_lock = threading.Lock()
+
+
+def related_index() -> RelatedIndex:
+    """The shared index at ``RELATED_DB_PATH``."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = RelatedIndex()
+        return _index
+
+
+def sync_catalog() -> int:
+    """Index any catalog extraction the index doesn't have yet (first run, or files added elsewhere)."""
+    from outputs.catalog import load_catalog
+
+    index = related_index()
+    known = index.filenames()
+    batch, added = [], 0
+    for meta in load_catalog():
+        path = config.EXTRACTIONS_PATH / meta["filename"]
+        if meta["filename"] in known or not path.exists():
+            continue
+        batch.append((meta["filename"], meta.get("num"), path.read_text(encoding="utf-8", errors="replace")))
+        if len(batch) == 200:
+            index.add_many(batch)
+            added, batch = added + len(batch), []
+    if batch:
+        index.add_many(batch)
+        added += len(batch)
+    if added:
+        log.info(f"Indexed {added} extraction(s) for related lookups")
+    return added
+
+
+def index_extraction(filename: str, num: int | None, document: str):
+    """Add a saved extraction to the related index. Never fails the pipeline."""
+    try:
+        related_index().add(filename, num, document)
+    except Exception as e:
+        log.warning(f"Could not index {filename} for related lookups: {e}")
+
+
+_synced = False
+
+
+def find_related(filename: str | None = None, num: int | None = None, k: int | None = None) -> list[dict]:
+    """Related extractions with their catalog metadata (title, category, ...), best first.
+
+    The first call in a process indexes any extractions the index is missing.
+    """
+    from outputs.catalog import read_sidecar
+
+    global _synced
+    try:
+        if not _synced:
+            _synced = True
+            sync_catalog()
+        matches = related_index().related(filename=filename, num=num, k=k)
+    except Exception as e:
+        log.warning(f"Related lookup failed: {e}")
+        return []
+    results = []
+    for match in matches:
+        meta = read_sidecar(match["filename"]) or {}
+        results.append({
+            **match,
+            "title": meta.get("title") or match["filename"],
+            "category": meta.get("category"),
+            "url": meta.get("url"),
+        })
+    return results
@@ -1,10 +1,72 @@
-"""Storage manager — saves extractions to Obsidian vault and local repo."""
+"""Storage manager — saves extractions to Obsidian vault and local repo.
 
-import shutil
+Filenames carry a short ID derived from the canonical URL (see
+``generate_filename``), so two sources with similar titles no longer land
+on the same path. Writes are atomic. A document whose content hash matches
+the file already at its path is not written again, and raw content that was
+already extracted under another URL is found by ``find_duplicate``.
+"""
+
+import hashlib
+import os
+import re
 from pathlib import Path
 
 import config
 
+# The only line of a formatted document that changes between identical extractions
+_EXTRACTED_RE = re.compile(r"\*\*Extracted:\*\* [^|\n]*\|")
+# Raw-content header lines that change between fetches of the same source:
+# counters (YouTube views, GitHub stars) and timestamps
+_VOLATILE_RE = re.compile(
+    r"^(?:Views|Likes|Comments|Stars|Forks|Watchers|Open issues|Last updated|Retrieved):.*$",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+
+def document_hash(content: str) -> str:
+    """Content hash of a formatted document, ignoring its extraction timestamp."""
+    return "sha256:" + hashlib.sha256(_EXTRACTED_RE.sub("", content).encode("utf-8")).hexdigest()
+
+
+def _atomic_write(path: Path, content: str):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _write_if_changed(path: Path, content: str, digest: str) -> bool:
+    """Write ``content`` unless ``path`` already holds the same document. True if written."""
+    if path.exists():
+        try:
+            if document_hash(path.read_text(encoding="utf-8")) == digest:
+                return False
+        except OSError:
+            pass
+    _atomic_write(path, content)
+    return True
+
+
+def raw_hash(content: str) -> str:
+    """Hash of the stable part of extracted raw content, so re-extractions and mirrors match.
+
+    Counter and timestamp header lines are dropped and whitespace is normalised.
+    """
+    body = " ".join(_VOLATILE_RE.sub("", content).split())
+    return "sha256:" + hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def find_duplicate(raw_content: str) -> str | None:
+    """Filename of an existing extraction made from the same raw content, if any."""
+    from outputs.catalog import find_by_raw_hash
+
+    if not raw_content.strip():
+        return None
+    meta = find_by_raw_hash(raw_hash(raw_content))
+    if meta and (config.EXTRACTIONS_PATH / meta["filename"]).exists():
+        return meta["filename"]
+    return None
+
 
 def save_extraction(filename: str, content: str) -> dict:
     """Save the extraction markdown to configured locations.
@@ -12,11 +74,12 @@ def save_extraction(filename: str, content: str) -> dict:
     Returns a dict of paths where the file was saved.
     """
     saved_to = {}
+    digest = document_hash(content)
 
     # Always save to the extractions folder in the repo
     config.EXTRACTIONS_PATH.mkdir(parents=True, exist_ok=True)
     repo_path = config.EXTRACTIONS_PATH / filename
-    repo_path.write_text(content, encoding="utf-8")
+    _write_if_changed(repo_path, content, digest)
     saved_to["repo"] = str(repo_path)
 
     # Optionally copy to Obsidian vault
@@ -24,7 +87,7 @@ def save_extraction(filename: str, content: str) -> dict:
         obsidian_dir = Path(config.OBSIDIAN_VAULT_PATH)
         if obsidian_dir.exists():
             obsidian_path = obsidian_dir / filename
-            obsidian_path.write_text(content, encoding="utf-8")
+            _write_if_changed(obsidian_path, content, digest)
             saved_to["obsidian"] = str(obsidian_path)
         else:
             print(f"  Warning: Obsidian vault path does not exist: {obsidian_dir}")
@@ -0,0 +1,363 @@
+"""Canonical tags and categories, through a persistent alias table.
+
+Claude names tags and categories freely, so one idea arrives as
+``#machinelearning`` and ``#machine-learning``, or as "Dev" and
+"Development". Each variant used to become its own dashboard graph node,
+and searching for one missed the others.
+
+Every label is reduced to a key (its lowercase words, ``&`` read as "and").
+The alias table at ``TAXONOMY_PATH`` maps every key seen so far to its
+canonical label, so resolving a known variant is a dict lookup. A new label
+is compared with the existing canonical labels and joins the closest
+cluster if it is:
+
+* the same words once run together and singularised (``llms`` / ``LLM``),
+* the same words with some in a common short form (``Dev Tools`` / ``Development Tools``),
+* an acronym of it (``ml`` / ``machine-learning``),
+* a typo of it (edit distance 1 from 8 characters, 2 from 12),
+* or shares ``TAXONOMY_TOKEN_OVERLAP`` of its words, in any order.
+
+Otherwise it starts a cluster of its own. New documents are canonicalised
+before they are saved (``processors.ai_processor``). The dashboard and
+``catalog.search`` map stored labels through the same table, so older
+extractions merge too.
+
+``rebuild`` re-clusters the whole vocabulary from the catalog, most-used
+spelling first, so each cluster is named by its most common variant (the
+longest, on a tie). A label that matches two clusters equally well is left
+as its own. The table is plain JSON and can be edited by hand to merge or
+split clusters. A rebuild (``coord.py --taxonomy``) starts it over.
+"""
+
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+import config
+from outputs.document import CATEGORY_SECTION, ProcessedDocument
+
+log = logging.getLogger("megamind.taxonomy")
+
+KINDS = ("tags", "categories")
+TAGS_SECTION = "Tags"
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_DIGITS_RE = re.compile(r"\D")
+_FILLER = frozenset({"and", "the", "of", "for", "in"})
+
+# Scores of the merge rules, used to pick the closest cluster when several match
+_SAME_WORDS, _ABBREVIATED, _ACRONYM, _TYPO = 1.0, 0.9, 0.85, 0.8
+
+# Common short forms (singularised) and the words they stand for. A bare
+# prefix isn't enough: "java" isn't "javascript", nor "market" "marketing".
+_ABBREVIATIONS = {
+    "admin": {"administration", "administrator"},
+    "app": {"application"},
+    "auth": {"authentication", "authorization", "authorisation"},
+    "biz": {"business"},
+    "config": {"configuration"},
+    "db": {"database"},
+    "dev": {"development", "developer"},
+    "doc": {"documentation", "document"},
+    "env": {"environment"},
+    "eng": {"engineering", "engineer"},
+    "gen": {"generative"},
+    "info": {"information"},
+    "infra": {"infrastructure"},
+    "intro": {"introduction"},
+    "js": {"javascript"},
+    "k8s": {"kubernete"},
+    "lib": {"library"},
+    "math": {"mathematics"},
+    "mgmt": {"management"},
+    "ops": {"operation"},
+    "perf": {"performance"},
+    "pkg": {"package"},
+    "prod": {"production"},
+    "py": {"python"},
+    "repo": {"repository"},
+    "sec": {"security"},
+    "stat": {"statistics"},
+    "ts": {"typescript"},
+    "viz": {"visualization", "visualisation"},
+}
+
+
+def _words(label: str) -> list[str]:
+    return _WORD_RE.findall(label.lower().replace("&", " and "))
+
+
+def label_key(label: str) -> str:
+    """The alias-table key for ``label``: its lowercase words joined by ``-``."""
+    return "-".join(_words(label.lstrip("#")))
+
+
+def _singular(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    # news, analytics, physics: already singular
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is", "ews", "ics")):
+        return word[:-1]
+    return word
+
+
+@dataclass(slots=True)
+class _Label:
+    words: tuple[str, ...]  # singularised, filler words dropped
+    joined: str
+
+    @classmethod
+    def of(cls, label: str) -> "_Label":
+        words = tuple(_singular(w) for w in _words(label) if w not in _FILLER) or tuple(_words(label))
+        return cls(words, _singular("".join(words)))
+
+
+def _abbreviates(short: str, long: str) -> bool:
+    return long in _ABBREVIATIONS.get(short, ())
+
+
+def _within_edits(a: str, b: str, limit: int) -> bool:
+    """Levenshtein distance of ``a`` and ``b`` is at most ``limit`` (stops early)."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+        if min(cur) > limit:
+            return False
+        prev = cur
+    return prev[-1] <= limit
+
+
+def _score(a: _Label, b: _Label) -> float:
+    """How surely ``a`` and ``b`` name the same thing (0: they don't)."""
+    if a.joined == b.joined:
+        return _SAME_WORDS
+    if len(a.words) == len(b.words) and all(
+        x == y or _abbreviates(x, y) or _abbreviates(y, x) for x, y in zip(a.words, b.words)
+    ):
+        return _ABBREVIATED
+    for short, long in ((a, b), (b, a)):
+        if len(short.words) == 1 and len(long.words) >= 2 and short.joined == "".join(w[0] for w in long.words):
+            return _ACRONYM
+    shortest = min(len(a.joined), len(b.joined))
+    limit = 2 if shortest >= 12 else 1 if shortest >= 8 else 0
+    if (
+        limit
+        and a.joined[0] == b.joined[0]
+        and _DIGITS_RE.sub("", a.joined) == _DIGITS_RE.sub("", b.joined)  # python2 / python3 stay apart
+        and _within_edits(a.joined, b.joined, limit)
+    ):
+        return _TYPO
+    sa, sb = set(a.words), set(b.words)
+    overlap = len(sa & sb) / len(sa | sb)
+    return overlap if overlap >= config.TAXONOMY_TOKEN_OVERLAP else 0.0
+
+
+def _clean(label) -> str:
+    return " ".join(str(label or "").strip().strip("`").lstrip("#").split())
+
+
+def _display(kind: str, label: str) -> str:
+    """How a new canonical label is written: tags as lowercase-hyphenated, categories as given."""
+    return label.lower().replace(" ", "-") if kind == "tags" else label
+
+
+class Taxonomy:
+    """The alias table: ``{kind: {label key: canonical label}}``, shared across threads and processes."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path or config.TAXONOMY_PATH)
+        self._lock = threading.Lock()
+        self._aliases: dict[str, dict[str, str]] = {kind: {} for kind in KINDS}
+        self._labels: dict[str, dict[str, _Label]] = {kind: {} for kind in KINDS}
+        self._mtime: float | None = None
+        self.generation = 0  # bumped whenever the table changes, for callers caching resolved labels
+
+    def _set(self, aliases: dict[str, dict[str, str]]):
+        self._aliases = {kind: dict(aliases.get(kind, {})) for kind in KINDS}
+        self._labels = {
+            kind: {c: _Label.of(c) for c in set(self._aliases[kind].values())} for kind in KINDS
+        }
+        self.generation += 1
+
+    def _load(self):
+        """Read the table on first use and again whenever another process has rewritten it."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            if self._mtime is None:
+                self._mtime = 0
+                self._bootstrap()
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            self._set(json.loads(self.path.read_text(encoding="utf-8")))
+        except (json.JSONDecodeError, IOError):
+            log.warning("Corrupt taxonomy alias table — rebuilding")
+            self._bootstrap()
+            return
+        self._mtime = mtime
+
+    def _save(self):
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._aliases, indent=1, sort_keys=True, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.path)
+        self._mtime = self.path.stat().st_mtime
+
+    def _bootstrap(self):
+        from outputs.catalog import load_catalog
+        self._cluster(load_catalog())
+        self._save()
+
+    def _closest(self, kind: str, label: str) -> str | None:
+        """The best-matching canonical label, or None if nothing matches or the best match is a tie
+        (``dev`` abbreviates both ``development`` and ``developer``: it is left alone).
+        """
+        probe = _Label.of(label)
+        best, best_score, tied = None, 0.0, False
+        for canonical, other in self._labels[kind].items():
+            score = _score(probe, other)
+            if score > best_score:
+                best, best_score, tied = canonical, score, False
+            elif score and score == best_score:
+                tied = True
+        return None if tied else best
+
+    def _cluster(self, entries: list[dict]) -> dict[str, dict[str, list[str]]]:
+        """Cluster every label in ``entries`` from scratch; returns ``{kind: {canonical: [variants]}}``."""
+        values = {
+            "tags": [t for e in entries for t in e.get("tags") or []],
+            "categories": [e.get("category") for e in entries],
+        }
+        aliases: dict[str, dict[str, str]] = {kind: {} for kind in KINDS}
+        clusters: dict[str, dict[str, list[str]]] = {kind: {} for kind in KINDS}
+        self._labels = {kind: {} for kind in KINDS}
+        for kind in KINDS:
+            counts = Counter(c for c in map(_clean, values[kind]) if label_key(c))
+            for label, _ in sorted(counts.items(), key=lambda kv: (-kv[1], -len(kv[0]), kv[0])):
+                key = label_key(label)
+                canonical = aliases[kind].get(key) or self._closest(kind, label)
+                if canonical is None:
+                    canonical = _display(kind, label)
+                    self._labels[kind][canonical] = _Label.of(canonical)
+                aliases[kind][key] = canonical
+                clusters[kind].setdefault(canonical, []).append(label)
+        self._set(aliases)
+        return clusters
+
+    def resolve(self, kind: str, label: str, learn: bool = False) -> str:
+        """The canonical form of ``label``. With ``learn``, a new label is added to the table."""
+        label = _clean(label)
+        key = label_key(label)
+        if not key:
+            return label
+        with self._lock:
+            self._load()
+            canonical = self._aliases[kind].get(key)
+            if canonical is not None:
+                return canonical
+            canonical = self._closest(kind, label)
+            if canonical is None:
+                canonical = _display(kind, label)
+            if learn:
+                self._aliases[kind][key] = canonical
+                self._labels[kind].setdefault(canonical, _Label.of(canonical))
+                self.generation += 1
+                self._save()
+            return canonical
+
+    def match(self, kind: str, label: str) -> str | None:
+        """The existing canonical label ``label`` resolves to, or None if it names nothing known."""
+        label = _clean(label)
+        key = label_key(label)
+        if not key:
+            return None
+        with self._lock:
+            self._load()
+            return self._aliases[kind].get(key) or self._closest(kind, label)
+
+    def rebuild(self, entries: list[dict]) -> dict[str, dict[str, list[str]]]:
+        """Re-cluster the table from ``entries`` (catalog metadata) and save it."""
+        with self._lock:
+            clusters = self._cluster(entries)
+            self._save()
+        return clusters
+
+
+_taxonomy: Taxonomy | None = None
+
+
+def taxonomy() -> Taxonomy:
+    """The shared alias table at ``TAXONOMY_PATH``."""
+    global _taxonomy
+    if _taxonomy is None:
+        _taxonomy = Taxonomy()
+    return _taxonomy
+
+
+def canonical_category(category: str, learn: bool = False) -> str:
+    if not config.TAXONOMY_ENABLED:
+        return category
+    return taxonomy().resolve("categories", category, learn) or category
+
+
+def canonical_tags(tags: list[str], learn: bool = False) -> list[str]:
+    """Canonical forms of ``tags``, in order, without duplicates."""
+    if not config.TAXONOMY_ENABLED:
+        return tags
+    return list(dict.fromkeys(c for c in (taxonomy().resolve("tags", t, learn) for t in tags) if c))
+
+
+def lookup(query: str) -> list[tuple[str, str]]:
+    """``(kind, canonical)`` for each kind in which ``query`` names a known tag or category."""
+    if not config.TAXONOMY_ENABLED:
+        return []
+    return [(kind, canonical) for kind in KINDS if (canonical := taxonomy().match(kind, query))]
+
+
+def _replace_section(raw: str, heading: str, body: str) -> str:
+    pattern = re.compile(rf"(^###\s+{re.escape(heading)}[ \t]*\n)(.*?)(?=^###\s|\Z)", re.MULTILINE | re.DOTALL)
+
+    def swap(m: re.Match) -> str:
+        old = m.group(2)
+        return m.group(1) + body + old[len(old.rstrip()):]
+
+    return pattern.sub(swap, raw, count=1)
+
+
+def canonicalise_document(doc: ProcessedDocument) -> ProcessedDocument:
+    """Rewrite ``doc``'s tags and category to their canonical forms, learning new ones. Never fails."""
+    if not config.TAXONOMY_ENABLED:
+        return doc
+    try:
+        tags = canonical_tags(doc.tags, learn=True)
+        category = canonical_category(doc.category, learn=True)
+    except Exception as e:
+        log.warning(f"Could not canonicalise tags/category: {e}")
+        return doc
+    if tags == doc.tags and category == doc.category:
+        return doc
+
+    doc.tags, doc.category = tags, category
+    tag_line = " ".join(f"`#{t}`" for t in tags)
+    if TAGS_SECTION in doc.sections:
+        doc.sections[TAGS_SECTION] = tag_line
+        doc.raw = _replace_section(doc.raw, TAGS_SECTION, tag_line)
+    if CATEGORY_SECTION in doc.sections:
+        doc.sections[CATEGORY_SECTION] = category
+        doc.raw = _replace_section(doc.raw, CATEGORY_SECTION, category)
+    return doc
+
+
+def rebuild_from_catalog() -> dict[str, dict[str, list[str]]]:
+    """Re-cluster every tag and category in the catalog. Returns ``{kind: {canonical: [variants]}}``."""
+    from outputs.catalog import load_catalog
+    return taxonomy().rebuild(load_catalog())
@@ -1,9 +1,14 @@
 """AI-powered content processor using Claude API for insight extraction."""
 
-import anthropic
+import logging
 
 import config
+import llm
 from extractors.base import ExtractionResult
+from outputs.document import ProcessedDocument, document_from_fields, parse_document
+from outputs.taxonomy import canonicalise_document
+
+log = logging.getLogger("megamind.processor")
 
 
 SYSTEM_PROMPT = """\
@@ -72,17 +77,106 @@ Be practical. The reader will pick this up later on their desktop to implement.
 Make everything as copy-paste-ready as possible."""
 
 
-def process_extraction(result: ExtractionResult) -> str:
-    """Process an extraction result through Claude to generate structured output.
+# ---------------------------------------------------------------------------
+# Delta mode (near-duplicate of an existing extraction)
+# ---------------------------------------------------------------------------
 
-    Returns the AI-generated structured content as a string.
-    """
-    if not config.ANTHROPIC_API_KEY:
-        return _fallback_processing(result)
+# Appended to the system prompt when the content overlaps an existing extraction
+# (see outputs.neardup), so Claude writes up only what is new, briefly
+DELTA_PROMPT = """
+
+## Related extraction
+This content largely overlaps an extraction the reader already has. Its summary:
+
+{summary}
+
+Key insights already captured:
+{insights}
+
+Cover ONLY what this source adds beyond that: new insights, actions, prompts and links. \
+Keep every section brief. If a section has nothing new, write \
+"Nothing new beyond the related extraction." Keep Tags and Category consistent with the \
+related extraction where they still fit."""
+
+DELTA_MAX_TOKENS = 1500
+
+
+def _system_prompt(base: str, related: ProcessedDocument | None) -> str:
+    if related is None:
+        return base
+    return base + DELTA_PROMPT.format(
+        summary=related.summary or "(no summary)",
+        insights=related.section("Key Insights") or "(none)",
+    )
 
-    client = anthropic.Anthropic(api_key=config.ANTHROPIC_API_KEY)
 
-    user_message = f"""\
+# ---------------------------------------------------------------------------
+# Structured output (CLAUDE_STRUCTURED_OUTPUT)
+# ---------------------------------------------------------------------------
+
+# Same guidance as SYSTEM_PROMPT, but the sections arrive as tool-call fields
+# rather than markdown headings, so nothing has to be scraped back out.
+STRUCTURED_SYSTEM_PROMPT = SYSTEM_PROMPT.split("## Output format (follow exactly):")[0] + """\
+Record your analysis by calling the record_extraction tool exactly once. Field guidance:
+- summary: 2-4 sentences capturing the core value of this content.
+- key_insights: 3-8 self-contained takeaways.
+- actions: concrete, specific next steps (plain text, no checkbox markup).
+- prompts: ready-to-paste prompts for an AI assistant (like Claude Code) that implement \
+the actions. Each has a short descriptive title and a specific, self-contained body.
+- links: every URL, tool, library, repo and resource mentioned, including the original source URL.
+- tags: 3-6 lowercase tags, without the # sign.
+- category: ONE primary category, the most specific accurate one. You are NOT limited to a \
+fixed list. Examples: Claude Code, AI Agents, OpenClaw, Infrastructure as Code, DevOps, \
+Security, Development, Productivity, Finances, Fitness, Career, Business, Open Source, \
+Machine Learning, Automation, Data Engineering, Cloud Architecture, Leadership.
+
+## Context-awareness rules:""" + SYSTEM_PROMPT.split("## Context-awareness rules:")[1]
+
+EXTRACTION_TOOL = {
+    "name": "record_extraction",
+    "description": "Record the structured knowledge extracted from the content.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "summary": {"type": "string"},
+            "key_insights": {"type": "array", "items": {"type": "string"}},
+            "actions": {"type": "array", "items": {"type": "string"}},
+            "prompts": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"title": {"type": "string"}, "body": {"type": "string"}},
+                    "required": ["title", "body"],
+                },
+            },
+            "links": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"title": {"type": "string"}, "url": {"type": "string"}},
+                    "required": ["url"],
+                },
+            },
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "category": {"type": "string"},
+        },
+        "required": ["summary", "key_insights", "actions", "prompts", "links", "tags", "category"],
+    },
+}
+
+
+def _record_usage(result: ExtractionResult, response: llm.LLMResponse):
+    """Keep token counts on the result for the extraction's metadata sidecar."""
+    result.metadata["usage"] = {
+        "model": config.CLAUDE_MODEL,
+        "input_tokens": response.input_tokens,
+        "output_tokens": response.output_tokens,
+        "latency_ms": response.latency_ms,
+    }
+
+
+def _user_message(result: ExtractionResult) -> str:
+    return f"""\
 Source type: {result.source_type}
 URL: {result.url}
 Title: {result.title}
@@ -93,27 +187,57 @@ Title: {result.title}
 
 Analyse this content and produce the structured output as specified."""
 
-    response = client.messages.create(
-        model=config.CLAUDE_MODEL,
-        max_tokens=4096,
-        system=SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": user_message}],
+
+def _process_structured(
+    result: ExtractionResult, related: ProcessedDocument | None = None,
+) -> ProcessedDocument | None:
+    """Ask Claude for the fields via a forced tool call. None if no usable tool call came back."""
+    response = llm.claude_message(
+        _system_prompt(STRUCTURED_SYSTEM_PROMPT, related), _user_message(result),
+        max_tokens=DELTA_MAX_TOKENS if related else 4096, title=result.title,
+        tools=[EXTRACTION_TOOL],
+        tool_choice={"type": "tool", "name": EXTRACTION_TOOL["name"]},
     )
+    _record_usage(result, response)
+    for block in response.content:
+        if block.type == "tool_use" and block.name == EXTRACTION_TOOL["name"] and isinstance(block.input, dict):
+            doc = document_from_fields(block.input)
+            if doc.summary:
+                return doc
+    log.warning(f"No usable structured output for {result.title!r}, falling back to markdown")
+    return None
+
+
+def process_document(result: ExtractionResult, related: ProcessedDocument | None = None) -> ProcessedDocument:
+    """Process an extraction through Claude and return it as a ProcessedDocument.
+
+    With ``CLAUDE_STRUCTURED_OUTPUT`` the fields come back as JSON; otherwise
+    (or if the structured call returns nothing usable) Claude writes markdown
+    and it is parsed once. ``related`` switches to delta mode: only what the
+    content adds beyond that existing extraction, with a smaller output budget.
+    Tags and category come back in their canonical forms (``outputs.taxonomy``).
+    """
+    if config.ANTHROPIC_API_KEY and config.CLAUDE_STRUCTURED_OUTPUT:
+        doc = _process_structured(result, related)
+        if doc is not None:
+            return canonicalise_document(doc)
+    return canonicalise_document(parse_document(process_extraction(result, related)))
+
+
+def process_extraction(result: ExtractionResult, related: ProcessedDocument | None = None) -> str:
+    """Process an extraction result through Claude to generate structured output.
 
-    # Track token usage for budget
-    try:
-        from budget import record_usage
-        record_usage(
-            model=config.CLAUDE_MODEL,
-            input_tokens=response.usage.input_tokens,
-            output_tokens=response.usage.output_tokens,
-            api="anthropic",
-            title=result.title,
-        )
-    except Exception:
-        pass  # Don't let budget tracking break extraction
-
-    return response.content[0].text
+    Returns the AI-generated structured content as a string.
+    """
+    if not config.ANTHROPIC_API_KEY:
+        return _fallback_processing(result)
+
+    response = llm.claude_message(
+        _system_prompt(SYSTEM_PROMPT, related), _user_message(result),
+        max_tokens=DELTA_MAX_TOKENS if related else 4096, title=result.title,
+    )
+    _record_usage(result, response)
+    return response.text
 
 
 def _fallback_processing(result: ExtractionResult) -> str:
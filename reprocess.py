@@ -0,0 +1,260 @@
+"""Regenerate Claude's output for past extractions from their stored raw content.
+
+``coord.py --reprocess`` selects catalog entries with a filter, reads each
+one's raw extraction from the raw store (no fetching) and runs it through
+the current prompt and model. The markdown file, its Obsidian copy, its
+INDEX.md row and its sidecar are then rewritten in place under the same
+filename and entry number.
+
+Entries are processed by a bounded thread pool, and each Claude call also
+waits on the process-wide per-upstream limit in ``llm``. Progress is written
+to a checkpoint after every entry. An interrupted run restarted with the
+same filter skips whatever already finished.
+
+Filter terms (all must match; anything without a ``key:`` is a text search):
+
+    num:12  num:10-40  status:Backlog  source:youtube  category:dev
+    tag:agents  since:2025-01-01  until:2025-03-31  model:claude-sonnet-4
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import config
+from budget import DEFAULT_AVOIDED_CALL, DEFAULT_PRICING, PRICING, get_summary
+from outputs.catalog import extraction_metadata, load_catalog, write_sidecar
+from outputs.formatter import format_document
+from outputs.index import update_entry
+from outputs.rawstore import raw_store
+from outputs.related import index_extraction
+from outputs.storage import save_extraction
+from outputs.taxonomy import canonical_category, canonical_tags
+from processors.ai_processor import (
+    EXTRACTION_TOOL, STRUCTURED_SYSTEM_PROMPT, SYSTEM_PROMPT, _user_message, process_document,
+)
+
+log = logging.getLogger("megamind.reprocess")
+
+CHECKPOINT_FILE = config.PROJECT_ROOT / ".reprocess_checkpoint.json"
+CHARS_PER_TOKEN = 4  # rough, for estimates only
+
+
+# ---------------------------------------------------------------------------
+# Selection
+# ---------------------------------------------------------------------------
+
+def _num_range(value: str) -> tuple[int, int]:
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+
+def _matches(meta: dict, term: str) -> bool:
+    key, sep, value = term.partition(":")
+    if not sep or not value:
+        return term.lower().lstrip("#") in " ".join(
+            [meta.get("title") or "", meta.get("category") or "", meta.get("url") or "", *meta.get("tags", [])]
+        ).lower()
+    value_l = value.lower()
+    key = key.lower()
+    if key == "num":
+        low, high = _num_range(value)
+        return meta.get("num") is not None and low <= meta["num"] <= high
+    if key == "status":
+        return (meta.get("status") or "").lower() == value_l
+    if key == "source":
+        return (meta.get("source_type") or "").lower() == value_l
+    if key == "category":
+        category = meta.get("category") or ""
+        return value_l in category.lower() or canonical_category(value) == canonical_category(category)
+    if key == "tag":
+        wanted = set(canonical_tags([value_l.lstrip("#")]))
+        return bool(wanted & set(canonical_tags([t.lower() for t in meta.get("tags", [])])))
+    if key == "since":
+        return (meta.get("date") or "") >= value
+    if key == "until":
+        return (meta.get("date") or "") <= value
+    if key == "model":
+        return value_l in (meta.get("model") or "").lower()
+    raise ValueError(f"Unknown filter key {key!r}")
+
+
+def select_entries(filter_expr: str | None) -> tuple[list[dict], list[dict]]:
+    """Catalog entries matching ``filter_expr``, split into ``(reprocessable, no_raw_content)``."""
+    terms = (filter_expr or "").split()
+    store = raw_store()
+    selected, missing = [], []
+    for meta in load_catalog():
+        if all(_matches(meta, t) for t in terms):
+            key = meta.get("canonical_key")
+            (selected if key and key in store else missing).append(meta)
+    return selected, missing
+
+
+# ---------------------------------------------------------------------------
+# Cost estimate
+# ---------------------------------------------------------------------------
+
+def _typical_output_tokens() -> int:
+    history = [e["output_tokens"] for e in get_summary()["history"] if e.get("api") == "anthropic"]
+    return int(sum(history) / len(history)) if history else DEFAULT_AVOIDED_CALL["output_tokens"]
+
+
+def estimate(entries: list[dict], model: str | None = None) -> dict:
+    """Estimated tokens and USD cost of reprocessing ``entries`` with ``model``.
+
+    Input is sized from each entry's stored raw content plus the system prompt.
+    Output reuses the entry's previous output token count where the sidecar
+    has one, else the recent average from the budget history.
+    """
+    model = model or config.CLAUDE_MODEL
+    prices = PRICING.get(model, DEFAULT_PRICING)
+    if config.CLAUDE_STRUCTURED_OUTPUT:
+        overhead = len(STRUCTURED_SYSTEM_PROMPT) + len(json.dumps(EXTRACTION_TOOL))
+    else:
+        overhead = len(SYSTEM_PROMPT)
+    typical_output = _typical_output_tokens()
+
+    store = raw_store()
+    input_tokens = output_tokens = 0
+    for meta in entries:
+        result = store.get(meta["canonical_key"])
+        if result is None:
+            continue
+        input_tokens += (overhead + len(_user_message(result))) // CHARS_PER_TOKEN
+        output_tokens += (meta.get("tokens") or {}).get("output") or typical_output
+    cost = (input_tokens * prices["input"] + output_tokens * prices["output"]) / 1_000_000
+    return {
+        "entries": len(entries),
+        "model": model,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost": round(cost, 4),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint
+# ---------------------------------------------------------------------------
+
+def load_checkpoint(filter_expr: str | None) -> dict:
+    """The saved progress for this filter, or a fresh checkpoint."""
+    if CHECKPOINT_FILE.exists():
+        try:
+            data = json.loads(CHECKPOINT_FILE.read_text(encoding="utf-8"))
+            if data.get("filter") == (filter_expr or ""):
+                return data
+            log.info(f"Checkpoint is for filter {data.get('filter')!r} — starting fresh")
+        except (json.JSONDecodeError, IOError):
+            log.warning("Corrupt reprocess checkpoint — starting fresh")
+    return {"filter": filter_expr or "", "model": config.CLAUDE_MODEL, "done": [], "failed": {}}
+
+
+def _save_checkpoint(data: dict):
+    data["updated"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    tmp = CHECKPOINT_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp.replace(CHECKPOINT_FILE)
+
+
+def clear_checkpoint():
+    CHECKPOINT_FILE.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Reprocessing
+# ---------------------------------------------------------------------------
+
+def reprocess_entry(meta: dict) -> dict:
+    """Regenerate one extraction in place from its stored raw content. Returns the new sidecar."""
+    filename = meta["filename"]
+    result = raw_store().get(meta["canonical_key"])
+    if result is None:
+        raise LookupError(f"No raw content stored for {meta['canonical_key']}")
+    result.metadata["canonical_key"] = meta["canonical_key"]
+
+    started = time.monotonic()
+    doc = process_document(result)
+    document = format_document(result, doc)
+    save_extraction(filename, document)  # repo file and Obsidian copy, same name
+    if meta.get("num") is not None:
+        update_entry(meta["num"], result, doc)
+    index_extraction(filename, meta.get("num"), document)
+
+    new_meta = extraction_metadata(
+        result, doc, filename, document, meta.get("date") or filename[:10], meta.get("num"),
+        {"process_s": round(time.monotonic() - started, 2)},
+    )
+    new_meta["status"] = meta.get("status", "Backlog")
+    new_meta["extracted_at"] = meta.get("extracted_at") or new_meta["extracted_at"]
+    new_meta["reprocessed_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    write_sidecar(filename, new_meta)
+    return new_meta
+
+
+def reprocess(
+    filter_expr: str | None,
+    workers: int,
+    dry_run: bool = False,
+    restart: bool = False,
+) -> int:
+    """Reprocess every matching entry. Returns the number that failed."""
+    try:
+        entries, missing = select_entries(filter_expr)
+    except ValueError as e:
+        print(f"  Bad filter: {e}")
+        return 1
+    if restart:
+        clear_checkpoint()
+    checkpoint = load_checkpoint(filter_expr)
+    done = set(checkpoint["done"])
+    todo = [m for m in entries if m["filename"] not in done]
+
+    print(f"  {len(entries) + len(missing)} matching entr{'y' if len(entries) + len(missing) == 1 else 'ies'}: "
+          f"{len(entries)} with stored raw content, {len(missing)} without (skipped)")
+    if done:
+        print(f"  Resuming: {len(entries) - len(todo)} already done in a previous run")
+    est = estimate(todo)
+    print(f"  Estimate for {est['entries']}: ~{est['input_tokens']:,} in / ~{est['output_tokens']:,} out "
+          f"tokens, ~${est['cost']:.2f} with {est['model']}")
+    if dry_run or not todo:
+        return 0
+
+    lock = threading.Lock()
+    failures = 0
+    print(f"  Reprocessing with {workers} worker(s). Ctrl+C to stop; rerun the same command to resume.")
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {pool.submit(reprocess_entry, meta): meta for meta in todo}
+        for n, future in enumerate(as_completed(futures), 1):
+            meta = futures[future]
+            name = meta["filename"]
+            try:
+                future.result()
+            except Exception as e:
+                failures += 1
+                with lock:
+                    checkpoint["failed"][name] = str(e)[:300]
+                    _save_checkpoint(checkpoint)
+                print(f"  [{n}/{len(todo)}] FAILED {name}: {e}")
+                continue
+            with lock:
+                checkpoint["done"].append(name)
+                checkpoint["failed"].pop(name, None)
+                _save_checkpoint(checkpoint)
+            print(f"  [{n}/{len(todo)}] {name}")
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        print("\n  Stopped — progress saved; rerun the same command to resume.")
+        return failures
+    pool.shutdown()
+
+    if failures:
+        print(f"  {failures} failed — rerun the same command to retry them.")
+    else:
+        clear_checkpoint()
+        print("  All done.")
+    return failures
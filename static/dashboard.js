@@ -0,0 +1,344 @@
+// MegaMind dashboard. Served as a fingerprinted, long-cached asset; all data comes from the JSON APIs.
+let entries = [];
+let graphData = {nodes: [], links: []};
+let budget = {};
+let activeFilter = 'all';
+
+// ── Header stats and budget ──
+function renderStats() {
+  const cost = '$' + (budget.total_cost || 0).toFixed(4);
+  document.getElementById('stat-extractions').textContent = entries.length;
+  document.getElementById('stat-categories').textContent = new Set(entries.map(e => e.category)).size;
+  document.getElementById('stat-tags').textContent = new Set(entries.flatMap(e => e.tags)).size;
+  document.getElementById('stat-cost').textContent = cost;
+  document.getElementById('budget-cost').textContent = cost;
+  document.getElementById('budget-count').textContent = budget.extraction_count || 0;
+  document.getElementById('budget-input').textContent = (budget.total_input_tokens || 0).toLocaleString('en-US');
+  document.getElementById('budget-output').textContent = (budget.total_output_tokens || 0).toLocaleString('en-US');
+}
+
+// ── Render entry list ──
+function renderEntries(filter) {
+  const list = document.getElementById('entry-list');
+  let filtered = entries;
+  if (filter && filter !== 'all') {
+    filtered = entries.filter(e =>
+      e.status.toLowerCase() === filter.toLowerCase() ||
+      e.category.toLowerCase() === filter.toLowerCase() ||
+      e.source.toLowerCase() === filter.toLowerCase()
+    );
+  }
+  list.innerHTML = filtered.map(e => `
+    <div class="entry-card" data-num="${e.num}" onclick="selectEntry(${e.num})">
+      <div class="entry-title">${e.title}</div>
+      <div class="entry-meta">
+        <span class="badge badge-${e.status.toLowerCase().replace(' ', '-')}">${e.status}</span>
+        <span>${e.source}</span>
+        <span>${e.category}</span>
+        <span>${e.date}</span>
+        <select class="status-select" onchange="updateStatus(${e.num}, this.value)" onclick="event.stopPropagation()">
+          ${['Backlog','TODO','In Progress','Done','Cancel'].map(s =>
+            `<option value="${s}" ${e.status===s?'selected':''}>${s}</option>`
+          ).join('')}
+        </select>
+      </div>
+      <div class="entry-meta" style="margin-top:0.25rem">
+        ${e.tags.map(t => `<span class="tag">#${t}</span>`).join(' ')}
+      </div>
+      <div class="related" id="related-${e.num}"></div>
+    </div>
+  `).join('');
+}
+
+// ── Detail: related extractions (loaded on first open) ──
+function selectEntry(num) {
+  highlightNode('ext:' + num);
+  const panel = document.getElementById('related-' + num);
+  if (!panel) return;
+  panel.classList.toggle('open');
+  if (!panel.classList.contains('open') || panel.dataset.loaded) return;
+  panel.textContent = 'Loading related…';
+  fetch(`/api/related?num=${num}`)
+    .then(r => r.json())
+    .then(items => {
+      panel.dataset.loaded = '1';
+      if (!Array.isArray(items) || !items.length) { panel.textContent = 'No related extractions yet.'; return; }
+      panel.innerHTML = '<div style="color:var(--muted);margin-bottom:0.25rem">Related</div>' + items.map(r => `
+        <div class="related-item">${Math.round(r.score * 100)}% ·
+          <a href="#" onclick="event.stopPropagation(); selectEntry(${r.num}); return false;">${r.title}</a>
+        </div>`).join('');
+    })
+    .catch(err => { panel.textContent = 'Could not load related extractions.'; console.error(err); });
+}
+
+// ── Render filters ──
+function renderFilters() {
+  const filters = document.getElementById('filters');
+  const statuses = [...new Set(entries.map(e => e.status))];
+  const sources = [...new Set(entries.map(e => e.source))];
+  const cats = [...new Set(entries.map(e => e.category))];
+  const all = [{"label":"All","value":"all"},
+    ...statuses.map(s => ({"label":s,"value":s})),
+    ...sources.map(s => ({"label":s,"value":s})),
+    ...cats.slice(0,6).map(c => ({"label":c,"value":c}))
+  ];
+  filters.innerHTML = all.map(f =>
+    `<button class="filter-btn ${f.value===activeFilter?'active':''}" onclick="setFilter('${f.value}')">${f.label}</button>`
+  ).join('');
+}
+
+function setFilter(f) {
+  activeFilter = f;
+  renderFilters();
+  renderEntries(f);
+}
+
+function setView(v) {
+  document.querySelectorAll('.view-btn').forEach(b => b.classList.remove('active'));
+  event.target.classList.add('active');
+  const layout = document.querySelector('.layout');
+  if (v === 'graph') {
+    layout.classList.add('graph-only');
+  } else {
+    layout.classList.remove('graph-only');
+  }
+  resize();
+}
+
+// ── Status update (calls API) ──
+function updateStatus(num, newStatus) {
+  fetch(`/api/status?num=${num}&status=${encodeURIComponent(newStatus)}`, {method: 'POST'})
+    .then(r => r.json())
+    .then(d => {
+      if (d.ok) {
+        const entry = entries.find(e => e.num == num);
+        if (entry) entry.status = newStatus;
+        renderEntries(activeFilter);
+      }
+    })
+    .catch(console.error);
+}
+
+// ── Canvas-based force graph ──
+const canvas = document.getElementById('graph');
+const ctx = canvas.getContext('2d');
+let W, H;
+let animId;
+let highlightedNode = null;
+let zoom = 1;
+let panX = 0, panY = 0;
+
+function zoomIn() { zoom = Math.min(zoom * 1.25, 5); }
+function zoomOut() { zoom = Math.max(zoom / 1.25, 0.2); }
+function zoomReset() { zoom = 1; panX = 0; panY = 0; }
+
+canvas.addEventListener('wheel', e => {
+  e.preventDefault();
+  if (e.deltaY < 0) zoom = Math.min(zoom * 1.1, 5);
+  else zoom = Math.max(zoom / 1.1, 0.2);
+}, {passive: false});
+
+const groupColors = {
+  centre: '#818cf8', category: '#f59e0b', extraction: '#34d399', tag: '#60a5fa'
+};
+const statusColors = {
+  backlog: '#6b7280', todo: '#3b82f6', 'in-progress': '#f59e0b', done: '#10b981', cancel: '#ef4444'
+};
+
+// Initialise node positions
+const nodeMap = {};
+function initGraph(data) {
+  graphData = data;
+  graphData.nodes.forEach((n, i) => {
+    n.x = Math.random() * 800 + 100;
+    n.y = Math.random() * 600 + 100;
+    n.vx = 0; n.vy = 0;
+    nodeMap[n.id] = n;
+  });
+  // Centre node in middle
+  if (nodeMap['megamind']) {
+    nodeMap['megamind'].x = W/2;
+    nodeMap['megamind'].y = H/2;
+    nodeMap['megamind'].fixed = true;
+  }
+}
+
+function resize() {
+  W = canvas.parentElement.clientWidth;
+  H = canvas.parentElement.clientHeight;
+  canvas.width = W; canvas.height = H;
+  if (nodeMap['megamind']) {
+    nodeMap['megamind'].x = W/2;
+    nodeMap['megamind'].y = H/2;
+  }
+}
+window.addEventListener('resize', resize);
+resize();
+
+// Simple force simulation
+function simulate() {
+  const nodes = graphData.nodes;
+  const links = graphData.links;
+  const alpha = 0.3;
+
+  // Repulsion between all nodes
+  for (let i = 0; i < nodes.length; i++) {
+    for (let j = i+1; j < nodes.length; j++) {
+      let dx = nodes[j].x - nodes[i].x;
+      let dy = nodes[j].y - nodes[i].y;
+      let dist = Math.sqrt(dx*dx + dy*dy) || 1;
+      let force = 800 / (dist * dist);
+      let fx = dx / dist * force;
+      let fy = dy / dist * force;
+      if (!nodes[i].fixed) { nodes[i].vx -= fx * alpha; nodes[i].vy -= fy * alpha; }
+      if (!nodes[j].fixed) { nodes[j].vx += fx * alpha; nodes[j].vy += fy * alpha; }
+    }
+  }
+
+  // Attraction along links
+  links.forEach(l => {
+    let s = nodeMap[l.source], t = nodeMap[l.target];
+    if (!s || !t) return;
+    let dx = t.x - s.x, dy = t.y - s.y;
+    let dist = Math.sqrt(dx*dx + dy*dy) || 1;
+    let force = (dist - 120) * 0.005;
+    let fx = dx / dist * force;
+    let fy = dy / dist * force;
+    if (!s.fixed) { s.vx += fx; s.vy += fy; }
+    if (!t.fixed) { t.vx -= fx; t.vy -= fy; }
+  });
+
+  // Centre gravity
+  nodes.forEach(n => {
+    if (n.fixed) return;
+    n.vx += (W/2 - n.x) * 0.001;
+    n.vy += (H/2 - n.y) * 0.001;
+  });
+
+  // Apply velocities with damping
+  nodes.forEach(n => {
+    if (n.fixed) return;
+    n.vx *= 0.6; n.vy *= 0.6;
+    n.x += n.vx; n.y += n.vy;
+    n.x = Math.max(20, Math.min(W-20, n.x));
+    n.y = Math.max(20, Math.min(H-20, n.y));
+  });
+}
+
+function draw() {
+  ctx.clearRect(0, 0, W, H);
+  ctx.save();
+  ctx.translate(W/2 + panX, H/2 + panY);
+  ctx.scale(zoom, zoom);
+  ctx.translate(-W/2, -H/2);
+
+  // Draw links
+  ctx.strokeStyle = 'rgba(100,116,139,0.2)';
+  ctx.lineWidth = 1;
+  graphData.links.forEach(l => {
+    let s = nodeMap[l.source], t = nodeMap[l.target];
+    if (!s || !t) return;
+    ctx.beginPath();
+    ctx.moveTo(s.x, s.y);
+    ctx.lineTo(t.x, t.y);
+    ctx.stroke();
+  });
+
+  // Draw nodes
+  graphData.nodes.forEach(n => {
+    let color = groupColors[n.group] || '#64748b';
+    if (n.group === 'extraction' && n.status) {
+      color = statusColors[n.status] || color;
+    }
+    let r = n.size / 2;
+    let isHighlighted = highlightedNode === n.id;
+
+    ctx.beginPath();
+    ctx.arc(n.x, n.y, r + (isHighlighted ? 3 : 0), 0, Math.PI * 2);
+    ctx.fillStyle = color;
+    ctx.globalAlpha = isHighlighted ? 1 : 0.8;
+    ctx.fill();
+    ctx.globalAlpha = 1;
+
+    if (isHighlighted) {
+      ctx.strokeStyle = '#fff';
+      ctx.lineWidth = 2;
+      ctx.stroke();
+    }
+
+    // Labels
+    ctx.fillStyle = 'rgba(226,232,240,0.9)';
+    ctx.font = n.group === 'centre' ? 'bold 12px system-ui' : '10px system-ui';
+    ctx.textAlign = 'center';
+    ctx.fillText(n.label, n.x, n.y + r + 14);
+  });
+
+  ctx.restore();
+  simulate();
+  animId = requestAnimationFrame(draw);
+}
+
+function highlightNode(id) {
+  highlightedNode = id;
+  setTimeout(() => { highlightedNode = null; }, 3000);
+}
+
+// ── Transform screen coords to graph coords ──
+function screenToGraph(sx, sy) {
+  return {
+    x: (sx - W/2 - panX) / zoom + W/2,
+    y: (sy - H/2 - panY) / zoom + H/2,
+  };
+}
+
+// ── Mouse interaction ──
+let dragNode = null;
+let isPanning = false;
+let lastPanX = 0, lastPanY = 0;
+canvas.addEventListener('mousedown', e => {
+  const rect = canvas.getBoundingClientRect();
+  const sx = e.clientX - rect.left, sy = e.clientY - rect.top;
+  const gp = screenToGraph(sx, sy);
+  for (let n of graphData.nodes) {
+    let dx = n.x - gp.x, dy = n.y - gp.y;
+    if (dx*dx + dy*dy < ((n.size/2 + 5) / zoom) ** 2) {
+      dragNode = n;
+      dragNode.fixed = true;
+      return;
+    }
+  }
+  isPanning = true;
+  lastPanX = e.clientX;
+  lastPanY = e.clientY;
+});
+canvas.addEventListener('mousemove', e => {
+  if (dragNode) {
+    const rect = canvas.getBoundingClientRect();
+    const sx = e.clientX - rect.left, sy = e.clientY - rect.top;
+    const gp = screenToGraph(sx, sy);
+    dragNode.x = gp.x;
+    dragNode.y = gp.y;
+  } else if (isPanning) {
+    panX += e.clientX - lastPanX;
+    panY += e.clientY - lastPanY;
+    lastPanX = e.clientX;
+    lastPanY = e.clientY;
+  }
+});
+canvas.addEventListener('mouseup', () => {
+  if (dragNode && dragNode.id !== 'megamind') dragNode.fixed = false;
+  dragNode = null;
+  isPanning = false;
+});
+
+// ── Init ──
+const getJSON = url => fetch(url).then(r => r.json());
+getJSON('/api/entries').then(data => {
+  entries = data;
+  renderStats();
+  renderFilters();
+  renderEntries(activeFilter);
+}).catch(console.error);
+getJSON('/api/budget').then(data => { budget = data; renderStats(); }).catch(console.error);
+getJSON('/api/graph').then(initGraph).catch(console.error);
+draw();
@@ -5,6 +5,11 @@ Co-Ord Executor — Telegram Bot
 Listens for URLs sent via Telegram and creates GitHub Issues
 with the 'extract' label. GitHub Actions then processes them.
 
+With TELEGRAM_LOCAL_QUEUE=true, URLs go straight onto the local job
+queue instead, and the bot replies with the summary and a link once a
+worker (discord_bot.py or coord.py --worker) has processed them. It
+falls back to GitHub Issues when no local worker is running.
+
 Setup:
   1. Message @BotFather on Telegram → /newbot → get your bot token
   2. Add TELEGRAM_BOT_TOKEN and GITHUB_TOKEN to your .env
@@ -16,16 +21,32 @@ Requires: pip install python-telegram-bot
 
 import os
 import re
+import json
+import asyncio
 import logging
-import requests
+import time
 from dotenv import load_dotenv
 
+import config
+
 load_dotenv()
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 GITHUB_REPO = os.getenv("GITHUB_REPO", "onekiller89/Co-Ord_Executor")
 ALLOWED_USERS = os.getenv("TELEGRAM_ALLOWED_USERS", "")  # Comma-separated Telegram usernames
+GITHUB_BRANCH = os.getenv("GITHUB_BRANCH", "main")
+
+# Local-queue mode: submit to the job queue when a local worker is up
+LOCAL_QUEUE = os.getenv("TELEGRAM_LOCAL_QUEUE", "false").lower() == "true"
+LOCAL_POLL_INTERVAL = float(os.getenv("TELEGRAM_LOCAL_POLL_INTERVAL", "5"))
+LOCAL_TIMEOUT = float(os.getenv("TELEGRAM_LOCAL_TIMEOUT", "1800"))  # stop waiting after this long
+
+# Issues that couldn't be created during a GitHub outage are retried from here
+RETRY_FILE = config.PROJECT_ROOT / ".telegram_retry.json"
+RETRY_BASE = float(os.getenv("TELEGRAM_RETRY_BASE", "60"))  # seconds, doubling per attempt
+RETRY_MAX = float(os.getenv("TELEGRAM_RETRY_MAX", "3600"))
+RETRY_MAX_ATTEMPTS = int(os.getenv("TELEGRAM_RETRY_MAX_ATTEMPTS", "10"))
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -44,33 +65,252 @@ def check_user_allowed(username: str) -> bool:
     return username.lower() in allowed
 
 
-def create_github_issue(url: str, notes: str = "") -> dict | None:
-    """Create a GitHub Issue with the extract label."""
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+# ---------------------------------------------------------------------------
+# GitHub Issues
+# ---------------------------------------------------------------------------
+
+_github = None
+_tasks: set[asyncio.Task] = set()  # background waits, cancelled on shutdown
+
 
+def spawn(coro) -> asyncio.Task:
+    """Run ``coro`` in the background; it is cancelled when the bot stops."""
+    task = asyncio.create_task(coro)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+def get_github():
+    """The shared pooled GitHub client, created on first use."""
+    global _github
+    if _github is None:
+        from github_api import AsyncGitHubClient
+        _github = AsyncGitHubClient(token=GITHUB_TOKEN, repo=GITHUB_REPO)
+    return _github
+
+
+async def create_github_issue(url: str, notes: str = "") -> dict:
+    """Create a GitHub Issue with the extract label. Raises ``GitHubError`` on failure."""
     body = f"URL submitted via Telegram bot.\n\n{notes}" if notes else "URL submitted via Telegram bot."
+    return await get_github().create_issue(url, body, ["extract"])
+
 
-    payload = {
-        "title": url,
-        "body": body,
-        "labels": ["extract"],
-    }
-
-    resp = requests.post(
-        f"https://api.github.com/repos/{GITHUB_REPO}/issues",
-        headers=headers,
-        json=payload,
-        timeout=15,
+# ── Retry queue ──
+# Submissions that failed with a retryable error (outage, rate limit) are kept
+# on disk and retried with backoff; the user gets a reply when one goes through.
+
+_retry_lock = asyncio.Lock()
+
+
+def _load_retries() -> list[dict]:
+    if RETRY_FILE.exists():
+        try:
+            return json.loads(RETRY_FILE.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, IOError):
+            logger.warning("Corrupt Telegram retry queue — starting fresh")
+    return []
+
+
+def _save_retries(items: list[dict]):
+    tmp = RETRY_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(items, indent=1), encoding="utf-8")
+    tmp.replace(RETRY_FILE)
+
+
+async def queue_retry(url: str, notes: str, chat_id: int, message_id: int | None):
+    async with _retry_lock:
+        items = _load_retries()
+        items.append({
+            "url": url, "notes": notes, "chat_id": chat_id, "message_id": message_id,
+            "attempts": 0, "next_at": time.time() + RETRY_BASE,
+        })
+        _save_retries(items)
+
+
+async def drain_retries(bot) -> None:
+    """Retry queued issue submissions that are due, replying in the original chat."""
+    from github_api import GitHubError
+
+    async with _retry_lock:
+        items = _load_retries()
+        now = time.time()
+        due = [i for i in items if i["next_at"] <= now]
+        if not due:
+            return
+        results = await asyncio.gather(
+            *(create_github_issue(i["url"], i["notes"]) for i in due), return_exceptions=True,
+        )
+        keep = [i for i in items if i["next_at"] > now]
+        replies = []
+        for item, result in zip(due, results):
+            if isinstance(result, dict):
+                replies.append((item, f"Queued for extraction (after retry): {item['url']}\n"
+                                      f"Issue: {result.get('html_url', '')}"))
+                continue
+            item["attempts"] += 1
+            retryable = isinstance(result, GitHubError) and result.retryable
+            if not retryable or item["attempts"] >= RETRY_MAX_ATTEMPTS:
+                logger.error(f"Giving up on issue for {item['url']}: {result}")
+                replies.append((item, f"Couldn't create an issue for: {item['url']}\n{result}"))
+                continue
+            item["next_at"] = now + min(RETRY_BASE * 2 ** item["attempts"], RETRY_MAX)
+            keep.append(item)
+        _save_retries(keep)
+
+    for item, text in replies:
+        try:
+            await bot.send_message(item["chat_id"], text, reply_to_message_id=item["message_id"],
+                                   disable_web_page_preview=True)
+        except Exception as e:
+            logger.warning(f"Couldn't send retry result to chat {item['chat_id']}: {e}")
+
+
+async def retry_loop(bot) -> None:
+    while True:
+        try:
+            await drain_retries(bot)
+        except Exception as e:
+            logger.warning(f"Retry queue pass failed: {e}")
+        await asyncio.sleep(min(RETRY_BASE, 60))
+
+
+async def submit_issues(message, urls: list[str], notes: str) -> None:
+    """Create one issue per URL concurrently, queueing retryable failures."""
+    from github_api import GitHubError
+
+    results = await asyncio.gather(
+        *(create_github_issue(url, notes) for url in urls), return_exceptions=True,
     )
+    lines, retrying = [], 0
+    for url, result in zip(urls, results):
+        if isinstance(result, dict):
+            lines.append(f"Queued: {url}\nIssue: {result.get('html_url', '')}")
+        elif isinstance(result, GitHubError) and result.retryable:
+            await queue_retry(url, notes, message.chat_id, message.message_id)
+            lines.append(f"GitHub unavailable, will retry: {url}")
+            retrying += 1
+        else:
+            logger.error(f"Failed to create issue for {url}: {result}")
+            lines.append(f"Failed to create issue for: {url}\nCheck bot logs.")
+
+    footer = "GitHub Actions will process this shortly." if retrying < len(urls) else ""
+    if retrying:
+        footer = (footer + "\n" if footer else "") + "I'll reply here once queued issues go through."
+    await message.reply_text("\n\n".join(lines + ([footer] if footer else [])), disable_web_page_preview=True)
+
+
+# ---------------------------------------------------------------------------
+# Local job queue
+# ---------------------------------------------------------------------------
+
+_queue = None
+
 
-    if resp.status_code == 201:
-        return resp.json()
+def get_queue():
+    """The shared local JobQueue, opened on first use."""
+    global _queue
+    if _queue is None:
+        from jobqueue import JobQueue
+        _queue = JobQueue()
+    return _queue
+
+
+def local_worker_available() -> bool:
+    """True if local-queue mode is on and a worker has checked in recently."""
+    if not LOCAL_QUEUE:
+        return False
+    try:
+        return bool(get_queue().live_workers())
+    except Exception as e:
+        logger.warning(f"Job queue unavailable, falling back to GitHub Issues: {e}")
+        return False
+
+
+def format_result(result: dict) -> str:
+    """Summary reply for a finished extraction: title, summary and a link to the file."""
+    from outputs.document import ProcessedDocument
+
+    summary = ProcessedDocument.from_result(result).summary.strip()
+    if len(summary) > 1500:
+        summary = summary[:1497] + "..."
+    lines = [result.get("title", "Extraction complete"), result.get("url", "")]
+    near = (result.get("metadata") or {}).get("near_duplicate")
+    if near and near["mode"] == "linked":
+        lines += ["", f"Already covered ({near['similarity']:.0%} similar) — linked to the existing extraction."]
+    if summary:
+        lines += ["", summary]
+    if result.get("filename"):
+        lines += ["", f"https://github.com/{GITHUB_REPO}/blob/{GITHUB_BRANCH}/extractions/{result['filename']}"]
+    return "\n".join(lines)
+
+
+async def watch_job(bot, chat_id: int, reply_to: int | None, job_id: int) -> None:
+    """Poll a queued job and reply in the chat when it finishes or fails."""
+    from jobqueue import DONE, FAILED
+
+    queue = get_queue()
+    deadline = time.monotonic() + LOCAL_TIMEOUT
+    while time.monotonic() < deadline:
+        job = await asyncio.to_thread(queue.get, job_id)
+        if job is None:
+            return
+        if job.state == DONE:
+            text = format_result(job.result or {})
+            break
+        if job.state == FAILED:
+            text = f"Extraction failed: {job.url}\n{job.error or 'unknown error'}"
+            break
+        await asyncio.sleep(LOCAL_POLL_INTERVAL)
     else:
-        logger.error(f"GitHub API error {resp.status_code}: {resp.text}")
-        return None
+        text = f"Still working on job #{job_id} — it'll land in the repo when done."
+
+    await bot.send_message(chat_id, text, reply_to_message_id=reply_to, disable_web_page_preview=True)
+
+
+async def post_init(app) -> None:
+    """Start the issue retry loop and resume watching open local jobs."""
+    spawn(retry_loop(app.bot))
+    await resume_watches(app)
+
+
+async def post_shutdown(app) -> None:
+    """Stop background waits (open jobs are resumed on restart) and close the pool."""
+    for task in list(_tasks):
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    if _github is not None:
+        await _github.aclose()
+
+
+async def resume_watches(app) -> None:
+    """After a restart, pick up waiting on Telegram jobs that are still open."""
+    if not LOCAL_QUEUE:
+        return
+    jobs = await asyncio.to_thread(get_queue().open_jobs, "telegram")
+    for job in jobs:
+        chat_id = job.meta.get("chat_id")
+        if chat_id:
+            spawn(watch_job(app.bot, chat_id, job.meta.get("message_id"), job.id))
+    if jobs:
+        logger.info(f"Resumed watching {len(jobs)} open Telegram job(s)")
+
+
+async def submit_local(message, context, url: str, notes: str) -> None:
+    """Queue a URL locally and reply once a worker has processed it."""
+    from extractors.detector import canonical_key
+
+    key = await asyncio.to_thread(canonical_key, url)
+    meta = {"chat_id": message.chat_id, "message_id": message.message_id}
+    if notes:
+        meta["notes"] = notes
+    job, created = await asyncio.to_thread(get_queue().submit, url, "telegram", key, meta)
+    await message.reply_text(
+        f"Queued locally (job #{job.id}) — I'll reply here with the summary when it's done."
+        if created else
+        f"Already in progress (job #{job.id}) — I'll reply here when it's done."
+    )
+    spawn(watch_job(context.bot, message.chat_id, message.message_id, job.id))
 
 
 async def handle_message(update, context) -> None:
@@ -100,18 +340,12 @@ async def handle_message(update, context) -> None:
     # Extract notes (anything that isn't a URL)
     notes = URL_PATTERN.sub("", text).strip()
 
-    for url in urls:
-        issue = create_github_issue(url, notes)
-        if issue:
-            issue_url = issue.get("html_url", "")
-            await message.reply_text(
-                f"Queued for extraction!\n"
-                f"URL: {url}\n"
-                f"Issue: {issue_url}\n\n"
-                f"GitHub Actions will process this shortly."
-            )
-        else:
-            await message.reply_text(f"Failed to create issue for: {url}\nCheck bot logs.")
+    if await asyncio.to_thread(local_worker_available):
+        for url in urls:
+            await submit_local(message, context, url, notes)
+        return
+
+    await submit_issues(message, urls, notes)
 
 
 async def handle_start(update, context) -> None:
@@ -147,11 +381,12 @@ def main():
         print("Missing dependency: pip install python-telegram-bot")
         return
 
-    app = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).build()
+    app = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).post_init(post_init).post_shutdown(post_shutdown).concurrent_updates(True).build()
     app.add_handler(CommandHandler("start", handle_start))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
 
-    logger.info("Bot started. Send a URL to begin.")
+    mode = "local queue (GitHub Issues fallback)" if LOCAL_QUEUE else "GitHub Issues"
+    logger.info(f"Bot started in {mode} mode. Send a URL to begin.")
     app.run_polling()
 
 
@@ -0,0 +1,65 @@
+"""Shared fixtures: a local HTTP stand-in for the external services."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+
+class StandIn:
+    """A local server answering canned responses by ``(method, path)``.
+
+    A route is either ``(status, body)`` or a callable taking the parsed JSON
+    request body and returning one. Dict and list bodies are sent as JSON.
+    Every request is recorded in ``calls`` as ``(method, path, json body)``.
+    """
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], object] = {}
+        self.calls: list[tuple[str, str, object]] = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                path = urlsplit(self.path).path
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                payload = json.loads(raw) if raw else None
+                stand_in.calls.append((self.command, path, payload))
+                route = stand_in.routes.get((self.command, path))
+                status, body = route(payload) if callable(route) else route or (404, {"message": "Not Found"})
+                if isinstance(body, (dict, list)):
+                    data, content_type = json.dumps(body).encode("utf-8"), "application/json"
+                else:
+                    data, content_type = str(body).encode("utf-8"), "text/html; charset=utf-8"
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def route(self, method: str, path: str, response):
+        self.routes[(method, path)] = response
+
+    def called(self, method: str, path: str) -> list:
+        return [body for m, p, body in self.calls if m == method and p == path]
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    thread = threading.Thread(target=server.server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
@@ -0,0 +1,86 @@
+"""Exact-duplicate detection in the pipeline (outputs.storage.raw_hash / find_duplicate)."""
+
+import pytest
+
+import config
+import coord
+from extractors.base import BaseExtractor, ExtractionResult
+from extractors.detector import SourceType
+from outputs import catalog, index, neardup, rawstore, related
+from outputs.document import ProcessedDocument
+from outputs.storage import raw_hash
+
+TRANSCRIPT = "[00:00] Hello and welcome.\n[00:30] Today we look at caching."
+
+
+def _raw(views: str) -> str:
+    return (
+        f"Title: Caching talk\nChannel: Test Channel\nPublished: 2026-01-02\nLength: 2m 05s\nViews: {views}"
+        f"\n\n--- Description ---\nA talk.\n\n--- Transcript (en, manual) ---\n{TRANSCRIPT}"
+    )
+
+
+class FakeExtractor(BaseExtractor):
+    """The same video each time, with the view count grown between fetches."""
+
+    def __init__(self):
+        self.views = iter(["1,024", "1,311"])
+
+    def extract(self, url: str) -> ExtractionResult:
+        return ExtractionResult(
+            title="Caching talk", url=url, source_type="YouTube", raw_content=_raw(next(self.views)),
+            metadata={"extraction_method": "captions"},
+        )
+
+
+@pytest.fixture
+def claude_calls(monkeypatch, tmp_path) -> list[str]:
+    """Point run_pipeline at ``tmp_path`` with a fake extractor; returns the URLs sent to "Claude"."""
+    extractions = tmp_path / "extractions"
+    monkeypatch.setattr(config, "EXTRACTIONS_PATH", extractions)
+    monkeypatch.setattr(config, "INDEX_FILE", extractions / "INDEX.md")
+    monkeypatch.setattr(config, "OBSIDIAN_VAULT_PATH", "")
+    monkeypatch.setattr(config, "NEARDUP_ENABLED", False)
+    monkeypatch.setattr(config, "TAXONOMY_ENABLED", False)
+    monkeypatch.setattr(config, "RAW_STORE_PATH", tmp_path / "raw")
+    monkeypatch.setattr(config, "RELATED_DB_PATH", tmp_path / "related.sqlite3")
+    monkeypatch.setattr(config, "NEARDUP_INDEX_PATH", tmp_path / "neardup.jsonl")
+    monkeypatch.setattr(index, "URL_INDEX_FILE", tmp_path / "url_index.json")
+    monkeypatch.setattr(index, "INDEX_LOCK_FILE", tmp_path / "index.lock")
+    monkeypatch.setattr(index, "_url_index", None)
+    monkeypatch.setattr(catalog, "CATALOG_FILE", tmp_path / "catalog.pickle")
+    monkeypatch.setattr(catalog, "_catalog", None)
+    monkeypatch.setattr(rawstore, "_store", None)
+    monkeypatch.setattr(related, "_index", None)
+    monkeypatch.setattr(neardup, "_index", None)
+
+    extractor = FakeExtractor()
+    monkeypatch.setattr(coord, "get_extractor", lambda url: (extractor, SourceType.YOUTUBE))
+    calls = []
+
+    def process_document(result, related_doc=None):
+        calls.append(result.url)
+        return ProcessedDocument(
+            raw="### Summary\nA talk about caching.\n\n### Tags\n`#caching`\n\n### Category\nEngineering\n",
+            sections={"Summary": "A talk about caching.", "Tags": "`#caching`", "Category": "Engineering"},
+            tags=["caching"], category="Engineering",
+        )
+
+    monkeypatch.setattr(coord, "process_document", process_document)
+    return calls
+
+
+def test_raw_hash_ignores_counters():
+    assert raw_hash(_raw("1,024")) == raw_hash(_raw("1,311"))
+    assert raw_hash(_raw("1,024")) != raw_hash(_raw("1,024").replace("caching", "indexing"))
+
+
+def test_extractions_differing_only_in_view_count_dedupe(claude_calls):
+    first = coord.run_pipeline("https://example.com/talks/caching")
+    second = coord.run_pipeline("https://mirror.example.org/caching-talk")
+
+    assert second["filename"] == first["filename"]
+    assert claude_calls == ["https://example.com/talks/caching"]
+    files = sorted(p.name for p in config.EXTRACTIONS_PATH.glob("*.md") if p.name != "INDEX.md")
+    assert files == [first["filename"]]
+    assert index.lookup_url(second["key"]) == first["filename"]
@@ -0,0 +1,38 @@
+"""Packing an extraction into Discord thread messages (discord_outbox.compose_thread_messages)."""
+
+import pytest
+
+from discord_outbox import KEYCAPS, MESSAGE_LIMIT, compose_thread_messages, prompt_for_keycap
+from outputs.document import ProcessedDocument, Prompt
+
+
+def _prose(words: int, line_every: int = 0) -> str:
+    parts = [f"word{n}" + ("\n" if line_every and n % line_every == 0 else " ") for n in range(words)]
+    return "".join(parts).strip()
+
+
+@pytest.mark.parametrize("line_every", [0, 7, 40])
+@pytest.mark.parametrize("heading", ["Summary", "Key Insights", "Actions", "Links & Resources"])
+def test_no_message_over_the_limit(heading, line_every):
+    doc = ProcessedDocument(
+        raw="",
+        sections={heading: _prose(2500, line_every)},
+        prompts=[Prompt(f"Prompt {n}", "x" * 3000) for n in range(12)],
+    )
+    messages = compose_thread_messages(doc, footer="f" * 2500, related=_prose(900))
+    assert len(messages) > 3
+    assert max(len(m.content) for m in messages) <= MESSAGE_LIMIT
+    assert any(m.content.startswith(f"**{heading}** (cont.)\n") for m in messages)
+
+
+def test_keycap_finds_its_prompt_despite_fences_in_prose():
+    doc = ProcessedDocument(
+        raw="",
+        sections={"Summary": "Run ```pip install x``` first.\n```\ncode\n```"},
+        prompts=[Prompt("First", "Write ```python\nprint(1)\n``` please"), Prompt("Second", "plain body")],
+    )
+    (message,) = compose_thread_messages(doc)
+    assert message.reactions == KEYCAPS[:2]
+    assert prompt_for_keycap(message.content, KEYCAPS[0]) == "Write ```python\nprint(1)\n``` please"
+    assert prompt_for_keycap(message.content, KEYCAPS[1]) == "plain body"
+    assert prompt_for_keycap(message.content, KEYCAPS[2]) is None
@@ -0,0 +1,78 @@
+"""``coord.py --drain-issues`` against a local stand-in for the GitHub API."""
+
+import pytest
+
+import config
+import coord
+import gitsync
+from github_api import GitHubClient
+from jobqueue import JobQueue, QUEUED
+from outputs.document import ProcessedDocument
+
+REPO = "owner/repo"
+ISSUES = f"/repos/{REPO}/issues"
+
+GOOD_URL = "https://example.com/good-article"
+BAD_URL = "https://example.org/broken-article"
+CHAT_URL = "https://example.net/asked-in-discord"
+
+
+def _issue(number: int, url: str) -> dict:
+    return {"number": number, "title": url, "body": "", "labels": [{"name": coord.EXTRACT_LABEL}]}
+
+
+@pytest.fixture
+def drain(stand_in, monkeypatch, tmp_path):
+    """Run drain_issues_once against the stand-in with a scratch job queue and a stubbed pipeline."""
+    monkeypatch.setattr(config, "JOB_DB_PATH", tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(coord, "lookup_url", lambda key: None)
+    commits = []
+    monkeypatch.setattr(gitsync, "commit_and_push", lambda paths, message: commits.append(message) or True)
+
+    def run_pipeline(url, on_stage=None):
+        if url == BAD_URL:
+            raise RuntimeError("page returned 500")
+        return {"doc": ProcessedDocument(raw=""), "filename": "2026-01-01_good-article-abcd1234.md"}
+
+    monkeypatch.setattr(coord, "run_pipeline", run_pipeline)
+    for number in (1, 2, 3):
+        stand_in.route("POST", f"{ISSUES}/{number}/comments", (201, {"id": number}))
+        stand_in.route("POST", f"{ISSUES}/{number}/labels", (200, []))
+        stand_in.route("PATCH", f"{ISSUES}/{number}", (200, {"number": number}))
+
+    def run(issues: list[dict]) -> int:
+        stand_in.route("GET", ISSUES, (200, issues))
+        gh = GitHubClient(token="", repo=REPO, base_url=stand_in.url)
+        try:
+            return coord.drain_issues_once(workers=2, gh=gh)
+        finally:
+            gh.close()
+
+    run.commits = commits
+    return run
+
+
+def test_success_closed_and_failure_left_open(stand_in, drain):
+    assert drain([_issue(1, GOOD_URL), _issue(2, BAD_URL)]) == 1
+
+    (done_comment,) = stand_in.called("POST", f"{ISSUES}/1/comments")
+    assert "Extraction complete!" in done_comment["body"]
+    assert "extractions/2026-01-01_good-article-abcd1234.md" in done_comment["body"]
+    assert stand_in.called("PATCH", f"{ISSUES}/1") == [{"state": "closed"}]
+    assert drain.commits == [f"Extract: {GOOD_URL}"]
+
+    (failed_comment,) = stand_in.called("POST", f"{ISSUES}/2/comments")
+    assert "Extraction failed: `page returned 500`" in failed_comment["body"]
+    assert stand_in.called("POST", f"{ISSUES}/2/labels") == [{"labels": [coord.MANUAL_LABEL]}]
+    assert not stand_in.called("PATCH", f"{ISSUES}/2")
+
+
+def test_job_queued_by_a_chat_is_left_to_it(stand_in, drain):
+    queue = JobQueue(config.JOB_DB_PATH)
+    job, _ = queue.submit(CHAT_URL, source="discord")
+
+    assert drain([_issue(3, CHAT_URL)]) == 0
+
+    assert queue.get(job.id).state == QUEUED
+    assert not stand_in.called("POST", f"{ISSUES}/3/comments")
+    assert not stand_in.called("PATCH", f"{ISSUES}/3")
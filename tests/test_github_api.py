@@ -0,0 +1,69 @@
+"""Retry policy of the GitHub clients, against a local stand-in API."""
+
+import asyncio
+import socket
+
+import pytest
+
+import github_api
+from github_api import AsyncGitHubClient, GitHubClient, GitHubError
+
+ISSUES = "/repos/owner/repo/issues"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(github_api, "_retry_delay", lambda resp, attempt: 0)
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def _create_sync(base_url: str):
+    client = GitHubClient(token="", repo="owner/repo", base_url=base_url)
+    try:
+        return client.create_issue("Extract: https://example.com")
+    finally:
+        client.close()
+
+
+def _create_async(base_url: str):
+    async def run():
+        async with AsyncGitHubClient(token="", repo="owner/repo", base_url=base_url) as client:
+            return await client.create_issue("Extract: https://example.com")
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("create", [_create_sync, _create_async])
+def test_post_not_retried_after_server_error(stand_in, create):
+    stand_in.route("POST", ISSUES, (502, {"message": "Bad Gateway"}))
+    with pytest.raises(GitHubError) as err:
+        create(stand_in.url)
+    assert err.value.status == 502 and not err.value.retryable
+    assert len(stand_in.called("POST", ISSUES)) == 1
+
+
+@pytest.mark.parametrize("create", [_create_sync, _create_async])
+def test_post_retried_when_rate_limited(stand_in, create):
+    replies = iter([(429, {"message": "slow down"}), (201, {"number": 7})])
+    stand_in.route("POST", ISSUES, lambda payload: next(replies))
+    assert create(stand_in.url)["number"] == 7
+    assert len(stand_in.called("POST", ISSUES)) == 2
+
+
+@pytest.mark.parametrize("create", [_create_sync, _create_async])
+def test_post_retryable_when_never_sent(create):
+    with pytest.raises(GitHubError) as err:
+        create(_closed_port_url())
+    assert err.value.retryable
+
+
+def test_get_retried_after_server_error(stand_in):
+    replies = iter([(502, {"message": "Bad Gateway"}), (200, [{"number": 1, "title": "t"}])])
+    stand_in.route("GET", ISSUES, lambda payload: next(replies))
+    client = GitHubClient(token="", repo="owner/repo", base_url=stand_in.url)
+    assert [i["number"] for i in client.list_issues("extract")] == [1]
+    assert len(stand_in.called("GET", ISSUES)) == 2
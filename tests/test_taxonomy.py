@@ -0,0 +1,47 @@
+"""Merge rules of the tag/category alias table (outputs.taxonomy)."""
+
+import pytest
+
+from outputs.taxonomy import Taxonomy
+
+
+def _resolve(tmp_path, kind: str, known: list[str], label: str) -> str:
+    """What ``label`` resolves to in a table built from the ``known`` labels."""
+    table = Taxonomy(tmp_path / "taxonomy.json")
+    field = "tags" if kind == "tags" else "category"
+    table.rebuild([{field: [k] if kind == "tags" else k} for k in known])
+    return table.resolve(kind, label)
+
+
+@pytest.mark.parametrize("known, label", [
+    ("java", "javascript"),
+    ("javascript", "java"),
+    ("productivity", "product"),
+    ("marketing", "market"),
+    ("dev", "devtools"),
+    ("new", "news"),
+])
+def test_distinct_tags_stay_apart(tmp_path, known, label):
+    assert _resolve(tmp_path, "tags", [known], label) == label
+
+
+@pytest.mark.parametrize("known, label", [
+    ("machine-learning", "machinelearning"),
+    ("llm", "LLMs"),
+    ("development-tools", "dev tools"),
+    ("ml", "machine-learning"),
+    ("kubernetes", "k8s"),
+    ("javascript", "js"),
+    ("news", "News"),
+])
+def test_variants_merge(tmp_path, known, label):
+    assert _resolve(tmp_path, "tags", [known], label) == known
+
+
+def test_categories_merge_abbreviations(tmp_path):
+    assert _resolve(tmp_path, "categories", ["Development"], "Dev") == "Development"
+    assert _resolve(tmp_path, "categories", ["Product"], "Productivity") == "Productivity"
+
+
+def test_ambiguous_short_form_is_left_alone(tmp_path):
+    assert _resolve(tmp_path, "tags", ["development", "developer"], "dev") == "dev"
@@ -0,0 +1,104 @@
+"""Direct caption fetching and the Grok fallback, against a local stand-in for YouTube and xAI."""
+
+import json
+
+import pytest
+
+import budget
+import config
+import llm
+from extractors.transcript import TranscriptUnavailable, fetch_transcript
+from extractors.youtube import YouTubeExtractor
+
+VIDEO_ID = "dQw4w9WgXcQ"
+URL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+GOOD_TRACK = """<?xml version="1.0" encoding="utf-8" ?><transcript>
+<text start="0.5" dur="2.0">Hello &amp;amp; welcome</text>
+<text start="3.0" dur="1.5">to the stand-in</text>
+</transcript>"""
+
+MALFORMED_TRACK = """<transcript><text start="soon" dur="2.0">Hello</text></transcript>"""
+
+
+def _watch_page(tracks: list[dict]) -> str:
+    player = {
+        "playabilityStatus": {"status": "OK"},
+        "videoDetails": {
+            "title": "Stand-in video", "author": "Test Channel", "lengthSeconds": "125",
+            "viewCount": "42", "keywords": ["testing"], "shortDescription": "A description.",
+        },
+        "captions": {"playerCaptionsTracklistRenderer": {"captionTracks": tracks}},
+        "microformat": {"playerMicroformatRenderer": {"publishDate": "2026-01-02"}},
+    }
+    return f"<html><script>var ytInitialPlayerResponse = {json.dumps(player)};</script></html>"
+
+
+def _grok_reply(payload):
+    return 200, {
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": payload["model"],
+        "choices": [{
+            "index": 0, "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "Title: Grok's take\nEverything in the video."},
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30},
+    }
+
+
+@pytest.fixture
+def youtube(stand_in, monkeypatch, tmp_path):
+    """Point YouTube and Grok at the stand-in, with a scratch budget file."""
+    monkeypatch.setattr(config, "YOUTUBE_WEB_BASE", stand_in.url)
+    monkeypatch.setattr(config, "YOUTUBE_DIRECT_TRANSCRIPTS", True)
+    monkeypatch.setattr(config, "YOUTUBE_CAPTION_LANGS", ["en"])
+    monkeypatch.setattr(config, "GROK_API_BASE", f"{stand_in.url}/v1")
+    monkeypatch.setattr(config, "XAI_API_KEY", "test-key")
+    monkeypatch.setattr(config, "LLM_MAX_RETRIES", 0)
+    monkeypatch.setattr(budget, "BUDGET_FILE", tmp_path / "api_budget.json")
+    llm._clients.pop("grok", None)  # rebuilt against the stand-in
+    stand_in.route("POST", "/v1/chat/completions", _grok_reply)
+    yield stand_in
+    llm._clients.pop("grok", None)
+
+
+def _serve(stand_in, track: str | None):
+    tracks = [{"baseUrl": "/api/timedtext?v=x&lang=en", "languageCode": "en"}] if track is not None else []
+    stand_in.route("GET", "/watch", (200, _watch_page(tracks)))
+    if track is not None:
+        stand_in.route("GET", "/api/timedtext", (200, track))
+
+
+def test_good_caption_track(youtube):
+    _serve(youtube, GOOD_TRACK)
+
+    info = fetch_transcript(VIDEO_ID)
+    assert info["title"] == "Stand-in video"
+    assert [s.text for s in info["segments"]] == ["Hello & welcome", "to the stand-in"]
+
+    result = YouTubeExtractor().extract(URL)
+    assert result.metadata["extraction_method"] == "captions"
+    assert "[00:00] Hello & welcome to the stand-in" in result.raw_content
+    assert not youtube.called("POST", "/v1/chat/completions")
+
+
+def test_malformed_timings_fall_back_to_grok(youtube):
+    _serve(youtube, MALFORMED_TRACK)
+
+    with pytest.raises(TranscriptUnavailable, match="malformed caption timing"):
+        fetch_transcript(VIDEO_ID)
+
+    result = YouTubeExtractor().extract(URL)
+    assert result.metadata["extraction_method"] == "grok_api"
+    assert result.title == "Grok's take"
+    assert len(youtube.called("POST", "/v1/chat/completions")) == 1
+
+
+def test_missing_track_falls_back_to_grok(youtube):
+    _serve(youtube, None)
+
+    with pytest.raises(TranscriptUnavailable, match="no caption tracks"):
+        fetch_transcript(VIDEO_ID)
+
+    result = YouTubeExtractor().extract(URL)
+    assert result.metadata["extraction_method"] == "grok_api"
+    assert result.raw_content.endswith("Everything in the video.")
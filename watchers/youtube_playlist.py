@@ -1,7 +1,12 @@
 """YouTube playlist watcher — polls a playlist for new videos to extract.
 
 Uses YouTube Data API v3 to list playlist items and tracks which videos
-have already been processed via a local state file + INDEX.md.
+have already been processed via a local state file + the URL index.
+
+Watcher state (processed IDs, cached playlist pages and their ETags) is
+held in memory and persisted to ``.youtube_processed.json``. Each poll
+asks for the first page with ``If-None-Match``; a 304 means the playlist
+is unchanged and the cached listing is used without paging.
 
 Playlist management (remove / add items) uses OAuth2 credentials
 generated by ``python youtube_auth.py``.
@@ -9,6 +14,8 @@ generated by ``python youtube_auth.py``.
 
 import json
 import logging
+import threading
+import time
 from pathlib import Path
 
 import requests
@@ -16,12 +23,29 @@ from google.auth.transport.requests import Request as GoogleAuthRequest
 from google.oauth2.credentials import Credentials
 
 import config
+from watchers import youtube_quota
 
 log = logging.getLogger("megamind.youtube")
 
-# Local state file to track processed video IDs
+# Local state file to track processed video IDs and cached playlist pages
 STATE_FILE = config.PROJECT_ROOT / ".youtube_processed.json"
 
+PLAYLIST_ITEMS_URL = "https://www.googleapis.com/youtube/v3/playlistItems"
+# Only the fields the watcher reads — smaller responses, same quota cost.
+# pageInfo/totalResults keeps the first page's ETag changing when videos are
+# added or removed on later pages, so its 304 really means "unchanged".
+PLAYLIST_FIELDS = "etag,nextPageToken,pageInfo/totalResults,items(id,snippet(title,publishedAt,resourceId/videoId))"
+
+# Moving a finished video between playlists: each step retried with backoff
+MOVE_MAX_ATTEMPTS = 6
+MOVE_RETRY_BASE = 60  # seconds, doubles per attempt
+MOVE_RETRY_MAX = 3600
+
+_session = requests.Session()
+_state_lock = threading.Lock()
+_moves_lock = threading.Lock()  # one mover at a time
+_state: dict | None = None
+
 
 # ---------------------------------------------------------------------------
 # OAuth2 helpers
@@ -71,90 +95,151 @@ def oauth_available() -> bool:
 # State management
 # ---------------------------------------------------------------------------
 
-def _load_processed() -> set[str]:
-    """Load the set of already-processed video IDs."""
-    if STATE_FILE.exists():
-        try:
-            data = json.loads(STATE_FILE.read_text())
-            return set(data.get("processed", []))
-        except (json.JSONDecodeError, KeyError):
-            return set()
-    return set()
+def _load_state() -> dict:
+    """Return the in-memory watcher state, loading it from disk on first use.
+
+    ``processed`` is a set of video IDs; ``pages`` caches each playlist
+    page as ``{etag, items, next}`` keyed by playlist ID and page token;
+    ``moves`` holds playlist moves still to be done, keyed by video ID.
+    """
+    global _state
+    if _state is None:
+        data = {}
+        if STATE_FILE.exists():
+            try:
+                data = json.loads(STATE_FILE.read_text())
+            except json.JSONDecodeError:
+                log.warning("Corrupt YouTube watcher state — starting fresh")
+        _state = {
+            "processed": set(data.get("processed", [])),
+            "pages": data.get("pages", {}),
+            "moves": data.get("moves", {}),
+        }
+    return _state
 
 
-def _save_processed(video_ids: set[str]):
-    """Save the set of processed video IDs."""
-    STATE_FILE.write_text(json.dumps({"processed": sorted(video_ids)}, indent=2))
+def _save_state():
+    """Persist the watcher state atomically. Call with ``_state_lock`` held."""
+    state = _load_state()
+    data = {**state, "processed": sorted(state["processed"])}
+    tmp = STATE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    tmp.replace(STATE_FILE)
+
+
+def _load_processed() -> set[str]:
+    """Return the set of already-processed video IDs."""
+    with _state_lock:
+        return set(_load_state()["processed"])
 
 
 def mark_video_processed(video_id: str):
     """Mark a video as processed."""
-    processed = _load_processed()
-    processed.add(video_id)
-    _save_processed(processed)
+    with _state_lock:
+        state = _load_state()
+        if video_id not in state["processed"]:
+            state["processed"].add(video_id)
+            _save_state()
 
 
 # ---------------------------------------------------------------------------
 # Read playlist
 # ---------------------------------------------------------------------------
 
+def _fetch_page(playlist_id: str, page_token: str | None, cached: dict | None) -> dict | None:
+    """Fetch one playlist page, conditionally if we hold its ETag.
+
+    Returns ``{etag, items, next, changed}``, or None on an API error.
+    """
+    params = {
+        "part": "snippet",
+        "playlistId": playlist_id,
+        "maxResults": 50,
+        "fields": PLAYLIST_FIELDS,
+        "key": config.YOUTUBE_API_KEY,
+    }
+    if page_token:
+        params["pageToken"] = page_token
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+
+    resp = _session.get(PLAYLIST_ITEMS_URL, params=params, headers=headers, timeout=15)
+    youtube_quota.record("list")  # a 304 still costs the unit
+    if resp.status_code == 304 and cached:
+        return {**cached, "changed": False}
+    if resp.status_code != 200:
+        log.error(f"YouTube API error: {resp.status_code} {resp.text}")
+        return None
+
+    data = resp.json()
+    items = []
+    for item in data.get("items", []):
+        snippet = item["snippet"]
+        video_id = snippet.get("resourceId", {}).get("videoId")
+        if video_id:
+            items.append({
+                "video_id": video_id,
+                "title": snippet.get("title", "Unknown"),
+                "playlist_item_id": item["id"],
+                "published_at": snippet.get("publishedAt", ""),
+            })
+    return {"etag": data.get("etag", ""), "items": items, "next": data.get("nextPageToken"), "changed": True}
+
+
 def get_playlist_videos() -> list[dict]:
     """Fetch all videos from the YouTube extract playlist.
 
-    Returns list of dicts with video_id, title, playlist_item_id.
+    Returns list of dicts with video_id, title, playlist_item_id. If the
+    first page comes back 304 Not Modified, the cached listing is returned
+    without fetching further pages.
     """
     if not config.YOUTUBE_API_KEY or not config.YOUTUBE_EXTRACT_PLAYLIST_ID:
         return []
+    if not youtube_quota.can_spend(youtube_quota.COSTS["list"], reserve=config.YOUTUBE_QUOTA_RESERVE):
+        log.warning("YouTube quota nearly used up — skipping playlist poll until the daily reset")
+        return []
 
+    playlist_id = config.YOUTUBE_EXTRACT_PLAYLIST_ID
+    with _state_lock:
+        cached_pages = dict(_load_state()["pages"].get(playlist_id, {}))
+
+    pages: dict[str, dict] = {}
     videos = []
     page_token = None
 
     while True:
-        params = {
-            "part": "snippet",
-            "playlistId": config.YOUTUBE_EXTRACT_PLAYLIST_ID,
-            "maxResults": 50,
-            "key": config.YOUTUBE_API_KEY,
-        }
-        if page_token:
-            params["pageToken"] = page_token
-
-        resp = requests.get(
-            "https://www.googleapis.com/youtube/v3/playlistItems",
-            params=params,
-        )
-
-        if resp.status_code != 200:
-            log.error(f"YouTube API error: {resp.status_code} {resp.text}")
-            break
-
-        data = resp.json()
-
-        for item in data.get("items", []):
-            snippet = item["snippet"]
-            video_id = snippet.get("resourceId", {}).get("videoId")
-            if video_id:
-                videos.append({
-                    "video_id": video_id,
-                    "title": snippet.get("title", "Unknown"),
-                    "playlist_item_id": item["id"],
-                    "published_at": snippet.get("publishedAt", ""),
-                })
-
-        page_token = data.get("nextPageToken")
+        cache_key = page_token or ""
+        page = _fetch_page(playlist_id, page_token, cached_pages.get(cache_key))
+        if page is None:
+            # Keep whatever we had; a failed poll shouldn't forget the cache
+            return videos if pages else []
+        changed = page.pop("changed")
+        pages[cache_key] = page
+
+        # First page unchanged (same items and totals): the playlist is unchanged
+        if not page_token and not changed:
+            log.debug("Playlist not modified (304) — using cached listing")
+            return [v for p in cached_pages.values() for v in p["items"]]
+
+        videos.extend(page["items"])
+        page_token = page["next"]
         if not page_token:
             break
 
+    with _state_lock:
+        _load_state()["pages"][playlist_id] = pages
+        _save_state()
     return videos
 
 
 def get_new_playlist_videos() -> list[dict]:
     """Return only videos that haven't been processed yet."""
+    from outputs.index import indexed_keys
+
     all_videos = get_playlist_videos()
     processed = _load_processed()
 
-    # Also check INDEX.md for YouTube URLs already extracted
-    index_video_ids = _get_indexed_youtube_ids()
+    # Also check the URL index for YouTube videos already extracted
+    index_video_ids = {key.split(":", 1)[1] for key in indexed_keys("youtube:") if ":list:" not in key}
     already_done = processed | index_video_ids
 
     new_videos = [v for v in all_videos if v["video_id"] not in already_done]
@@ -164,20 +249,6 @@ def get_new_playlist_videos() -> list[dict]:
     return new_videos
 
 
-def _get_indexed_youtube_ids() -> set[str]:
-    """Scan INDEX.md for already-extracted YouTube video IDs."""
-    ids = set()
-    if config.INDEX_FILE.exists():
-        content = config.INDEX_FILE.read_text()
-        import re
-        # Match YouTube video IDs in index entries
-        for match in re.finditer(r"youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})", content):
-            ids.add(match.group(1))
-        for match in re.finditer(r"youtu\.be/([a-zA-Z0-9_-]{11})", content):
-            ids.add(match.group(1))
-    return ids
-
-
 # ---------------------------------------------------------------------------
 # Playlist management (OAuth2 required)
 # ---------------------------------------------------------------------------
@@ -200,10 +271,14 @@ def remove_from_playlist(playlist_item_id: str) -> bool:
         params={"id": playlist_item_id},
         headers=headers,
     )
+    youtube_quota.record("delete")
 
     if resp.status_code == 204:
         log.info(f"Removed playlist item {playlist_item_id} from extract playlist")
         return True
+    if resp.status_code == 404:
+        log.info(f"Playlist item {playlist_item_id} already removed")
+        return True
 
     log.error(
         f"Failed to remove playlist item {playlist_item_id}: "
@@ -241,6 +316,7 @@ def add_to_playlist(video_id: str, playlist_id: str) -> bool:
         headers={**headers, "Content-Type": "application/json"},
         json=body,
     )
+    youtube_quota.record("insert")
 
     if resp.status_code in (200, 201):
         log.info(f"Added video {video_id} to playlist {playlist_id}")
@@ -276,3 +352,91 @@ def move_video_to_completed(video_id: str, playlist_item_id: str) -> bool:
         log.debug("No YOUTUBE_COMPLETED_PLAYLIST_ID set — skipping add-to-completed")
 
     return removed
+
+
+# ---------------------------------------------------------------------------
+# Background playlist moves
+# ---------------------------------------------------------------------------
+
+def queue_playlist_move(video_id: str, playlist_item_id: str):
+    """Record that a finished video should be moved to the completed playlist.
+
+    The move is carried out by ``process_pending_moves``; it survives restarts.
+    """
+    if not oauth_available():
+        log.info(
+            f"OAuth not configured — skipping playlist move for {video_id}. "
+            f"Run 'python youtube_auth.py' to enable."
+        )
+        return
+    with _state_lock:
+        _load_state()["moves"][video_id] = {
+            "playlist_item_id": playlist_item_id,
+            "removed": False,
+            "added": not config.YOUTUBE_COMPLETED_PLAYLIST_ID,
+            "attempts": 0,
+            "next_at": 0,
+        }
+        _save_state()
+
+
+def pending_move_count() -> int:
+    with _state_lock:
+        return len(_load_state()["moves"])
+
+
+def process_pending_moves() -> int:
+    """Run the playlist moves that are due. Returns the number completed.
+
+    Removing from the extract playlist and adding to the completed playlist
+    are separate steps; a step that succeeded is not repeated when the other
+    one is retried.
+    """
+    if not _moves_lock.acquire(blocking=False):
+        return 0  # another thread is already working through them
+    try:
+        now = time.time()
+        with _state_lock:
+            due = {vid: dict(m) for vid, m in _load_state()["moves"].items() if m["next_at"] <= now}
+        if not due or not oauth_available():
+            return 0
+
+        completed = 0
+        queue = list(due.items())
+        for n, (video_id, move) in enumerate(queue):
+            # Not enough quota left today for this move's remaining steps: wait for the reset
+            needed = (0 if move["removed"] else youtube_quota.COSTS["delete"]) + \
+                (0 if move["added"] else youtube_quota.COSTS["insert"])
+            if not youtube_quota.can_spend(needed):
+                deferred = [vid for vid, _ in queue[n:]]
+                with _state_lock:
+                    moves = _load_state()["moves"]
+                    for vid in deferred:
+                        if vid in moves:
+                            moves[vid]["next_at"] = now + youtube_quota.seconds_until_reset()
+                    _save_state()
+                log.warning(f"YouTube quota exhausted — deferring {len(deferred)} playlist move(s) to the reset")
+                break
+
+            if not move["removed"]:
+                move["removed"] = remove_from_playlist(move["playlist_item_id"])
+            if move["removed"] and not move["added"]:
+                move["added"] = add_to_playlist(video_id, config.YOUTUBE_COMPLETED_PLAYLIST_ID)
+
+            with _state_lock:
+                moves = _load_state()["moves"]
+                if move["removed"] and move["added"]:
+                    moves.pop(video_id, None)
+                    completed += 1
+                else:
+                    move["attempts"] += 1
+                    if move["attempts"] >= MOVE_MAX_ATTEMPTS:
+                        log.error(f"Giving up moving {video_id} after {move['attempts']} attempts")
+                        moves.pop(video_id, None)
+                    else:
+                        move["next_at"] = now + min(MOVE_RETRY_BASE * 2 ** (move["attempts"] - 1), MOVE_RETRY_MAX)
+                        moves[video_id] = move
+                _save_state()
+        return completed
+    finally:
+        _moves_lock.release()
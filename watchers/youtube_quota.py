@@ -0,0 +1,101 @@
+"""YouTube Data API quota ledger and adaptive poll pacing.
+
+Every API call the watcher makes is recorded with its unit cost in
+``.youtube_quota.json``. The ledger resets at midnight Pacific time, the
+same as Google's daily quota. Callers check ``can_spend`` before calling,
+so the watcher throttles itself before the quota runs out.
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import config
+
+log = logging.getLogger("megamind.youtube.quota")
+
+QUOTA_FILE = config.PROJECT_ROOT / ".youtube_quota.json"
+
+# Units per call (https://developers.google.com/youtube/v3/determine_quota_cost)
+COSTS = {"list": 1, "insert": 50, "delete": 50}
+
+PACIFIC = ZoneInfo("America/Los_Angeles")
+
+_lock = threading.Lock()
+
+
+def _today() -> str:
+    return datetime.now(PACIFIC).date().isoformat()
+
+
+def seconds_until_reset() -> float:
+    """Seconds until the quota resets (next midnight Pacific)."""
+    now = datetime.now(PACIFIC)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=PACIFIC)
+    return (midnight - now).total_seconds()
+
+
+def _load() -> dict:
+    """Load today's ledger, starting a fresh one after the daily reset."""
+    data = {}
+    if QUOTA_FILE.exists():
+        try:
+            data = json.loads(QUOTA_FILE.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, IOError):
+            log.warning("Corrupt YouTube quota ledger — starting fresh")
+    if data.get("day") != _today():
+        data = {"day": _today(), "used": 0, "calls": {}}
+    return data
+
+
+def record(op: str, count: int = 1):
+    """Record ``count`` API calls of type ``op`` (``list``, ``insert``, ``delete``)."""
+    with _lock:
+        data = _load()
+        data["used"] += COSTS[op] * count
+        data["calls"][op] = data["calls"].get(op, 0) + count
+        QUOTA_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def remaining() -> int:
+    """Units left today."""
+    with _lock:
+        return config.YOUTUBE_DAILY_QUOTA - _load()["used"]
+
+
+def can_spend(units: int, reserve: int = 0) -> bool:
+    """True if ``units`` can be spent today while keeping ``reserve`` units back."""
+    return remaining() - units >= reserve
+
+
+def summary() -> dict:
+    """Today's usage for /status."""
+    with _lock:
+        data = _load()
+    return {
+        "used": data["used"],
+        "limit": config.YOUTUBE_DAILY_QUOTA,
+        "remaining": config.YOUTUBE_DAILY_QUOTA - data["used"],
+        "calls": data["calls"],
+        "resets_in": seconds_until_reset(),
+    }
+
+
+def next_poll_interval(idle_polls: int) -> float:
+    """Seconds until the next playlist poll.
+
+    ``YOUTUBE_POLL_MIN_INTERVAL`` right after activity, doubling for each
+    poll that found nothing, up to ``YOUTUBE_POLL_INTERVAL``. Stretched
+    further if polling that often would dip into ``YOUTUBE_QUOTA_RESERVE``
+    (kept for playlist moves) before the daily reset.
+    """
+    low = min(config.YOUTUBE_POLL_MIN_INTERVAL, config.YOUTUBE_POLL_INTERVAL)
+    interval = min(low * 2 ** min(idle_polls, 30), config.YOUTUBE_POLL_INTERVAL)
+
+    until_reset = seconds_until_reset()
+    budget = remaining() - config.YOUTUBE_QUOTA_RESERVE
+    if budget < COSTS["list"]:
+        return until_reset + 60
+    return max(interval, until_reset / (budget / COSTS["list"]))